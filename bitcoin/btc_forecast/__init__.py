@@ -0,0 +1,28 @@
+"""
+btc_forecast: 비트코인 가격 예측 모듈 (bitcoin_basic.py, bitcoin_deep.py가 이 모듈을 사용)
+
+    from btc_forecast import load_data, build_features, train, forecast, plot
+
+    df = load_data('BTC-USD', period='3mo')
+    features = build_features(df, model='linear')
+    result = forecast(train(features), features, horizon=24)
+    plot(result, 'result.png')
+
+무거운 라이브러리(sklearn, matplotlib, yfinance)는 실제로 쓰는 함수 안에서만 불러옵니다.
+명령줄: python -m btc_forecast --model mlp --period 6mo --horizon 24 --no-plot
+"""
+
+from .features import build_features
+from .models import forecast, train
+from .plotting import plot
+from .store import load_ohlcv
+
+
+def load_data(ticker='BTC-USD', period='3mo', interval='1h', **kwargs):
+    """
+    OHLCV 데이터 불러오기 (로컬 저장소에 없는 최근 봉만 새로 받음, store.py 참고)
+    """
+    return load_ohlcv(ticker, interval=interval, period=period, **kwargs)
+
+
+__all__ = ['load_data', 'build_features', 'train', 'forecast', 'plot', 'load_ohlcv']
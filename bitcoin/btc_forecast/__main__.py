@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+__main__.py
+===========
+[기능]
+btc_forecast 명령줄 실행: 데이터 수집 -> 피처 -> 학습 -> 예측 -> 그래프/리포트
+
+[사용법]
+   python -m btc_forecast                                   # 선형 추세, 최근 3개월, 24시간 예측
+   python -m btc_forecast --model mlp --period 6mo          # MLP (bitcoin_deep.py와 같은 설정)
+   python -m btc_forecast --ticker ETH-USD --horizon 48 --no-plot
+   python -m btc_forecast --model mlp --strategy direct --score-history   # 24시간을 한 번에 예측 + 과거 전체 채점
+   python -m btc_forecast --model mlp --retrain             # 저장된 모델(artifacts.py)을 무시하고 다시 학습
+   python -m btc_forecast --tickers BTC-USD ETH-USD SOL-USD # 여러 종목의 선형 추세를 한 번에 계산해서 순위 (trend.py)
+   python -m btc_forecast --model mlp --level auto --horizon 168   # 예측 기간에 맞는 굵은 봉 사용 (pyramid.py)
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+from . import build_features, forecast, load_data, plot, train
+from .artifacts import train_with_artifacts
+from .models import score_history
+from .pyramid import LEVEL_PERIODS, LEVELS, horizon_steps, hourly_period, level_for_horizon, pyramid_level
+from .trend import load_panel, scan_trends
+
+SCRIPT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # bitcoin 폴더
+
+# 모델별 기본 그래프 파일 (예전 스크립트와 같은 이름)
+DEFAULT_OUTPUTS = {
+    'linear': os.path.join(SCRIPT_DIR, 'bitcoin_basic_result.png'),
+    'mlp': os.path.join(SCRIPT_DIR, 'bitcoin_deep_result.png'),
+}
+DEFAULT_PERIODS = {'linear': '3mo', 'mlp': '6mo'}
+REPORT_TITLES = {'linear': 'Basic Model Prediction', 'mlp': 'Deep Model Prediction'}
+LEVEL_NAMES = {'1h': 'Hourly', '4h': '4-Hourly', '1d': 'Daily', '1w': 'Weekly'}
+LINEAR_LOOKBACK = pd.Timedelta(hours=200)  # 선형 추세 구간 (봉이 굵어져도 같은 기간)
+
+
+def report(result, level='1h'):
+    """
+    분석 결과 출력 (현재 가격, horizon시간 뒤 예측 가격, 변화율)
+    """
+    metrics = result['metrics']
+    horizon = int((result['future_dates'][-1] - result['dates'][-1]) / pd.Timedelta(hours=1))
+    current = result['prices'][-1]
+    future = result['predictions'][-1]
+
+    print(f"\n[{REPORT_TITLES[result['model']]} - {LEVEL_NAMES[level]}]")
+    if result['model'] == 'linear':
+        print(f"Model Reliability (R^2): {metrics['r2']:.4f}")
+    else:
+        print(f"Model Error (MAE): ${metrics['mae']:.2f}")
+    print(f"Current Price:     ${current:.2f}")
+    print(f"Price in {horizon} Hours: ${future:.2f}")
+
+    diff = future - current
+    change_pct = (diff / current) * 100
+    print(f"Expected Change:   {diff:+.2f} ({change_pct:+.2f}%)")
+
+
+def scan(tickers, period, interval, horizon):
+    """
+    여러 종목 추세 순위 출력 (bitcoin_basic.py의 선형 추세를 모든 종목에 한 번에 적용)
+    """
+    print(f"Downloading {len(tickers)} tickers ({interval}, {period})...")
+    try:
+        panel = load_panel(tickers, period=period, interval=interval)
+    except Exception as e:
+        print(f"Error: {e}")
+        return 1
+
+    start = time.perf_counter()
+    table = scan_trends(panel, horizon=horizon)
+    print(f"\n[Trend Scan - {len(table)} tickers, next {horizon}h] ({(time.perf_counter() - start) * 1000:.1f}ms)")
+    print(table.to_string(float_format=lambda v: f'{v:,.4f}'))
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='btc_forecast', description='비트코인 가격 예측')
+    parser.add_argument('--model', choices=['linear', 'mlp'], default='linear',
+                        help='linear: 선형 추세 (bitcoin_basic.py), mlp: 딥러닝 (bitcoin_deep.py)')
+    parser.add_argument('--ticker', default='BTC-USD', help='종목 (기본 BTC-USD)')
+    parser.add_argument('--period', help='학습 데이터 기간 (기본 linear 3mo, mlp 6mo)')
+    parser.add_argument('--interval', default='1h', help='봉 간격 (기본 1h)')
+    parser.add_argument('--horizon', type=int, default=24, help='예측할 시간 수 (기본 24)')
+    parser.add_argument('--level', choices=list(LEVELS) + ['auto'], default='1h',
+                        help='봉 굵기: 1h/4h/1d/1w (1h 데이터로 만든 피라미드), auto면 예측 시간에 맞게 고름')
+    parser.add_argument('--strategy', choices=['recursive', 'direct'], default='recursive',
+                        help='mlp 예측 방식: recursive(1시간 모델 반복) / direct(horizon시간을 한 번에 내는 모델)')
+    parser.add_argument('--score-history', action='store_true',
+                        help='mlp: 과거의 모든 시각에서 horizon시간 예측을 한 번에 계산해서 MAE 출력')
+    parser.add_argument('--retrain', action='store_true',
+                        help='mlp: 저장된 모델을 재사용/증분 학습하지 않고 처음부터 다시 학습')
+    parser.add_argument('--tickers', nargs='+', metavar='TICKER',
+                        help='linear: 여러 종목의 추세를 한 번에 계산해서 예상 변화율 순위 출력 (그래프 없음)')
+    parser.add_argument('--output', help='그래프 저장 경로')
+    parser.add_argument('--no-plot', action='store_true', help='그래프를 그리지 않음')
+    args = parser.parse_args(argv)
+    period = args.period or DEFAULT_PERIODS[args.model]
+
+    if args.tickers:
+        return scan(args.tickers, period, args.interval, args.horizon)
+
+    level = level_for_horizon(args.horizon) if args.level == 'auto' else args.level
+    if level != '1h' and args.interval != '1h':
+        print("Error: --level requires 1h data (--interval 1h)")
+        return 1
+    steps = horizon_steps(args.horizon, level)
+    if level != '1h' and not args.period:
+        period = LEVEL_PERIODS[level]  # 굵은 봉은 기간을 늘려야 학습할 봉 수가 나옴
+
+    print(f"Downloading {args.ticker} Data ({args.interval}, {period})...")
+    try:
+        if level == '1h':
+            df = load_data(args.ticker, period=period, interval=args.interval)
+        else:
+            df = load_data(args.ticker, period=hourly_period(period), interval=args.interval)
+            # 재생 데이터로는 저장된 피라미드를 건드리지 않음
+            df = pyramid_level(args.ticker, df, level, period, persist=not os.environ.get('OHLCV_REPLAY'))
+            covered = steps * LEVELS[level] / pd.Timedelta(hours=1)
+            print(f"Using {level} bars ({len(df):,} rows, {steps} steps = {covered:.0f}h for {args.horizon}h)")
+        options = {'horizon': steps} if args.model == 'mlp' and args.strategy == 'direct' else {}
+        if args.model == 'linear':
+            if level != '1h':
+                options['lookback'] = max(20, int(LINEAR_LOOKBACK / LEVELS[level]))
+            features = build_features(df, model=args.model, **options)
+    except Exception as e:
+        print(f"Error: {e}")
+        return 1
+
+    start = time.perf_counter()
+    print(f"Training {args.model} model...")
+    if args.model == 'mlp':
+        # 데이터가 그대로면 저장된 모델을 쓰고, 새 봉만 늘었으면 증분 학습 (artifacts.py)
+        try:
+            features, trained, status = train_with_artifacts(df, ticker=args.ticker,
+                                                             interval=args.interval if level == '1h' else level,
+                                                             feature_params=options, retrain=args.retrain)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return 1
+        print(f"Model artifact v{trained['version']}: {status}")
+    else:
+        trained = train(features)
+    result = forecast(trained, features, horizon=steps)
+    print(f"Training Complete. ({time.perf_counter() - start:.2f}s, "
+          + ', '.join(f'{k}: {v:.4f}' for k, v in trained['metrics'].items()) + ")")
+
+    if not args.no_plot:
+        output_path = args.output or DEFAULT_OUTPUTS[args.model]
+        plot(result, output_path, ticker=args.ticker)
+        print(f"Prediction complete. Image saved to {output_path}")
+
+    report(result, level)
+
+    if args.score_history and args.model == 'mlp':
+        start = time.perf_counter()
+        table, mae = score_history(trained, features, horizon=steps)
+        print(f"\n[Historical Backcast] {len(table):,} start points x {steps} steps ({level}) "
+              f"({time.perf_counter() - start:.2f}s)")
+        for col in [mae.index[0], mae.index[len(mae) // 2], mae.index[-1]]:
+            print(f"MAE {col:>4}: ${mae[col]:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
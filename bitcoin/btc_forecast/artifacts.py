@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""
+artifacts.py
+============
+[기능]
+학습한 MLP 모델을 Scaler, 피처 설정과 함께 파일(아티팩트)로 저장해 두고 다음 실행에서 다시 씁니다.
+매 실행마다 max_iter=500으로 처음부터 다시 학습하지 않고, 데이터가 바뀐 만큼만 처리합니다.
+
+[실행마다 고르는 방법]
+1. reused : 학습 데이터 지문(store.data_fingerprint)이 저장된 모델과 같으면 그대로 사용 (학습 없음)
+2. updated: 저장된 마지막 시각까지의 데이터는 그대로이고 새 봉만 늘었으면,
+            새로 생긴 학습 윈도우(+ 직전 윈도우 일부)로 partial_fit만 몇 번 (warm start)
+            - Scaler는 다시 fit하지 않고 저장된 것을 그대로 씀 (입력 분포가 모델과 같아야 하므로)
+            - 새 봉이 검증 구간에만 들어가서 학습할 윈도우가 없으면 reused (새 버전을 저장하지 않음)
+3. trained: 처음이거나 과거 데이터가 바뀌었거나, 새 가격이 Scaler 범위를 크게 벗어났거나,
+            증분 학습이 MAX_UPDATES번 쌓였으면 처음부터 다시 학습
+
+[early_stopping]
+partial_fit은 early_stopping=True로 학습한 모델을 이어서 학습하지 못하므로(검증 손실 기록이 없음)
+아티팩트 모델은 처음부터 early_stopping=False로 학습합니다 (ARTIFACT_PARAMS).
+train_params로 early_stopping=True를 직접 주면 증분 학습 없이 매번 처음부터 다시 학습합니다.
+
+[저장 형식]
+data/models/<종목>_<봉 간격>_mlp_<설정 해시>/
+   v0001.joblib, v0002.joblib, ...  # 버전마다 하나 (최근 KEEP_VERSIONS개만 유지)
+   latest.json                      # 현재 버전과 데이터 지문
+"""
+
+import copy
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from .features import MLP_FEATURES, build_mlp_features
+from .models import MLP_PARAMS, evaluate_mlp, train
+from .store import data_fingerprint
+from .windows import as_model_input, as_model_target
+
+ARTIFACT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'models')
+ARTIFACT_FORMAT = 1  # 저장 내용이 바뀌면 올림 (다른 형식의 파일은 무시하고 다시 학습)
+
+ANCHOR_ROWS = 48        # 이어 붙일 수 있는지 확인할 때 비교하는 저장 시점 직전 봉 수
+REPLAY_WINDOWS = 256    # 증분 학습 때 새 윈도우와 함께 다시 보여 줄 직전 학습 윈도우 수
+UPDATE_EPOCHS = 5       # 증분 학습 반복 수
+MAX_UPDATES = 168       # 증분 학습이 이만큼 쌓이면 처음부터 다시 학습 (1시간마다면 1주일)
+SCALE_TOLERANCE = 0.1   # 새 데이터의 정규화 값이 [-0.1, 1.1]을 벗어나면 Scaler를 다시 fit
+KEEP_VERSIONS = 5
+ARTIFACT_PARAMS = {'early_stopping': False}  # 증분 학습(partial_fit)을 이어 갈 수 있도록
+
+
+def config_key(feature_params, train_params):
+    """
+    피처 설정 + 모델 설정 -> 짧은 해시 (설정이 다르면 다른 아티팩트)
+    """
+    config = {'window_size': 10, 'test_ratio': 0.1, 'horizon': 1, 'feature_cols': MLP_FEATURES,
+              **feature_params, 'params': model_params(train_params)}
+    config['feature_cols'] = list(config['feature_cols'])
+    text = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:12]
+
+
+def model_params(train_params):
+    """
+    아티팩트 모델의 MLPRegressor 설정 (기본값 + ARTIFACT_PARAMS + train_params)
+    """
+    return {**MLP_PARAMS, **ARTIFACT_PARAMS, **train_params}
+
+
+def artifact_path(ticker, interval, key, artifact_dir=ARTIFACT_DIR):
+    return os.path.join(artifact_dir, f'{ticker}_{interval}_mlp_{key}')
+
+
+def anchor_fingerprint(df, last_timestamp):
+    """
+    last_timestamp 직전 ANCHOR_ROWS개 봉의 지문 (마지막 봉은 아직 진행 중이었을 수 있어서 제외)
+    """
+    return data_fingerprint(df[df.index < last_timestamp].tail(ANCHOR_ROWS))
+
+
+# -----------------------------------------------------------------------------
+# 1. 읽기/쓰기
+# -----------------------------------------------------------------------------
+def load_artifact(path):
+    """
+    최신 버전 아티팩트 -> dict (없거나 형식이 다르면 None)
+    """
+    latest_path = os.path.join(path, 'latest.json')
+    if not os.path.exists(latest_path):
+        return None
+    import joblib
+
+    with open(latest_path, encoding='utf-8') as f:
+        latest = json.load(f)
+    file_path = os.path.join(path, latest['file'])
+    if latest.get('format') != ARTIFACT_FORMAT or not os.path.exists(file_path):
+        return None
+    return joblib.load(file_path)
+
+
+def save_artifact(path, artifact):
+    """
+    새 버전으로 저장 + latest.json 갱신 (둘 다 임시 파일에 쓴 뒤 교체)
+    """
+    import joblib
+
+    os.makedirs(path, exist_ok=True)
+    file_name = f"v{artifact['version']:04d}.joblib"
+    tmp_path = os.path.join(path, file_name + '.tmp')
+    joblib.dump(artifact, tmp_path)
+    os.replace(tmp_path, os.path.join(path, file_name))
+
+    latest = {'format': ARTIFACT_FORMAT, 'version': artifact['version'], 'file': file_name,
+              'data_fingerprint': artifact['data_fingerprint'], 'status': artifact['status'],
+              'created_at': artifact['created_at']}
+    tmp_path = os.path.join(path, 'latest.json.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(latest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, os.path.join(path, 'latest.json'))
+
+    # 오래된 버전 정리
+    versions = sorted(name for name in os.listdir(path) if name.startswith('v') and name.endswith('.joblib'))
+    for name in versions[:-KEEP_VERSIONS]:
+        os.remove(os.path.join(path, name))
+
+
+# -----------------------------------------------------------------------------
+# 2. 재사용 / 증분 학습 / 전체 학습
+# -----------------------------------------------------------------------------
+def can_update(artifact, df, features):
+    """
+    저장된 모델을 증분 학습으로 이어 쓸 수 있는지 (과거 데이터가 그대로이고 Scaler 범위 안인지)
+    """
+    if artifact['updates'] >= MAX_UPDATES or artifact['params'].get('early_stopping'):
+        return False
+    last = artifact['last_timestamp']
+    if df.index[-1] < last or anchor_fingerprint(df, last) != artifact['anchor_fingerprint']:
+        return False
+    recent = features['scaled'][features['dates'] >= last]
+    return bool(recent.size == 0 or (recent.min() >= -SCALE_TOLERANCE and recent.max() <= 1 + SCALE_TOLERANCE))
+
+
+def update_model(estimator, features, train_end):
+    """
+    train_end 이후에 목표 시각이 있는 학습 윈도우만 partial_fit -> (갱신된 모델, 학습한 새 윈도우 수)
+    - 저장된 모델은 건드리지 않고 복사본을 학습 (새 윈도우가 없으면 원래 모델을 그대로 돌려줌)
+    """
+    horizon, window_size = features['horizon'], features['window_size']
+    # i번째 학습 윈도우의 마지막 목표 시각 = dates[i + window_size + horizon - 1]
+    target_end = features['dates'][window_size + horizon - 1:][:len(features['X_train'])]
+    first_new = int(np.searchsorted(target_end, train_end, side='right'))
+    n_new = len(target_end) - first_new
+    if n_new == 0:
+        return estimator, 0
+
+    # 새 윈도우만 보면 최근 몇 시간에 치우치므로 직전 윈도우 일부를 같이 보여 줌
+    start = max(0, first_new - REPLAY_WINDOWS)
+    X = as_model_input(features['X_train'][start:])
+    y = as_model_target(features['y_train'][start:])
+    model = copy.deepcopy(estimator)
+    for _ in range(UPDATE_EPOCHS):
+        model.partial_fit(X, y)
+    return model, n_new
+
+
+def train_with_artifacts(df, ticker='BTC-USD', interval='1h', feature_params=None, train_params=None,
+                         retrain=False, artifact_dir=ARTIFACT_DIR):
+    """
+    저장된 모델을 재사용/증분 학습하거나 새로 학습 -> (features, trained, 상태)
+    - 상태: 'reused' / 'updated' / 'trained'
+    - features, trained는 build_features / train의 결과와 같은 형식 (forecast에 그대로 사용)
+    """
+    feature_params, train_params = dict(feature_params or {}), dict(train_params or {})
+    params = model_params(train_params)
+    path = artifact_path(ticker, interval, config_key(feature_params, train_params), artifact_dir)
+    previous = load_artifact(path)
+    artifact = None if retrain else previous
+    fingerprint = data_fingerprint(df)
+
+    features = status = None
+    if artifact is not None:
+        if artifact['data_fingerprint'] == fingerprint:
+            status = 'reused'
+        scalers = (artifact['scaler'], artifact['target_scaler'])
+        features = build_mlp_features(df, scalers=scalers, **feature_params)
+        if status is None and can_update(artifact, df, features):
+            status = 'updated'
+
+    if status is None:
+        features = build_mlp_features(df, **feature_params)
+        trained = train(features, **params)
+        estimator, metrics, updates = trained['estimator'], trained['metrics'], 0
+        status = 'trained'
+    else:
+        estimator, metrics, updates = artifact['estimator'], artifact['metrics'], artifact['updates']
+        if status == 'updated':
+            estimator, n_new = update_model(estimator, features, artifact['train_end'])
+            if n_new:
+                updates += 1
+                metrics = evaluate_mlp(estimator, features)
+            else:
+                # 새 봉이 검증 구간에만 들어가서 학습할 윈도우가 없음 -> 새 버전을 만들지 않음
+                status = 'reused'
+
+    if status != 'reused':
+        horizon, window_size = features['horizon'], features['window_size']
+        artifact = {
+            'format': ARTIFACT_FORMAT,
+            'version': (previous['version'] + 1) if previous else 1,
+            'model': 'mlp',
+            'estimator': estimator,
+            'scaler': features['scaler'],
+            'target_scaler': features['target_scaler'],
+            'feature_cols': features['feature_cols'],
+            'window_size': window_size,
+            'horizon': horizon,
+            'feature_params': feature_params,
+            'params': params,
+            'data_fingerprint': fingerprint,
+            'anchor_fingerprint': anchor_fingerprint(df, df.index[-1]),
+            'last_timestamp': df.index[-1],
+            'train_end': features['dates'][len(features['X_train']) + window_size + horizon - 2],
+            'n_rows': len(df),
+            'metrics': metrics,
+            'updates': updates,
+            'status': status,
+            'created_at': pd.Timestamp.now(tz='UTC').isoformat(),
+        }
+        save_artifact(path, artifact)
+
+    trained = {'model': 'mlp', 'estimator': estimator, 'horizon': features['horizon'], 'metrics': metrics,
+               'version': artifact['version'], 'status': status}
+    return features, trained, status
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from . import load_data
+
+    parser = argparse.ArgumentParser(prog='btc_forecast.artifacts', description='MLP 모델 아티팩트 갱신')
+    parser.add_argument('--ticker', default='BTC-USD')
+    parser.add_argument('--period', default='6mo')
+    parser.add_argument('--retrain', action='store_true', help='저장된 모델을 무시하고 처음부터 학습')
+    args = parser.parse_args()
+
+    df = load_data(args.ticker, period=args.period)
+    start = time.perf_counter()
+    _, trained, status = train_with_artifacts(df, ticker=args.ticker, retrain=args.retrain)
+    print(f"Model {status} (v{trained['version']}, {time.perf_counter() - start:.2f}s, "
+          f"MAE ${trained['metrics']['mae']:.2f})")
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+backtest.py
+===========
+[기능]
+전체 기간에 학습/테스트 구간(fold)을 밀어가면서 모델을 다시 학습하고 예측을 채점하는 워크포워드(walk-forward) 백테스트입니다.
+90/10 분할 한 번의 점수가 아니라, 여러 시점에서 "그때까지의 데이터로 학습 -> 다음 horizon시간 예측"을 반복합니다.
+
+[수행 과정]
+1. 예측 시점(origin)을 step시간 간격으로 잡고, fold마다
+   - 학습 구간: origin 이전 전체(expanding) 또는 직전 train_size시간(rolling)
+   - 테스트 구간: origin부터 horizon시간
+2. fold마다 build_features -> train -> forecast (정규화도 학습 구간에서만 fit하므로 미래 정보가 섞이지 않음)
+3. fold들을 여러 프로세스에서 동시에 실행하고 fold별/전체 MAE, 방향 정확도, 소요 시간을 냅니다.
+   - 방향 정확도: 예측 시점 가격 대비 오를지/내릴지를 맞힌 비율
+
+[사용법]
+   python -m btc_forecast.backtest --model linear --folds 200
+   python -m btc_forecast.backtest --model mlp --folds 50 --step 48 --window rolling --train-size 2000
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .features import build_features
+from .models import forecast, train
+
+MAX_WORKERS = os.cpu_count() or 1
+RESULT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'backtest')
+
+_DATA = None  # 작업 프로세스마다 한 번만 받아 두는 전체 OHLCV 데이터
+
+
+def _init_worker(data):
+    global _DATA
+    _DATA = data
+
+
+# -----------------------------------------------------------------------------
+# 1. fold 나누기
+# -----------------------------------------------------------------------------
+def make_folds(n_rows, horizon=24, step=24, n_folds=None, min_train=500, window='expanding', train_size=None):
+    """
+    fold 목록 [(학습 시작, origin), ...] (테스트는 origin부터 horizon시간)
+    - 가장 최근 fold부터 거꾸로 step 간격으로 잡고, n_folds개가 넘으면 최근 것만 사용
+    """
+    if window == 'rolling' and not train_size:
+        raise ValueError("rolling 방식은 train_size가 필요합니다")
+    first = max(min_train, train_size or 0)
+    origins = np.arange(n_rows - horizon, first - 1, -step)[::-1]
+    if n_folds is not None:
+        origins = origins[-n_folds:]
+    starts = origins - train_size if window == 'rolling' else np.zeros_like(origins)
+    return [(int(s), int(o)) for s, o in zip(starts, origins)]
+
+
+# -----------------------------------------------------------------------------
+# 2. fold 하나 실행 (프로세스 풀의 작업 단위)
+# -----------------------------------------------------------------------------
+def run_fold(model, start, origin, horizon, feature_params=None, train_params=None):
+    """
+    fold 하나: 학습 구간으로 학습 -> origin부터 horizon시간 예측 -> 채점
+    """
+    data = _DATA
+    train_df = data.iloc[start:origin]
+    actual = data['Close'].to_numpy(dtype=np.float64)[origin:origin + horizon]
+    base = float(train_df['Close'].iloc[-1])  # 예측 시점의 마지막 실제 가격
+
+    t0 = time.perf_counter()
+    features = build_features(train_df, model=model, **(feature_params or {}))
+    trained = train(features, **(train_params or {}))
+    t1 = time.perf_counter()
+    pred = np.asarray(forecast(trained, features, horizon=horizon)['predictions'], dtype=np.float64)
+    t2 = time.perf_counter()
+
+    return {
+        'origin': data.index[origin],
+        'train_rows': origin - start,
+        'mae': float(np.mean(np.abs(pred - actual))),
+        'final_error': float(pred[-1] - actual[-1]),
+        'direction_acc': float(np.mean(np.sign(pred - base) == np.sign(actual - base))),
+        'fit_seconds': t1 - t0,
+        'predict_seconds': t2 - t1,
+    }
+
+
+# -----------------------------------------------------------------------------
+# 3. 전체 백테스트
+# -----------------------------------------------------------------------------
+def walk_forward(df, model='linear', horizon=24, step=24, n_folds=None, min_train=500,
+                 window='expanding', train_size=None, feature_params=None, train_params=None,
+                 max_workers=None):
+    """
+    워크포워드 백테스트 -> (fold별 결과 표, 전체 요약 dict)
+    - model: 'linear' 또는 'mlp' (features.py / models.py의 모델이면 모두 가능)
+    - feature_params, train_params: build_features / train에 넘길 옵션
+    """
+    folds = make_folds(len(df), horizon=horizon, step=step, n_folds=n_folds,
+                       min_train=min_train, window=window, train_size=train_size)
+    if not folds:
+        raise ValueError(f'fold를 만들 수 없습니다: 데이터 {len(df)}개 (최소 학습 {min_train} + horizon {horizon})')
+
+    start = time.perf_counter()
+    args = [(model, s, o, horizon, feature_params, train_params) for s, o in folds]
+    workers = max(1, min(max_workers or MAX_WORKERS, len(folds)))
+    if workers == 1:
+        _init_worker(df)
+        rows = [run_fold(*a) for a in args]
+    else:
+        # 전체 데이터는 작업 프로세스마다 한 번만 넘기고, fold마다는 위치만 넘김
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(df,)) as executor:
+            futures = [executor.submit(run_fold, *a) for a in args]
+            rows = [future.result() for future in futures]
+    wall = time.perf_counter() - start
+
+    table = pd.DataFrame(rows).set_index('origin')
+    summary = {
+        'model': model,
+        'folds': len(table),
+        'horizon': horizon,
+        'mae_mean': float(table['mae'].mean()),
+        'mae_median': float(table['mae'].median()),
+        'direction_acc': float(table['direction_acc'].mean()),
+        'fit_seconds_total': float(table['fit_seconds'].sum()),
+        'wall_seconds': wall,
+        'workers': workers,
+    }
+    return table, summary
+
+
+def print_summary(summary):
+    print(f"\n[Walk-Forward Backtest - {summary['model']}]")
+    print(f"Folds:              {summary['folds']} (horizon {summary['horizon']}h)")
+    print(f"MAE (mean/median):  ${summary['mae_mean']:.2f} / ${summary['mae_median']:.2f}")
+    print(f"Direction Accuracy: {summary['direction_acc']:.1%}")
+    print(f"Time:               {summary['wall_seconds']:.1f}s wall, "
+          f"{summary['fit_seconds_total']:.1f}s total fit ({summary['workers']} workers)")
+
+
+if __name__ == "__main__":
+    from . import load_data
+
+    parser = argparse.ArgumentParser(prog='btc_forecast.backtest', description='워크포워드 백테스트')
+    parser.add_argument('--model', choices=['linear', 'mlp'], default='linear')
+    parser.add_argument('--ticker', default='BTC-USD')
+    parser.add_argument('--period', default='6mo', help='백테스트 데이터 기간 (기본 6mo)')
+    parser.add_argument('--horizon', type=int, default=24, help='fold마다 예측할 시간 수 (기본 24)')
+    parser.add_argument('--step', type=int, default=24, help='fold 사이 간격 (시간, 기본 24)')
+    parser.add_argument('--folds', type=int, help='최근 fold 개수 (없으면 가능한 전부)')
+    parser.add_argument('--min-train', type=int, default=500, help='첫 fold의 최소 학습 데이터 수')
+    parser.add_argument('--window', choices=['expanding', 'rolling'], default='expanding')
+    parser.add_argument('--train-size', type=int, help='rolling 방식의 학습 구간 길이 (시간)')
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS, help='동시에 실행할 프로세스 수')
+    args = parser.parse_args()
+
+    df = load_data(args.ticker, period=args.period)
+    print(f"Backtesting {args.model} on {len(df):,} hourly bars...")
+    table, summary = walk_forward(df, model=args.model, horizon=args.horizon, step=args.step,
+                                  n_folds=args.folds, min_train=args.min_train, window=args.window,
+                                  train_size=args.train_size, max_workers=args.workers)
+    print_summary(summary)
+
+    os.makedirs(RESULT_DIR, exist_ok=True)
+    output_path = os.path.join(RESULT_DIR, f'{args.ticker}_{args.model}_folds.csv')
+    table.to_csv(output_path)
+    print(f"Fold results saved to {output_path}")
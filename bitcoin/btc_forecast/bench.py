@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""
+bench.py
+========
+[기능]
+bitcoin_basic.py / bitcoin_deep.py의 단계별 시간과 메모리를 데이터 크기별로 측정합니다.
+Yahoo Finance 대신 synthetic.py의 가짜 데이터를 쓰므로 네트워크 없이 실행되고, 같은 seed면 같은 데이터입니다.
+
+[측정 단계]
+download(가짜 원본에서 받기 + 정리), store(Parquet 저장/읽기), indicators(모든 지표), scale(정규화),
+windows(윈도우 + 모델 입력 복사), mlp_features(build_mlp_features 전체), linear_fit, mlp_fit,
+forecast(24시간 반복 예측), score_history(과거 전체 시각에서 24시간 예측), rolling_trend, plot
+
+[결과]
+- 시간: 단계마다 repeat번 실행해서 최소/중앙값 (초)
+- 메모리: 따로 한 번 더 실행하면서 tracemalloc으로 잰 최대 사용량 증가분 (MB, numpy 배열 포함)
+- data/bench/bench_<시각>.json 에 실행 환경(커밋, 라이브러리 버전)과 함께 저장
+- --compare로 이전 결과 파일과 단계별 시간 비율을 비교
+
+[사용법]
+   python -m btc_forecast.bench                                 # 1개월, 6개월, 1년, 2년
+   python -m btc_forecast.bench --sizes 720 4320 --repeat 5 --stages mlp_fit forecast
+   python -m btc_forecast.bench --compare data/bench/bench_20260101T000000.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from .features import MLP_FEATURES, add_features, build_linear_features, build_mlp_features, scale_features
+from .indicators import INDICATORS, compute_indicators
+from .models import forecast, score_history, train
+from .store import fetch
+from .synthetic import synthetic_source
+from .trend import rolling_trend
+from .windows import as_model_input, make_windows
+
+BENCH_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'bench')
+SIZES = [720, 4320, 8760, 17520]  # 1개월, 6개월, 1년, 2년 (시간봉 개수)
+END = pd.Timestamp('2025-01-01', tz='UTC')  # 가짜 데이터의 마지막 시각 (실행할 때마다 같은 데이터)
+
+
+# -----------------------------------------------------------------------------
+# 1. 단계 (ctx: 앞 단계 결과를 담는 dict, 각 단계는 ctx에 새 값을 더해서 돌려줌)
+# -----------------------------------------------------------------------------
+def stage_download(ctx):
+    start = END - pd.Timedelta(hours=ctx['hours'])
+    return {'df': fetch('BTC-USD', '1h', synthetic_source(seed=ctx['seed'], start=start, end=END), start=start)}
+
+
+def stage_store(ctx):
+    path = os.path.join(ctx['tmp_dir'], 'ohlcv.parquet')
+    ctx['df'].to_parquet(path, compression='zstd')
+    return {'stored': pd.read_parquet(path)}
+
+
+def stage_indicators(ctx):
+    return {'indicators': compute_indicators(ctx['df'], list(INDICATORS))}
+
+
+def stage_scale(ctx):
+    data = add_features(ctx['df'], MLP_FEATURES)
+    return {'scaled': scale_features(data, MLP_FEATURES)[0]}
+
+
+def stage_windows(ctx):
+    X, y = make_windows(ctx['scaled'], 10)
+    return {'X': as_model_input(X)}
+
+
+def stage_mlp_features(ctx):
+    return {'features': build_mlp_features(ctx['df'])}
+
+
+def stage_linear_fit(ctx):
+    features = build_linear_features(ctx['df'])
+    return {'linear': (features, train(features))}
+
+
+def stage_mlp_fit(ctx):
+    return {'trained': train(ctx['features'], max_iter=ctx['max_iter'])}
+
+
+def stage_forecast(ctx):
+    return {'result': forecast(ctx['trained'], ctx['features'], horizon=24)}
+
+
+def stage_score_history(ctx):
+    return {'history': score_history(ctx['trained'], ctx['features'], horizon=24)}
+
+
+def stage_rolling_trend(ctx):
+    return {'trend': rolling_trend(ctx['df']['Close'], 200)}
+
+
+def stage_plot(ctx):
+    from .plotting import plot_forecast
+
+    result = ctx['result']
+    plot_forecast('mlp', 'BTC-USD', result['dates'], result['prices'], result['future_dates'],
+                  result['predictions'], result['metrics'], None, os.path.join(ctx['tmp_dir'], 'forecast.png'))
+    return {}
+
+
+# 실행 순서대로 (뒤 단계는 앞 단계 결과를 씀)
+STAGES = {
+    'download': stage_download,
+    'store': stage_store,
+    'indicators': stage_indicators,
+    'scale': stage_scale,
+    'windows': stage_windows,
+    'mlp_features': stage_mlp_features,
+    'linear_fit': stage_linear_fit,
+    'mlp_fit': stage_mlp_fit,
+    'forecast': stage_forecast,
+    'score_history': stage_score_history,
+    'rolling_trend': stage_rolling_trend,
+    'plot': stage_plot,
+}
+# 선택한 단계를 실행하려면 먼저 있어야 하는 단계
+REQUIRES = {
+    'store': ['download'], 'indicators': ['download'], 'scale': ['download'], 'windows': ['scale'],
+    'mlp_features': ['download'], 'linear_fit': ['download'], 'mlp_fit': ['mlp_features'],
+    'forecast': ['mlp_fit'], 'score_history': ['mlp_fit'], 'rolling_trend': ['download'], 'plot': ['forecast'],
+}
+
+
+def resolve_stages(selected):
+    """
+    고른 단계 + 필요한 앞 단계 -> 실행 순서대로 [(이름, 측정 여부)]
+    """
+    needed = set()
+    todo = list(selected)
+    while todo:
+        name = todo.pop()
+        if name not in needed:
+            needed.add(name)
+            todo.extend(REQUIRES.get(name, []))
+    return [(name, name in selected) for name in STAGES if name in needed]
+
+
+# -----------------------------------------------------------------------------
+# 2. 측정
+# -----------------------------------------------------------------------------
+def measure(func, ctx, repeat=3, memory=True):
+    """
+    단계 하나: repeat번 실행 시간 + (memory면) 한 번 더 실행하며 최대 메모리 증가분 -> (결과, 측정값 dict)
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = func(ctx)
+        times.append(time.perf_counter() - start)
+
+    stats = {'seconds_min': min(times), 'seconds_median': statistics.median(times)}
+    if memory:
+        tracemalloc.start()
+        base = tracemalloc.get_traced_memory()[0]
+        func(ctx)
+        stats['peak_mb'] = (tracemalloc.get_traced_memory()[1] - base) / 2 ** 20
+        tracemalloc.stop()
+    return out, stats
+
+
+def run_bench(sizes=SIZES, stages=None, repeat=3, seed=42, max_iter=50, memory=True):
+    """
+    데이터 크기 x 단계별 측정 -> 결과 행 목록 [{'hours', 'stage', 'seconds_min', ...}]
+    """
+    import warnings
+
+    from sklearn.exceptions import ConvergenceWarning
+
+    plan = resolve_stages(stages or list(STAGES))
+    if any(name == 'plot' for name, _ in plan):
+        # matplotlib을 처음 불러오는 시간은 plot 단계 시간에서 뺌 (반복마다 다르게 나오지 않도록)
+        from .plotting import render_module
+        render_module().pyplot()
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp_dir, warnings.catch_warnings():
+        # max_iter를 작게 잡으므로 수렴 경고는 무시
+        warnings.simplefilter('ignore', ConvergenceWarning)
+        for hours in sizes:
+            ctx = {'hours': hours, 'seed': seed, 'max_iter': max_iter, 'tmp_dir': tmp_dir}
+            for name, timed in plan:
+                if timed:
+                    out, stats = measure(STAGES[name], ctx, repeat=repeat, memory=memory)
+                    rows.append({'hours': hours, 'stage': name, **stats})
+                    print(f"{hours:>7,}h  {name:<14} {stats['seconds_min'] * 1000:>10.1f}ms"
+                          + (f"  {stats['peak_mb']:>8.1f}MB" if memory else ''))
+                else:
+                    out = STAGES[name](ctx)
+                ctx.update(out)
+    return rows
+
+
+def environment():
+    """
+    결과를 비교할 때 필요한 실행 환경 (커밋, 버전, CPU)
+    """
+    import sklearn
+
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'created_at': pd.Timestamp.now(tz='UTC').isoformat(),
+    }
+
+
+def save_results(rows, settings, bench_dir=BENCH_DIR):
+    os.makedirs(bench_dir, exist_ok=True)
+    path = os.path.join(bench_dir, f"bench_{pd.Timestamp.now(tz='UTC').strftime('%Y%m%dT%H%M%S')}.json")
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'environment': environment(), 'settings': settings, 'results': rows}, f, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+
+def compare(rows, baseline_path):
+    """
+    이전 결과 파일과 비교 -> 단계별 시간 비율 표 (1보다 크면 느려짐)
+    """
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = pd.DataFrame(json.load(f)['results'])
+    merged = pd.DataFrame(rows).merge(baseline, on=['hours', 'stage'], suffixes=('', '_base'))
+    merged['ratio'] = merged['seconds_min'] / merged['seconds_min_base']
+    return merged.pivot(index='stage', columns='hours', values='ratio').reindex(
+        [s for s in STAGES if s in set(merged['stage'])])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog='btc_forecast.bench', description='단계별 시간/메모리 벤치마크 (오프라인)')
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES, help='데이터 크기 (시간봉 개수)')
+    parser.add_argument('--stages', nargs='+', choices=list(STAGES), help='측정할 단계 (기본 전체)')
+    parser.add_argument('--repeat', type=int, default=3, help='단계마다 반복 횟수 (기본 3)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--max-iter', type=int, default=50, help='mlp_fit의 최대 학습 반복 수 (기본 50)')
+    parser.add_argument('--no-memory', action='store_true', help='메모리 측정 생략')
+    parser.add_argument('--compare', metavar='PATH', help='비교할 이전 결과 파일')
+    args = parser.parse_args()
+
+    settings = {'sizes': args.sizes, 'stages': args.stages or list(STAGES), 'repeat': args.repeat,
+                'seed': args.seed, 'max_iter': args.max_iter}
+    rows = run_bench(args.sizes, args.stages, repeat=args.repeat, seed=args.seed, max_iter=args.max_iter,
+                     memory=not args.no_memory)
+    path = save_results(rows, settings)
+    print(f"Results saved to {path}")
+
+    if args.compare:
+        print("\n[Time Ratio vs Baseline] (>1 = slower)")
+        print(compare(rows, args.compare).to_string(float_format=lambda v: f'{v:.2f}x'))
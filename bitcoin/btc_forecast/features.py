@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+features.py
+===========
+[기능]
+OHLCV 데이터 -> 모델 입력(피처) 만들기
+
+[모델별 입력]
+1. linear (bitcoin_basic.py): 최근 lookback시간의 종가, 시간의 흐름(0, 1, 2, ...)이 X
+2. mlp (bitcoin_deep.py): 종가/거래량/이동평균(MA5, MA20)을 0~1로 정규화하고,
+   과거 window_size시간을 한 묶음으로 본 것이 X, 다음 1시간의 종가가 y
+   (X, y는 정규화된 배열의 보기이므로 윈도우마다 복사하지 않음)
+
+[파생 피처]
+이동평균, EMA, RSI 등 기술 지표는 indicators.py 엔진으로 계산합니다.
+(예측 단계의 rollout도 같은 엔진으로 새 봉마다 갱신하므로 학습과 예측의 피처 정의가 같음)
+"""
+
+import numpy as np
+
+from .indicators import INDICATORS, compute_indicators
+from .windows import make_windows, split_windows
+
+MLP_FEATURES = ['Close', 'Volume', 'MA5', 'MA20']
+TARGET = 'Close'  # 피처 목록의 첫 번째 컬럼이어야 함
+
+# OHLCV에서 파생 피처 만드는 방법 (기술 지표는 indicators.INDICATORS, 그 외는 여기)
+DERIVED_FEATURES = {
+    'Slope200': lambda d: _trend(d, 200, 'slope_pct'),                     # 200시간 추세 기울기 (%/h)
+    'R2_200': lambda d: _trend(d, 200, 'r2'),                              # 200시간 추세의 R²
+}
+
+
+def _trend(data, window, column):
+    # trend.py는 python -m btc_forecast.trend로도 실행하므로 여기서 불러옴
+    from .trend import rolling_trend
+    return rolling_trend(data['Close'], window)[column]
+
+
+def add_features(df, feature_cols=MLP_FEATURES):
+    """
+    feature_cols 중 원본에 없는 파생 피처를 계산해서 붙이고, 계산이 안 되는 앞부분(NaN)은 제거
+    """
+    data = df.copy()
+    missing = [col for col in feature_cols if col not in data.columns]
+    indicators = compute_indicators(data, [col for col in missing if col in INDICATORS])
+    for col in missing:
+        if col in indicators.columns:
+            data[col] = indicators[col]
+        elif col in DERIVED_FEATURES:
+            data[col] = DERIVED_FEATURES[col](data)
+        else:
+            raise ValueError(f'알 수 없는 피처: {col}')
+    return data.dropna(subset=feature_cols)
+
+
+def scale_features(data, feature_cols=MLP_FEATURES, scalers=None):
+    """
+    피처를 0~1로 정규화 -> (정규화된 배열, 피처 Scaler, 종가 Scaler)
+    - scalers: 저장된 모델의 (피처 Scaler, 종가 Scaler)를 주면 다시 fit하지 않고 그대로 사용
+    """
+    from sklearn.preprocessing import MinMaxScaler
+
+    if feature_cols[0] != TARGET:
+        raise ValueError(f'피처 목록의 첫 번째는 {TARGET}이어야 합니다: {feature_cols}')
+    if scalers is not None:
+        scaler, target_scaler = scalers
+        return scaler.transform(data[feature_cols].to_numpy()), scaler, target_scaler
+    # 전체 데이터에 대해 Fit (예측 단계에서 배열로 변환하므로 컬럼 이름 없이 학습)
+    scaler = MinMaxScaler()
+    scaled_data = scaler.fit_transform(data[feature_cols].to_numpy())
+    # 타겟 역변환을 위한 Scaler (Close Price만)
+    target_scaler = MinMaxScaler()
+    target_scaler.fit(data[[TARGET]].to_numpy())
+    return scaled_data, scaler, target_scaler
+
+
+def build_linear_features(df, lookback=200):
+    """
+    선형 추세 모델 입력: 최근 lookback시간
+    """
+    if len(df) < lookback:
+        raise ValueError(f'데이터가 부족합니다: {len(df)}개 (최소 {lookback}개 필요)')
+    data = df.tail(lookback)
+    prices = data['Close'].to_numpy(dtype=np.float64).flatten()
+    return {
+        'model': 'linear',
+        'dates': data.index,
+        'prices': prices,
+        # X (Feature): 시간의 흐름을 0부터 lookback-1까지의 정수로 표현
+        'X': np.arange(len(prices)).reshape(-1, 1),
+        # y (Target): 각 시점의 종가
+        'y': prices.reshape(-1, 1),
+    }
+
+
+def build_mlp_features(df, window_size=10, test_ratio=0.1, horizon=1, feature_cols=MLP_FEATURES, scalers=None):
+    """
+    MLP 모델 입력: 정규화 + 슬라이딩 윈도우 + 학습/테스트 분할 (최근 test_ratio를 테스트 셋으로)
+    - horizon: y에 담을 미래 시간 수 (1이면 다음 1시간, 24면 다음 24시간을 한 번에 예측하는 모델용)
+    - feature_cols: 입력 피처 (첫 번째는 Close, 파생 피처는 DERIVED_FEATURES 참고)
+    - scalers: 저장된 모델의 Scaler 쌍 (artifacts.py, 없으면 이 데이터로 새로 fit)
+    """
+    # 파생 변수 생성: 이동평균선 (Moving Average) 등 - 시간 단위
+    feature_cols = list(feature_cols)
+    data = add_features(df, feature_cols)
+    if len(data) <= window_size + horizon:
+        raise ValueError(f'데이터가 부족합니다: {len(data)}개')
+
+    scaled_data, scaler, target_scaler = scale_features(data, feature_cols, scalers)
+
+    # 슬라이딩 윈도우: 과거 window_size시간의 패턴 -> 다음 horizon시간 (Close price index = 0)
+    # 정규화된 배열 하나를 가리키는 보기만 만들고, 모델에 넣을 때 float32로 변환 (windows.py)
+    X, y = make_windows(scaled_data, window_size, horizon=horizon, target_col=0)
+    return {
+        'model': 'mlp',
+        'data': data,
+        'ohlcv': df,  # 원본 (rollout에서 지표 상태를 이어받을 때 사용)
+        'dates': data.index,
+        'prices': data['Close'].to_numpy(dtype=np.float64),
+        'scaled': scaled_data,
+        'scaler': scaler,
+        'target_scaler': target_scaler,
+        'window_size': window_size,
+        'horizon': horizon,
+        'feature_cols': feature_cols,
+        **split_windows(X, y, test_ratio),
+    }
+
+
+def build_features(df, model='linear', **kwargs):
+    """
+    모델 종류에 맞는 입력 만들기 (model: 'linear' 또는 'mlp')
+    """
+    if model == 'linear':
+        return build_linear_features(df, **kwargs)
+    if model == 'mlp':
+        return build_mlp_features(df, **kwargs)
+    raise ValueError(f'알 수 없는 모델: {model}')
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+indicators.py
+=============
+[기능]
+기술 지표(SMA, EMA, RSI, 변동성, 거래량 z-score 등)를 계산하는 엔진입니다.
+학습(features.py)과 예측(models.rollout)이 같은 정의를 쓰기 때문에 두 곳의 피처가 같습니다.
+
+[두 가지 계산 방법]
+1. compute_indicators: 과거 전체를 pandas/numpy로 한 번에 계산 (학습용)
+2. IndicatorState    : 지금까지의 상태(고정 크기 링 버퍼 + 누적합, EMA/RSI 값)에서 새 봉 하나로 갱신 (예측용)
+   - 새 봉마다 버퍼에서 빠지는 값은 빼고 들어오는 값은 더하므로 윈도우 길이와 상관없이 O(1)
+   - 시작 시점 여러 개(시나리오)를 (시작 시점 수, 윈도우) 배열로 묶어서 한 번에 갱신
+
+[지표 추가]
+INDICATORS에 '이름': (종류, 기간)을 추가하면 학습/예측 양쪽에서 바로 사용할 수 있습니다.
+"""
+
+import numpy as np
+import pandas as pd
+
+# 지표 이름 -> (종류, 기간)
+INDICATORS = {
+    'MA5': ('sma', 5),
+    'MA20': ('sma', 20),
+    'MA50': ('sma', 50),
+    'EMA12': ('ema', 12),
+    'EMA26': ('ema', 26),
+    'RSI14': ('rsi', 14),
+    'Return': ('return', 1),            # 1시간 수익률
+    'Volatility': ('volatility', 24),   # 24시간 수익률 표준편차
+    'Range': ('range', 1),              # 봉의 고저 폭 / 종가
+    'VolumeZ24': ('volume_z', 24),      # 24시간 거래량 z-score
+}
+
+
+def indicator_names(names):
+    """
+    피처 목록 중 이 엔진이 계산하는 지표만
+    """
+    return [name for name in names if name in INDICATORS]
+
+
+def warmup(names):
+    """
+    지표를 모두 계산하는 데 필요한 최소 과거 봉 수 (IndicatorState의 시작 위치는 이 값 이상이어야 함)
+    """
+    need = 1
+    for name in indicator_names(names):
+        kind, window = INDICATORS[name]
+        need = max(need, window + 1 if kind in ('volatility', 'rsi', 'return') else window)
+    return need
+
+
+# -----------------------------------------------------------------------------
+# 1. 과거 전체 한 번에 (학습용)
+# -----------------------------------------------------------------------------
+def _ema(values, window):
+    return values.ewm(span=window, adjust=False, min_periods=window).mean()
+
+
+def _wilder(values, window):
+    # RSI의 평균 상승/하락폭 (Wilder 평활: alpha = 1 / window)
+    return values.ewm(alpha=1 / window, adjust=False, min_periods=window).mean()
+
+
+def _rsi(avg_gain, avg_loss):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(avg_loss > 0, 100 - 100 / (1 + avg_gain / avg_loss), 100.0)
+
+
+def compute_indicator(df, name):
+    """
+    OHLCV 데이터 -> 지표 하나의 시계열 (계산이 안 되는 앞부분은 NaN)
+    """
+    kind, window = INDICATORS[name]
+    close = df['Close']
+    if kind == 'sma':
+        return close.rolling(window=window).mean()
+    if kind == 'ema':
+        return _ema(close, window)
+    if kind == 'rsi':
+        delta = close.diff()
+        avg_gain, avg_loss = _wilder(delta.clip(lower=0), window), _wilder((-delta).clip(lower=0), window)
+        return pd.Series(_rsi(avg_gain, avg_loss), index=df.index).where(avg_gain.notna())
+    if kind == 'return':
+        return close.pct_change()
+    if kind == 'volatility':
+        return close.pct_change().rolling(window=window).std()
+    if kind == 'range':
+        return (df['High'] - df['Low']) / close
+    if kind == 'volume_z':
+        rolling = df['Volume'].rolling(window=window)
+        std = rolling.std()
+        return ((df['Volume'] - rolling.mean()) / std).where(std != 0, 0.0)
+    raise ValueError(f'알 수 없는 지표 종류: {kind}')
+
+
+def compute_indicators(df, names):
+    """
+    OHLCV 데이터 -> 지표 표 (컬럼: names 중 이 엔진이 계산하는 지표)
+    """
+    names = indicator_names(names)
+    return pd.DataFrame({name: compute_indicator(df, name) for name in names}, index=df.index)
+
+
+# -----------------------------------------------------------------------------
+# 2. 새 봉 하나씩 갱신 (예측용)
+# -----------------------------------------------------------------------------
+class IndicatorState:
+    """
+    시작 시점들(ends)까지의 지표 상태 -> update(새 종가)마다 O(1)로 지표 값 갱신
+
+        state = IndicatorState(['MA5', 'RSI14'], df, ends)   # ends: 각 시나리오의 다음 봉 위치
+        values = state.update(pred_close)                   # {'MA5': (시나리오 수,), 'RSI14': ...}
+
+    거래량/고가/저가를 주지 않으면 마지막 값을 그대로 씀 (예측에서는 종가만 알기 때문)
+    """
+
+    def __init__(self, names, df, ends):
+        self.names = indicator_names(names)
+        ends = np.atleast_1d(np.asarray(ends))
+        if len(ends) and ends.min() < warmup(self.names):
+            raise ValueError(f'지표 계산에 과거 {warmup(self.names)}개 봉이 필요합니다 (시작 위치 {ends.min()})')
+        close = df['Close'].to_numpy(dtype=np.float64)
+        returns = df['Close'].pct_change().to_numpy(dtype=np.float64)
+        volume = df['Volume'].to_numpy(dtype=np.float64)
+        self.last_close = close[ends - 1]
+        self.last_volume = volume[ends - 1]
+        self.last_range = None
+        if 'High' in df.columns and 'Low' in df.columns:
+            self.last_range = ((df['High'] - df['Low']) / df['Close']).to_numpy(dtype=np.float64)[ends - 1]
+
+        # 링 버퍼: 값 종류마다 가장 긴 윈도우 크기 하나, 윈도우별로는 누적합만 따로
+        windows = {'close': [], 'return': [], 'volume': []}
+        for name in self.names:
+            kind, window = INDICATORS[name]
+            source = {'sma': 'close', 'volatility': 'return', 'volume_z': 'volume'}.get(kind)
+            if source:
+                windows[source].append(window)
+        series = {'close': close, 'return': returns, 'volume': volume}
+        self.buffers = {}
+        for source, sizes in windows.items():
+            if sizes:
+                self.buffers[source] = _RingBuffer(series[source], ends, sizes)
+
+        # 재귀식 지표(EMA, RSI)는 과거 전체로 계산한 마지막 값에서 이어감
+        self.ema, self.rsi = {}, {}
+        for name in self.names:
+            kind, window = INDICATORS[name]
+            if kind == 'ema':
+                self.ema[name] = _ema(df['Close'], window).to_numpy(dtype=np.float64)[ends - 1]
+            elif kind == 'rsi':
+                delta = df['Close'].diff()
+                self.rsi[name] = (_wilder(delta.clip(lower=0), window).to_numpy(dtype=np.float64)[ends - 1],
+                                  _wilder((-delta).clip(lower=0), window).to_numpy(dtype=np.float64)[ends - 1])
+
+    def update(self, close, volume=None, high=None, low=None):
+        """
+        새 봉 하나 반영 -> {지표 이름: (시나리오 수,) 값}
+        """
+        close = np.asarray(close, dtype=np.float64)
+        volume = self.last_volume if volume is None else np.asarray(volume, dtype=np.float64)
+        ret = close / self.last_close - 1
+        if high is not None and low is not None:
+            self.last_range = (np.asarray(high) - np.asarray(low)) / close
+
+        new = {'close': close, 'return': ret, 'volume': volume}
+        for source, buffer in self.buffers.items():
+            buffer.push(new[source])
+
+        values = {}
+        for name in self.names:
+            kind, window = INDICATORS[name]
+            if kind == 'sma':
+                values[name] = self.buffers['close'].mean(window)
+            elif kind == 'ema':
+                alpha = 2 / (window + 1)
+                self.ema[name] = alpha * close + (1 - alpha) * self.ema[name]
+                values[name] = self.ema[name]
+            elif kind == 'rsi':
+                avg_gain, avg_loss = self.rsi[name]
+                delta = close - self.last_close
+                avg_gain = avg_gain + (np.maximum(delta, 0) - avg_gain) / window
+                avg_loss = avg_loss + (np.maximum(-delta, 0) - avg_loss) / window
+                self.rsi[name] = (avg_gain, avg_loss)
+                values[name] = _rsi(avg_gain, avg_loss)
+            elif kind == 'return':
+                values[name] = ret
+            elif kind == 'volatility':
+                values[name] = self.buffers['return'].std(window)
+            elif kind == 'range':
+                values[name] = self.last_range
+            elif kind == 'volume_z':
+                buffer = self.buffers['volume']
+                std = buffer.std(window)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    values[name] = np.where(std > 0, (volume - buffer.mean(window)) / std, 0.0)
+
+        self.last_close, self.last_volume = close, volume
+        return values
+
+
+class _RingBuffer:
+    """
+    (시나리오 수, 최대 윈도우) 고정 크기 버퍼 + 윈도우 길이별 합계/제곱합
+    """
+
+    def __init__(self, values, ends, sizes):
+        self.size = max(sizes)
+        self.pos = 0  # 다음에 덮어쓸 칸 (= 가장 오래된 값)
+        # 처음 상태: 각 시나리오의 직전 size개 값 (오래된 순서)
+        self.buffer = np.array(values[(ends - self.size)[:, None] + np.arange(self.size)], dtype=np.float64)
+        self.sums = {w: self.buffer[:, self.size - w:].sum(axis=1) for w in set(sizes)}
+        self.sumsq = {w: (self.buffer[:, self.size - w:] ** 2).sum(axis=1) for w in set(sizes)}
+
+    def push(self, value):
+        for w in self.sums:
+            # 윈도우 w에서 빠지는 값 = w칸 전에 들어온 값
+            leaving = self.buffer[:, (self.pos - w) % self.size]
+            self.sums[w] += value - leaving
+            self.sumsq[w] += value * value - leaving * leaving
+        self.buffer[:, self.pos] = value
+        self.pos = (self.pos + 1) % self.size
+
+    def mean(self, window):
+        return self.sums[window] / window
+
+    def std(self, window):
+        # 표본 표준편차 (pandas rolling().std()와 같은 ddof=1)
+        var = (self.sumsq[window] - self.sums[window] ** 2 / window) / (window - 1)
+        return np.sqrt(np.maximum(var, 0.0))
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""
+models.py
+=========
+[기능]
+features.py의 입력으로 모델을 학습하고 미래 가격을 예측합니다.
+
+[모델]
+1. linear: 시간(X)과 가격(y)의 선형 관계(y = wx + b)로 추세선을 구해서 연장
+2. mlp (recursive): '과거 window_size시간 -> 다음 1시간'을 예측하는 MLPRegressor를 horizon번 반복
+   (예측한 종가로 이동평균을 다시 계산해서 다음 입력을 만듦)
+3. mlp (direct): '과거 window_size시간 -> 다음 horizon시간'을 한 번에 내는 다중 출력 모델
+   (build_features(..., horizon=24)로 만든 입력으로 학습하면 예측이 predict 한 번)
+
+[묶음 예측]
+시작 시점 여러 개(시나리오)를 행렬 하나로 묶어서 계산합니다.
+recursive도 단계마다 모든 시작 시점을 한 번에 predict하므로, 과거의 모든 시각에서 예측해 보는
+score_history도 predict 호출 횟수가 시작 시점 수와 상관없이 horizon번(direct는 1번)입니다.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .indicators import INDICATORS, IndicatorState, warmup
+from .windows import as_model_input, as_model_target, window_view
+
+MLP_PARAMS = {
+    'hidden_layer_sizes': (128, 64, 32),
+    'activation': 'relu',
+    'solver': 'adam',
+    'max_iter': 500,
+    'random_state': 42,
+    'early_stopping': True,  # 과적합 방지
+}
+
+
+# -----------------------------------------------------------------------------
+# 1. 학습
+# -----------------------------------------------------------------------------
+def train(features, **params):
+    """
+    모델 학습 -> {'model': 종류, 'estimator': 학습된 모델, 'metrics': 성능 지표}
+    - linear: R² (학습 구간 결정 계수, 1에 가까울수록 추세선이 데이터를 잘 설명)
+    - mlp   : 테스트 셋 R², MAE (달러 단위 평균 절대 오차)
+    """
+    if features['model'] == 'linear':
+        from sklearn.linear_model import LinearRegression
+
+        estimator = LinearRegression(**params)
+        estimator.fit(features['X'], features['y'])
+        return {'model': 'linear', 'estimator': estimator,
+                'metrics': {'r2': float(estimator.score(features['X'], features['y']))}}
+
+    from sklearn.neural_network import MLPRegressor
+
+    # 윈도우 보기를 모델 입력용 float32 배열로 (학습할 때 한 번만 복사)
+    estimator = MLPRegressor(**{**MLP_PARAMS, **params})
+    estimator.fit(as_model_input(features['X_train']), as_model_target(features['y_train']))
+    return {'model': 'mlp', 'estimator': estimator, 'horizon': features.get('horizon', 1),
+            'metrics': evaluate_mlp(estimator, features)}
+
+
+def evaluate_mlp(estimator, features):
+    """
+    테스트 셋 성능 (다중 출력이면 모든 horizon의 평균) -> {'r2', 'mae'}
+    """
+    X_test, y_test = as_model_input(features['X_test']), as_model_target(features['y_test'])
+    target_scaler = features['target_scaler']
+    y_pred = estimator.predict(X_test)
+    y_test_inv = target_scaler.inverse_transform(y_test.reshape(-1, 1))
+    y_pred_inv = target_scaler.inverse_transform(y_pred.reshape(-1, 1))
+    return {'r2': float(estimator.score(X_test, y_test)),
+            'mae': float(np.mean(np.abs(y_test_inv - y_pred_inv)))}
+
+
+# -----------------------------------------------------------------------------
+# 2. 예측
+# -----------------------------------------------------------------------------
+def future_index(dates, horizon):
+    """
+    마지막 시각 이후 horizon개의 미래 시각 (봉 간격은 데이터에서 추정, 기본 1시간)
+    """
+    step = pd.Timedelta(hours=1)
+    if len(dates) > 1:
+        step = pd.Series(dates[1:] - dates[:-1]).median()
+    return [dates[-1] + step * i for i in range(1, horizon + 1)]
+
+
+def _inverse_close(target_scaler, scaled):
+    """
+    정규화된 종가 배열(모양 상관없음) -> 실제 가격 (한 번의 inverse_transform)
+    """
+    scaled = np.asarray(scaled, dtype=np.float64)
+    return target_scaler.inverse_transform(scaled.reshape(-1, 1)).reshape(scaled.shape)
+
+
+def start_windows(features, ends):
+    """
+    예측 시작 시점들의 입력 윈도우 (시작 시점 수, window_size, 피처 수)
+    - ends: 윈도우가 끝나는 위치 (data 기준, 그 행은 포함하지 않음). 마지막 시각이면 len(data)
+    """
+    windows = window_view(features['scaled'], features['window_size'])
+    return windows[np.asarray(ends) - features['window_size']]
+
+
+def predict_direct(trained, features, ends):
+    """
+    다중 출력 모델: 모든 시작 시점의 horizon시간 예측을 predict 한 번으로 -> (시작 시점 수, horizon) 가격
+    """
+    X = as_model_input(start_windows(features, ends))
+    pred = trained['estimator'].predict(X).reshape(len(X), -1)
+    return _inverse_close(features['target_scaler'], pred)
+
+
+def rollout_warmup(features):
+    """
+    rollout 시작 위치의 최소값 (입력 윈도우 + 지표 계산에 필요한 과거 봉 수)
+    """
+    ohlcv, data = features['ohlcv'], features['data']
+    # data는 지표 계산이 안 되는 앞부분을 뺀 것이므로, 원본 기준 필요한 봉 수에서 빠진 만큼 뺌
+    dropped = ohlcv.index.get_loc(data.index[0])
+    return max(features['window_size'], warmup(features['feature_cols']) - dropped, 1)
+
+
+def rollout(trained, features, ends, horizon):
+    """
+    1시간 모델을 horizon번 반복 (모든 시작 시점을 한 행렬로 묶어서 단계마다 predict 한 번)
+    -> (시작 시점 수, horizon) 가격
+    - 예측한 종가로 지표(MA5, MA20, ...)를 indicators.py 엔진으로 한 봉씩 갱신 (O(1))
+    - Volume(과 고가/저가)은 시작 시점의 마지막 값 유지
+    """
+    feature_cols = features['feature_cols']
+    unsupported = [c for c in feature_cols if c not in ('Close', 'Volume') and c not in INDICATORS]
+    if unsupported:
+        raise ValueError(f'반복 예측으로 갱신할 수 없는 피처입니다: {unsupported} (direct 모델 사용)')
+    ends = np.asarray(ends)
+    estimator = trained['estimator']
+    scaler = features['scaler']
+
+    # 지표 상태는 원본 OHLCV의 같은 시각에서 시작 (학습 때와 같은 과거로 계산된 값에서 이어감)
+    ohlcv = features['ohlcv']
+    source_ends = ohlcv.index.get_indexer(features['dates'][ends - 1]) + 1
+    state = IndicatorState(feature_cols, ohlcv, source_ends)
+
+    # 시작 입력 (복사해서 갱신)
+    current_input = np.array(start_windows(features, ends), dtype=np.float64)
+
+    preds = np.empty((len(ends), horizon))
+    for step in range(horizon):
+        # 1. 모델 예측 후 스케일 역변환하여 실제 가격 구함
+        pred_scaled = estimator.predict(as_model_input(current_input))
+        pred_price = _inverse_close(features['target_scaler'], pred_scaled)
+        preds[:, step] = pred_price
+
+        # 2. 새로운 가격으로 지표 갱신
+        values = state.update(pred_price)
+        values['Close'], values['Volume'] = pred_price, state.last_volume
+        new_rows_raw = np.column_stack([values[c] for c in feature_cols])
+
+        # 3. Input Window 갱신 (슬라이딩: 맨 앞 제거, 뒤에 추가)
+        current_input = np.concatenate([current_input[:, 1:], scaler.transform(new_rows_raw)[:, None]], axis=1)
+    return preds
+
+
+def predict_paths(trained, features, ends, horizon):
+    """
+    시작 시점들에서 horizon시간 예측 (학습한 모델 종류에 맞게 direct 또는 rollout)
+    """
+    model_horizon = trained.get('horizon', 1)
+    if model_horizon > 1:
+        if horizon > model_horizon:
+            raise ValueError(f'이 모델은 최대 {model_horizon}시간까지 예측합니다 (요청 {horizon}시간)')
+        return predict_direct(trained, features, ends)[:, :horizon]
+    return rollout(trained, features, ends, horizon)
+
+
+def score_history(trained, features, horizon=24, min_end=None):
+    """
+    과거의 모든 시각을 시작점으로 horizon시간 예측을 한 번에 계산해서 실제 가격과 비교
+    -> (시작 시각별 예측 표, horizon별 MAE)
+    """
+    prices = features['prices']
+    first = max(rollout_warmup(features) if trained.get('horizon', 1) == 1 else features['window_size'],
+                min_end or 0)
+    ends = np.arange(first, len(prices) - horizon + 1)
+    preds = predict_paths(trained, features, ends, horizon)
+    actual = window_view(prices, horizon)[ends, :, 0]
+
+    columns = [f'h{i}' for i in range(1, horizon + 1)]
+    table = pd.DataFrame(preds, index=features['dates'][ends - 1], columns=columns)
+    mae = pd.Series(np.abs(preds - actual).mean(axis=0), index=columns)
+    return table, mae
+
+
+def forecast(trained, features, horizon=24, display_hours=200):
+    """
+    향후 horizon시간 예측 -> 그래프/리포트용 결과
+    {'model', 'dates', 'prices', 'future_dates', 'predictions', 'metrics', ('trend')}
+    """
+    estimator = trained['estimator']
+    result = {
+        'model': trained['model'],
+        'metrics': trained['metrics'],
+        'future_dates': future_index(features['dates'], horizon),
+    }
+    if trained['model'] == 'linear':
+        n = len(features['prices'])
+        X_future = np.arange(n, n + horizon).reshape(-1, 1)
+        result['predictions'] = estimator.predict(X_future).flatten()
+        result['trend'] = estimator.predict(features['X']).flatten()
+        result['dates'] = features['dates']
+        result['prices'] = features['prices']
+    else:
+        result['predictions'] = predict_paths(trained, features, [len(features['prices'])], horizon)[0]
+        # 시각화 범위: 최근 display_hours시간
+        result['dates'] = features['dates'][-display_hours:]
+        result['prices'] = features['prices'][-display_hours:]
+    return result
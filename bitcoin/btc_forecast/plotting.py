@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+plotting.py
+===========
+[기능]
+forecast() 결과를 그래프로 저장합니다. (과거 가격 + 미래 예측선 + 성능 지표)
+matplotlib은 그래프를 실제로 그릴 때만 불러오고, 같은 결과로 이미 그린 그래프는 다시 그리지 않습니다.
+"""
+
+import os
+import sys
+
+# 그래프 모듈 (저장소 최상위 common/render.py)
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TITLES = {
+    'linear': 'Basic Linear',
+    'mlp': 'Deep Learning MLP',
+}
+PLOT_PIXELS = 1200  # 가로 12인치 x 100dpi (이보다 많은 봉은 그려도 구분되지 않음)
+
+
+def render_module():
+    """
+    저장소 최상위 common/render.py (btc_forecast에서 그래프 모듈을 가져오는 유일한 곳, 처음 부를 때 import)
+    """
+    if REPO_DIR not in sys.path:
+        sys.path.insert(0, REPO_DIR)
+    from common import render
+    return render
+
+
+def plot_forecast(model, ticker, dates, prices, future_dates, predictions, metrics, trend, output_path):
+    """
+    예측 그래프 한 장 그리기 (render_figures가 부르는 함수)
+    """
+    import matplotlib.dates as mdates  # 날짜 포맷팅
+
+    plt = render_module().pyplot()
+    fig, ax = plt.subplots(figsize=(12, 6))
+    # 예측 시간 수 (굵은 봉이면 봉 개수가 아니라 실제 시간)
+    horizon = int((future_dates[-1] - dates[-1]).total_seconds() // 3600)
+    unit = _bar_unit(future_dates[-1] - dates[-1], len(predictions))
+
+    if model == 'linear':
+        # 1. 과거 데이터: 실제 가격 흐름 (History) + 2. 모델 추세선 (과거 구간)
+        ax.plot(dates, prices, label=f'History (Past {len(prices)} {unit})', color='blue', alpha=0.6)
+        ax.plot(dates, trend, label='Linear Low-Best Fit', color='green', linestyle='--', alpha=0.7)
+        # 3. 미래 예측
+        ax.plot(future_dates, predictions, label=f'Future Prediction (Next {horizon}h)', color='red', linewidth=2)
+        ax.scatter([future_dates[-1]], [predictions[-1]], color='red', s=80, zorder=5)
+        text_str = f"Model Accuracy ($R^2$): {metrics['r2']:.4f}\n(Linear Trend Reliability)"
+        props = dict(boxstyle='round', facecolor='wheat', alpha=0.5)
+    else:
+        ax.plot(dates, prices, label=f'History (Last {len(prices)} {unit})', color='#1f77b4')
+        ax.plot(future_dates, predictions, label=f'Deep Prediction (Next {horizon}h)', color='#ff7f0e', linewidth=2)
+        ax.scatter([future_dates[-1]], [predictions[-1]], color='#ff7f0e', s=80, zorder=5)
+        text_str = f"Test Set MAE: ${metrics['mae']:.2f}\n(Model Error Margin)"
+        props = dict(boxstyle='round', facecolor='lavender', alpha=0.5)
+
+    # 성능 지표 텍스트 (왼쪽 상단)
+    ax.text(0.02, 0.95, text_str, transform=ax.transAxes, fontsize=11,
+            verticalalignment='top', bbox=props)
+
+    # X축 날짜 포맷 설정 (일-시간 표기, 2주보다 길면 날짜만)
+    if (future_dates[-1] - dates[0]).days > 14:
+        ax.xaxis.set_major_locator(mdates.AutoDateLocator())
+        ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
+    else:
+        ax.xaxis.set_major_locator(mdates.HourLocator(interval=24))  # 24시간 간격으로 메인 눈금
+        ax.xaxis.set_major_formatter(mdates.DateFormatter('%m-%d %Hh'))
+    plt.xticks(rotation=45)
+
+    # 그린 시각 대신 데이터 마지막 시각 (같은 데이터면 같은 그림이라 다시 그리지 않음)
+    ax.set_title(f"{ticker} Prediction - {TITLES[model]} (Next {horizon} Hours) | "
+                 f"{dates[-1].strftime('%Y-%m-%d %H:%M')}")
+    ax.set_xlabel("Date & Time")
+    ax.set_ylabel("Price (USD)")
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    plt.tight_layout()
+    plt.savefig(output_path)
+    plt.close()
+
+
+def _bar_unit(span, bars):
+    """
+    봉 간격 -> 범례에 쓸 단위 이름
+    """
+    hours = span.total_seconds() / 3600 / max(bars, 1)
+    return {1: 'Hours', 4: '4h Bars', 24: 'Days', 168: 'Weeks'}.get(round(hours), 'Bars')
+
+
+def plot(result, output_path, ticker='BTC-USD'):
+    """
+    forecast() 결과 그래프 저장 (데이터가 그대로면 다시 그리지 않음) -> 다시 그렸는지 여부
+    """
+    render = render_module()
+    rendered = render.render_figures([{
+        'func': plot_forecast,
+        'path': output_path,
+        'args': (result['model'], ticker, result['dates'], result['prices'], result['future_dates'],
+                 result['predictions'], result['metrics'], result.get('trend')),
+    }])
+    return bool(rendered)
+
+
+def plot_trend_history(ticker, dates, prices, trends, windows, output_path):
+    """
+    이동 추세 그래프 (위: 가격 + 윈도우별 추세선 끝값, 가운데: 시간당 기울기(%), 아래: R²)
+    """
+    plt = render_module().pyplot()
+    fig, axes = plt.subplots(3, 1, figsize=(12, 9), sharex=True, gridspec_kw={'height_ratios': [2, 1, 1]})
+
+    axes[0].plot(dates, prices, label='Close', color='#1f77b4', linewidth=1)
+    for w in windows:
+        axes[0].plot(dates, trends[f'fitted_{w}'], label=f'Trend ({w}h)', linewidth=1, alpha=0.8)
+        axes[1].plot(dates, trends[f'slope_pct_{w}'], label=f'{w}h', linewidth=1)
+        axes[2].plot(dates, trends[f'r2_{w}'], label=f'{w}h', linewidth=1)
+    axes[1].axhline(0, color='gray', linewidth=0.8)
+
+    axes[0].set_title(f"{ticker} Rolling Linear Trend | {dates[-1].strftime('%Y-%m-%d %H:%M')}")
+    axes[0].set_ylabel("Price (USD)")
+    axes[1].set_ylabel("Slope (%/h)")
+    axes[2].set_ylabel("$R^2$")
+    axes[2].set_ylim(0, 1)
+    axes[2].set_xlabel("Date")
+    for ax in axes:
+        ax.legend(loc='upper left')
+        ax.grid(True, alpha=0.3)
+    plt.tight_layout()
+    plt.savefig(output_path)
+    plt.close()
+
+
+def plot_rolling_trend(prices, trends, windows, output_path, ticker='BTC-USD'):
+    """
+    rolling_trends() 결과 그래프 저장 (데이터가 그대로면 다시 그리지 않음) -> 다시 그렸는지 여부
+    - 긴 기간은 그래프 폭에 맞는 굵은 봉(pyramid.py)의 마지막 값만 그림
+    """
+    from .pyramid import downsample, level_for_width
+
+    level = level_for_width(prices.index[-1] - prices.index[0], PLOT_PIXELS)
+    prices, trends = downsample(prices, level), downsample(trends, level)
+    render = render_module()
+    rendered = render.render_figures([{
+        'func': plot_trend_history,
+        'path': output_path,
+        'args': (ticker, prices.index, prices.to_numpy(), trends, list(windows)),
+    }])
+    return bool(rendered)
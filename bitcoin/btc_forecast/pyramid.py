@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""
+pyramid.py
+==========
+[기능]
+시간봉(1h) OHLCV에서 4시간봉, 일봉, 주봉을 미리 만들어 두는 해상도 피라미드입니다.
+긴 기간 그래프나 하루/일주일 단위 예측 모델은 1시간봉 대신 알맞은 굵기의 봉을 써서 처리할 행 수를 줄입니다.
+
+[구조]
+1h -> 4h -> 1d -> 1w (각 단계는 바로 아래 단계를 묶어서 만듦)
+   - 시가: 첫 봉의 시가, 고가: 최고, 저가: 최저, 종가: 마지막 봉의 종가, 거래량: 합
+   - Bars: 그 봉에 들어간 1시간봉 개수 (끝나지 않은 마지막 봉은 4h면 4개보다 적음)
+   - 4h와 1d는 UTC 자정 기준, 1w는 월요일 0시 시작
+
+[증분 갱신]
+저장소(store.py)는 마지막 봉부터 다시 받으므로 바뀌는 곳은 보통 맨 뒤입니다.
+그래서 단계마다 저장된 마지막 봉(아직 진행 중일 수 있음)이 시작하는 시각부터만 다시 묶고 앞부분은 그대로 둡니다.
+- 1h 데이터가 저장된 첫 봉보다 앞에서 시작하면(더 긴 기간으로 실행) 그 앞부분도 채움
+- 1h 데이터가 봉 중간부터 시작하면 맨 앞의 덜 찬 봉은 만들지 않음 (시가/거래량이 틀리므로)
+굵은 단계는 data/ohlcv/pyramid/에 Parquet으로 저장되고, 1h 데이터가 기간(period)만큼 잘려 있어도 과거 봉은 남습니다.
+
+[고르기]
+- level_for_width : 그래프 폭(픽셀)보다 봉 수가 적지 않은 가장 굵은 단계
+- level_for_horizon: 예측 기간을 min_steps번 이상 나눌 수 있는 가장 굵은 단계
+
+[사용법]
+   python -m btc_forecast.pyramid --period 1y                  # 피라미드 갱신 + 단계별 행 수
+   python -m btc_forecast --model mlp --level auto --horizon 168   # 1주일 예측 -> 일봉 7걸음
+"""
+
+import argparse
+import os
+
+import pandas as pd
+
+from .store import OHLCV_COLS, STORE_DIR, period_length, read_store, write_store
+
+PYRAMID_DIR = os.path.join(STORE_DIR, 'pyramid')
+HOURLY_LIMIT = pd.Timedelta(days=730)  # Yahoo Finance에서 1h 봉을 받을 수 있는 기간
+
+# 단계 -> 봉 길이 (가는 것부터)
+LEVELS = {
+    '1h': pd.Timedelta(hours=1),
+    '4h': pd.Timedelta(hours=4),
+    '1d': pd.Timedelta(days=1),
+    '1w': pd.Timedelta(weeks=1),
+}
+# 단계 -> resample 규칙
+RULES = {'4h': '4h', '1d': '1D', '1w': 'W-MON'}
+AGGREGATE = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum', 'Bars': 'sum'}
+# 단계별 기본 기간 (1h 기본 6개월이면 일봉 180개, 주봉 26개라 학습에 부족함)
+# 1h 원본은 HOURLY_LIMIT까지만 받고, 그보다 오래된 봉은 저장된 피라미드에서 가져옴
+LEVEL_PERIODS = {'4h': '1y', '1d': 'max', '1w': 'max'}
+
+
+def bin_start(ts, level):
+    """
+    시각 -> 그 시각이 들어가는 level 봉의 시작 시각
+    """
+    if level == '1w':
+        day = ts.normalize()
+        return day - pd.Timedelta(days=day.weekday())
+    return ts.floor(LEVELS[level])
+
+
+def aggregate(df, level):
+    """
+    가는 단계의 OHLCV(+ Bars) -> level 봉 (데이터가 없는 구간은 건너뜀)
+    """
+    if 'Bars' not in df.columns:
+        df = df.assign(Bars=1)
+    agg = {col: AGGREGATE[col] for col in OHLCV_COLS + ['Bars'] if col in df.columns}
+    out = df.resample(RULES[level], label='left', closed='left').agg(agg)
+    out = out[out['Bars'] > 0]
+    out.index.name = 'Datetime'
+    return out
+
+
+def complete_head(table, source):
+    """
+    맨 앞 봉이 source(아래 단계)의 첫 시각보다 먼저 시작하면 덜 찬 봉이므로 뺌
+    (중간에 빠진 시간이 있는 봉은 그대로 둠)
+    """
+    if len(table) > 0 and table.index[0] < source.index[0]:
+        return table.iloc[1:]
+    return table
+
+
+# -----------------------------------------------------------------------------
+# 1. 만들기 / 증분 갱신
+# -----------------------------------------------------------------------------
+def build_pyramid(df):
+    """
+    1h 데이터 -> {'1h', '4h', '1d', '1w'} 전체를 메모리에서 새로 만들기 (저장하지 않음)
+    """
+    levels = {'1h': df}
+    source = df
+    for level in RULES:
+        source = levels[level] = complete_head(aggregate(source, level), source)
+    return levels
+
+
+def update_pyramid(ticker, df, store_dir=PYRAMID_DIR):
+    """
+    새 1h 데이터로 저장된 피라미드를 갱신 -> {'1h', '4h', '1d', '1w'} 데이터프레임
+    - 단계마다 저장된 마지막 봉(또는 아래 단계에서 바뀐 봉)이 시작하는 시각부터만 다시 묶음
+    - 저장된 첫 봉보다 앞선 데이터가 있으면 그 구간의 봉을 앞에 채움
+    """
+    levels = {'1h': df}
+    source, changed_from = df, None
+    for level in RULES:
+        stored = read_store(ticker, level, store_dir)
+        start = None
+        if len(source) == 0:
+            merged = source.iloc[:0]
+        elif stored is None or len(stored) == 0:
+            merged = complete_head(aggregate(source, level), source)
+            start = merged.index[0] if len(merged) > 0 else None  # 위 단계도 이 시각부터 다시 묶음
+        else:
+            start = stored.index[-1]
+            if changed_from is not None:
+                start = min(start, bin_start(changed_from, level))
+            if start < source.index[0]:
+                # 아래 단계 데이터가 이 봉의 중간부터 있으면 다음 봉부터 (앞의 저장된 봉은 그대로 둠)
+                first = bin_start(source.index[0], level)
+                start = first if first == source.index[0] else first + LEVELS[level]
+
+            # 저장된 첫 봉 이전 구간 (이전 실행보다 긴 기간의 데이터가 들어온 경우)
+            head_end = min(stored.index[0], start)
+            head = source[source.index < head_end]
+            head = complete_head(aggregate(head, level), head) if len(head) > 0 else stored.iloc[:0]
+            fresh = aggregate(source[source.index >= start], level)
+            merged = pd.concat([head, stored[(stored.index >= head_end) & (stored.index < start)], fresh])
+        if len(merged) > 0:
+            write_store(merged, ticker, level, store_dir)
+        levels[level] = merged
+        source, changed_from = merged, start
+    return levels
+
+
+def load_level(ticker, level, df=None, store_dir=PYRAMID_DIR):
+    """
+    피라미드의 한 단계 (df를 주면 그 1h 데이터로 먼저 갱신)
+    """
+    if level == '1h':
+        if df is None:
+            raise ValueError('1h 단계는 1h 데이터를 직접 넘겨야 합니다')
+        return df
+    if df is not None:
+        return update_pyramid(ticker, df, store_dir)[level]
+    stored = read_store(ticker, level, store_dir)
+    if stored is None:
+        raise FileNotFoundError(f'저장된 {level} 데이터가 없습니다 ({ticker})')
+    return stored
+
+
+def pyramid_level(ticker, df, level, period=None, persist=True):
+    """
+    1h 데이터 -> level 봉 데이터 (최근 period 기간만)
+    - persist: 저장된 피라미드를 증분 갱신해서 사용 (False면 메모리에서만 만듦, 재생 데이터용)
+    """
+    if level == '1h':
+        data = df
+    elif persist:
+        data = update_pyramid(ticker, df)[level]
+    else:
+        data = build_pyramid(df)[level]
+    length = period_length(period) if period else None
+    return data if length is None else data[data.index > data.index[-1] - length]
+
+
+def hourly_period(period):
+    """
+    굵은 단계용 기간 -> 1h 원본을 받을 기간 (Yahoo 제한을 넘는 부분은 저장된 피라미드에서 가져옴)
+    """
+    length = period_length(period)
+    if length is None or length > HOURLY_LIMIT:
+        return f'{HOURLY_LIMIT.days}d'
+    return period
+
+
+# -----------------------------------------------------------------------------
+# 2. 단계 고르기
+# -----------------------------------------------------------------------------
+def level_for_width(span, pixels):
+    """
+    그래프로 그릴 기간 span(Timedelta)과 폭(픽셀) -> 봉이 픽셀 수 이상 나오는 가장 굵은 단계
+    """
+    for level in reversed(LEVELS):
+        if span / LEVELS[level] >= pixels:
+            return level
+    return '1h'
+
+
+def level_for_horizon(horizon_hours, min_steps=6):
+    """
+    예측 기간(시간) -> 그 기간을 min_steps개 이상의 봉으로 나눌 수 있는 가장 굵은 단계
+    예) 24시간 -> 4h (6걸음), 168시간 -> 1d (7걸음), 1시간~23시간 -> 1h
+    """
+    horizon = pd.Timedelta(hours=horizon_hours)
+    for level in reversed(LEVELS):
+        if horizon / LEVELS[level] >= min_steps:
+            return level
+    return '1h'
+
+
+def horizon_steps(horizon_hours, level):
+    """
+    예측 기간(시간) -> level 봉 개수 (나누어떨어지지 않으면 올림, 예: 200시간 -> 일봉 9개 = 216시간)
+    """
+    return max(1, -(-pd.Timedelta(hours=horizon_hours) // LEVELS[level]))
+
+
+def downsample(table, level):
+    """
+    1h 시계열 표(지표, 추세 등) -> level 봉마다 마지막 값 (그래프용)
+    """
+    if level == '1h':
+        return table
+    bins = table.resample(RULES[level], label='left', closed='left')
+    # 데이터가 없는 구간만 빼고, 앞부분 NaN(지표 준비 구간)은 그대로 둬서 가격/지표 표의 행이 맞도록
+    return bins.last(skipna=False)[bins.size() > 0]
+
+
+if __name__ == "__main__":
+    from . import load_data
+
+    parser = argparse.ArgumentParser(prog='btc_forecast.pyramid', description='OHLCV 해상도 피라미드 갱신')
+    parser.add_argument('--ticker', default='BTC-USD')
+    parser.add_argument('--period', default='6mo')
+    args = parser.parse_args()
+
+    df = load_data(args.ticker, period=args.period)
+    levels = update_pyramid(args.ticker, df)
+    for level, data in levels.items():
+        last = data.iloc[-1]
+        partial = '' if level == '1h' or last['Bars'] * LEVELS['1h'] == LEVELS[level] else ' (in progress)'
+        print(f"{level:>3}: {len(data):>7,} bars, {data.index[0]} ~ {data.index[-1]}{partial}")
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""
+search.py
+=========
+[기능]
+MLP 모델의 설정(윈도우 크기, 피처 조합, 은닉층 모양)을 여러 개 시험해서 검증 MAE가 가장 작은 조합을 찾습니다.
+
+[수행 과정]
+1. 피처 조합마다 정규화된 배열을 한 번만 만들어서 .npy 파일로 저장합니다.
+   - 작업 프로세스는 이 파일을 메모리 맵(mmap)으로 열어서 같은 메모리를 같이 씀 (시험마다 다시 만들지 않음)
+   - 윈도우 크기가 달라도 같은 배열의 보기(windows.py)라서 복사가 없음
+   - 피처 조합마다 지표 준비 구간(MA50 등)이 달라서, 모든 조합을 같은 시작 시각에 맞춰 자름
+2. 설정 조합들을 여러 프로세스에서 동시에 학습/채점합니다.
+   - 검증 구간은 윈도우 크기와 상관없이 같은 시각들(마지막 test_ratio 행)이라 MAE를 서로 비교할 수 있음
+3. 결과는 끝나는 대로 한 줄씩 results.jsonl에 저장합니다.
+   - 중간에 끊겨도 다시 실행하면 같은 데이터 + 같은 설정(학습 설정, test_ratio 포함)의 결과는 건너뛰고 이어서 진행
+
+[사용법]
+   python -m btc_forecast.search                     # 전체 조합
+   python -m btc_forecast.search --sample 20         # 무작위 20개만
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from .features import add_features, scale_features
+from .models import MLP_PARAMS
+from .store import data_fingerprint
+from .windows import as_model_input, as_model_target, make_windows
+
+MAX_WORKERS = os.cpu_count() or 1
+SEARCH_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'search')
+
+# 탐색 범위
+SEARCH_SPACE = {
+    'window_size': [5, 10, 24, 48],
+    'features': {
+        'base': ['Close', 'Volume', 'MA5', 'MA20'],
+        'base+return': ['Close', 'Volume', 'MA5', 'MA20', 'Return', 'Volatility'],
+        'all': ['Close', 'Volume', 'MA5', 'MA20', 'MA50', 'Return', 'Volatility', 'Range'],
+    },
+    'hidden_layer_sizes': [(64,), (128, 64), (128, 64, 32)],
+}
+
+
+def trial_configs(space=SEARCH_SPACE):
+    """
+    탐색 범위 -> 설정 목록 [{'window_size', 'features', 'hidden_layer_sizes'}, ...]
+    """
+    return [{'window_size': w, 'features': f, 'hidden_layer_sizes': list(h)}
+            for w, f, h in itertools.product(space['window_size'], space['features'],
+                                             space['hidden_layer_sizes'])]
+
+
+def trial_settings(test_ratio=0.1, mlp_params=None, start=None):
+    """
+    결과에 영향을 주는 설정 (config 외) -> 결과를 이어서 쓸지 판단하는 키의 일부
+    - mlp_params는 기본값(MLP_PARAMS)과 합친 실제 값 (기본값이 바뀌어도 구분됨)
+    """
+    params = {k: v for k, v in {**MLP_PARAMS, **(mlp_params or {})}.items() if k != 'hidden_layer_sizes'}
+    return {'test_ratio': test_ratio, 'mlp_params': params,
+            'start': start.isoformat() if start is not None else None}
+
+
+def trial_key(fingerprint, config, settings):
+    return json.dumps({'data': fingerprint, **config, **settings}, sort_keys=True)
+
+
+# -----------------------------------------------------------------------------
+# 1. 공유 데이터셋 (피처 조합별 정규화 배열 -> .npy)
+# -----------------------------------------------------------------------------
+def align_features(df, feature_sets):
+    """
+    피처 조합마다 add_features -> 모두 같은 시작 시각(가장 늦게 준비되는 조합 기준)으로 자름
+    -> ({조합 이름: 데이터}, 시작 시각)
+    """
+    datas = {name: add_features(df, cols) for name, cols in feature_sets.items()}
+    start = max(data.index[0] for data in datas.values())
+    return {name: data[data.index >= start] for name, data in datas.items()}, start
+
+
+def prepare_datasets(datas, feature_sets, fingerprint, start, cache_dir):
+    """
+    피처 조합마다 정규화된 배열을 한 번 만들어 저장 -> {조합 이름: (.npy 경로, 종가 Scaler)}
+    - 다른 데이터(지문)로 만든 예전 배열은 지움 (데이터가 바뀔 때마다 전체 크기 사본이 쌓이지 않도록)
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    prefix = f"{fingerprint}_{start:%Y%m%d%H}_"
+    for file_name in os.listdir(cache_dir):
+        if file_name.endswith('.npy') and not file_name.startswith(prefix):
+            os.remove(os.path.join(cache_dir, file_name))
+
+    datasets = {}
+    for name, cols in feature_sets.items():
+        scaled, _, target_scaler = scale_features(datas[name], cols)
+        path = os.path.join(cache_dir, f"{prefix}{name.replace('+', '_')}.npy")
+        if not os.path.exists(path):
+            tmp_path = path + '.tmp.npy'
+            np.save(tmp_path, scaled.astype(np.float32))
+            os.replace(tmp_path, path)
+        datasets[name] = (path, target_scaler)
+    return datasets
+
+
+# -----------------------------------------------------------------------------
+# 2. 시험 하나 (프로세스 풀의 작업 단위)
+# -----------------------------------------------------------------------------
+def holdout(X, y, n_rows, test_ratio=0.1):
+    """
+    윈도우 -> 학습/검증 분할 (검증 = 마지막 n_test행을 타깃으로 하는 윈도우, n_test는 행 수 기준)
+    - 윈도우 i의 타깃은 i + window_size행 -> 마지막 n_test개 윈도우의 타깃 = 마지막 n_test행
+    - 비율로 다시 나누면 반올림 때문에 한 개씩 어긋날 수 있어서 개수로 자름
+    """
+    n_test = max(1, int(n_rows * test_ratio))
+    split = len(X) - n_test
+    return {'X_train': X[:split], 'X_test': X[split:], 'y_train': y[:split], 'y_test': y[split:]}
+
+
+def evaluate(config, dataset_path, target_scaler, test_ratio=0.1, mlp_params=None):
+    """
+    설정 하나 학습 -> 검증 구간(최근 test_ratio)의 MAE (달러)
+    - 검증 구간은 윈도우 수가 아니라 행 수 기준 (윈도우 크기가 달라도 같은 시각들을 채점)
+    """
+    from sklearn.neural_network import MLPRegressor
+
+    start = time.perf_counter()
+    scaled = np.load(dataset_path, mmap_mode='r')  # 여러 프로세스가 같은 파일을 공유
+    X, y = make_windows(scaled, config['window_size'], horizon=1, target_col=0)
+    split = holdout(X, y, len(scaled), test_ratio)
+
+    params = {**MLP_PARAMS, **(mlp_params or {}), 'hidden_layer_sizes': tuple(config['hidden_layer_sizes'])}
+    estimator = MLPRegressor(**params)
+    estimator.fit(as_model_input(split['X_train']), as_model_target(split['y_train']))
+
+    y_pred = estimator.predict(as_model_input(split['X_test']))
+    y_test = as_model_target(split['y_test'])
+    mae = np.mean(np.abs(target_scaler.inverse_transform(y_test.reshape(-1, 1))
+                         - target_scaler.inverse_transform(y_pred.reshape(-1, 1))))
+    return {**config, 'mae': float(mae), 'iterations': int(estimator.n_iter_),
+            'seconds': time.perf_counter() - start}
+
+
+# -----------------------------------------------------------------------------
+# 3. 탐색 (결과 저장 + 이어하기)
+# -----------------------------------------------------------------------------
+def load_results(path):
+    if not os.path.exists(path):
+        return {}
+    results = {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:  # 쓰다가 끊긴 마지막 줄은 무시
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                results[record['key']] = record
+    return results
+
+
+def run_search(df, space=SEARCH_SPACE, sample=None, seed=42, max_workers=None,
+               search_dir=SEARCH_DIR, mlp_params=None, test_ratio=0.1):
+    """
+    하이퍼파라미터 탐색 -> 이번 데이터의 모든 시험 결과 표 (MAE 오름차순)
+    """
+    fingerprint = data_fingerprint(df)
+    configs = trial_configs(space)
+    if sample is not None and sample < len(configs):
+        configs = random.Random(seed).sample(configs, sample)
+    datas, start = align_features(df, space['features'])
+    settings = trial_settings(test_ratio, mlp_params, start)
+
+    results_path = os.path.join(search_dir, 'results.jsonl')
+    done = load_results(results_path)
+    todo = [c for c in configs if trial_key(fingerprint, c, settings) not in done]
+    print(f"Trials: {len(configs)} ({len(configs) - len(todo)} already done, {len(todo)} to run)")
+
+    if todo:
+        datasets = prepare_datasets(datas, space['features'], fingerprint, start,
+                                    os.path.join(search_dir, 'cache'))
+        os.makedirs(search_dir, exist_ok=True)
+        workers = max(1, min(max_workers or MAX_WORKERS, len(todo)))
+        with open(results_path, 'a', encoding='utf-8') as out, \
+                ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(evaluate, c, *datasets[c['features']], test_ratio=test_ratio,
+                                       mlp_params=mlp_params): c
+                       for c in todo}
+            for i, future in enumerate(as_completed(futures), 1):
+                config = futures[future]
+                record = {'key': trial_key(fingerprint, config, settings), 'data': fingerprint,
+                          **future.result()}
+                # 끝나는 대로 한 줄씩 기록 (중간에 끊겨도 여기까지는 남음)
+                out.write(json.dumps(record, ensure_ascii=False) + '\n')
+                out.flush()
+                done[record['key']] = record
+                print(f"[{i}/{len(todo)}] window={config['window_size']} features={config['features']} "
+                      f"hidden={tuple(config['hidden_layer_sizes'])} -> MAE ${record['mae']:.2f} "
+                      f"({record['seconds']:.1f}s)")
+
+    keys = {trial_key(fingerprint, c, settings) for c in configs}
+    table = pd.DataFrame([r for k, r in done.items() if k in keys]).drop(columns=['key', 'data'])
+    return table.sort_values('mae').reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    from . import load_data
+
+    parser = argparse.ArgumentParser(prog='btc_forecast.search', description='MLP 하이퍼파라미터 탐색')
+    parser.add_argument('--ticker', default='BTC-USD')
+    parser.add_argument('--period', default='6mo', help='학습 데이터 기간 (기본 6mo)')
+    parser.add_argument('--sample', type=int, help='전체 조합 중 무작위로 이 개수만 시험')
+    parser.add_argument('--max-iter', type=int, help='시험마다 최대 학습 반복 수 (기본 500)')
+    parser.add_argument('--test-ratio', type=float, default=0.1, help='검증 구간 비율 (기본 0.1)')
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS, help='동시에 실행할 프로세스 수')
+    args = parser.parse_args()
+
+    df = load_data(args.ticker, period=args.period)
+    mlp_params = {'max_iter': args.max_iter} if args.max_iter else None
+    table = run_search(df, sample=args.sample, max_workers=args.workers, mlp_params=mlp_params,
+                       test_ratio=args.test_ratio)
+    print("\n[Top 5 Configurations]")
+    print(table.head(5).to_string(index=False))
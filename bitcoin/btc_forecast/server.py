@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""
+server.py
+=========
+[기능]
+데이터, Scaler, 학습된 모델을 메모리에 올려 둔 채로 예측을 JSON으로 돌려주는 로컬 HTTP 서버입니다. (asyncio, 표준 라이브러리만 사용)
+매번 스크립트를 실행하면 생기는 인터프리터 시작, 라이브러리 불러오기, 데이터 받기, 모델 학습 비용이 요청마다 들지 않습니다.
+
+[동작]
+1. 시작할 때 데이터를 받고 linear/mlp 모델을 준비 (mlp는 artifacts.py로 저장된 모델 재사용/증분 학습)
+2. refresh초마다 백그라운드에서 데이터와 모델을 새로 준비하고, 다 되면 한 번에 교체
+   (준비하는 동안에도 이전 모델로 계속 응답)
+3. 같은 예측(모델, horizon)을 동시에 여러 요청이 물으면 계산은 한 번만 하고 결과를 같이 받음
+   (데이터가 바뀌기 전까지는 계산한 결과를 그대로 돌려줌)
+
+[API]
+   GET  /health                                  # 상태, 데이터 마지막 시각, 모델 버전
+   GET  /forecast?model=linear&horizon=24        # 예측 (model: linear/mlp, history=과거 가격 개수)
+   POST /refresh                                 # 지금 바로 데이터/모델 갱신
+
+[사용법]
+   python -m btc_forecast.server --port 8765 --refresh 300
+   curl 'http://127.0.0.1:8765/forecast?model=mlp'
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+from . import build_features, forecast, load_data, train
+from .artifacts import train_with_artifacts
+
+PERIOD = '6mo'  # mlp 학습 기간 (linear는 이 중 마지막 200시간)
+MAX_HORIZON = 168
+
+
+# -----------------------------------------------------------------------------
+# 1. 모델 준비 (작업 스레드에서 실행)
+# -----------------------------------------------------------------------------
+def prepare_models(ticker, interval):
+    """
+    데이터 받기 + 모델 학습 -> {'linear': (features, trained), 'mlp': (...), 'data_until', 'ready_seconds'}
+    """
+    start = time.perf_counter()
+    state = {}
+    df = load_data(ticker, period=PERIOD, interval=interval)
+
+    # linear는 마지막 200시간만 쓰므로 mlp용 6개월 데이터를 그대로 사용
+    linear_features = build_features(df, model='linear')
+    state['linear'] = (linear_features, train(linear_features))
+
+    features, trained, status = train_with_artifacts(df, ticker=ticker, interval=interval)
+    state['mlp'] = (features, trained)
+    state['mlp_status'] = status
+    state['data_until'] = df.index[-1]
+    state['ready_seconds'] = time.perf_counter() - start
+    return state
+
+
+def forecast_json(ticker, model, state, horizon, history):
+    """
+    forecast() 결과 -> JSON으로 보낼 dict
+    """
+    features, trained = state[model]
+    result = forecast(trained, features, horizon=horizon)
+    current = float(result['prices'][-1])
+    predictions = [float(p) for p in result['predictions']]
+    dates = result['dates'][-history:] if history else result['dates'][:0]
+    prices = result['prices'][-history:] if history else result['prices'][:0]
+    return {
+        'ticker': ticker,
+        'model': model,
+        'horizon': horizon,
+        'data_until': state['data_until'].isoformat(),
+        'current_price': current,
+        'predicted_price': predictions[-1],
+        'change_pct': (predictions[-1] - current) / current * 100,
+        'metrics': trained['metrics'],
+        'forecast': [{'time': t.isoformat(), 'price': p} for t, p in zip(result['future_dates'], predictions)],
+        'history': [{'time': t.isoformat(), 'price': float(p)} for t, p in zip(dates, prices)],
+    }
+
+
+# -----------------------------------------------------------------------------
+# 2. 서비스 (메모리의 모델 + 백그라운드 갱신 + 요청 합치기)
+# -----------------------------------------------------------------------------
+class ForecastService:
+    def __init__(self, ticker='BTC-USD', interval='1h', refresh_seconds=300):
+        self.ticker = ticker
+        self.interval = interval
+        self.refresh_seconds = refresh_seconds
+        self.state = None
+        self.generation = 0         # 모델을 교체할 때마다 1 증가 (예측 캐시 구분용)
+        self.cache = {}             # (generation, model, horizon, history) -> 응답 dict
+        self.pending = {}           # 같은 키로 계산 중인 작업 (동시 요청 합치기)
+        self.refreshing = None      # 진행 중인 갱신 작업
+        self.last_error = None
+        self.refreshed_at = None
+
+    async def refresh(self):
+        """
+        데이터/모델 갱신 (이미 진행 중이면 그 작업을 같이 기다림)
+        """
+        if self.refreshing is None:
+            self.refreshing = asyncio.ensure_future(self._refresh())
+            self.refreshing.add_done_callback(lambda _: setattr(self, 'refreshing', None))
+        return await asyncio.shield(self.refreshing)
+
+    async def _refresh(self):
+        loop = asyncio.get_running_loop()
+        try:
+            state = await loop.run_in_executor(None, prepare_models, self.ticker, self.interval)
+        except Exception as e:
+            # 실패하면 이전 모델로 계속 응답
+            self.last_error = f'{type(e).__name__}: {e}'
+            print(f"Refresh failed: {self.last_error}")
+            return False
+        self.state = state
+        self.generation += 1
+        self.cache.clear()
+        self.last_error = None
+        self.refreshed_at = pd.Timestamp.now(tz='UTC')
+        print(f"Models ready (data until {state['data_until']}, mlp {state['mlp_status']}, "
+              f"{state['ready_seconds']:.1f}s)")
+        return True
+
+    async def refresh_loop(self):
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            await self.refresh()
+
+    async def forecast(self, model, horizon, history):
+        key = (self.generation, model, horizon, history)
+        if key in self.cache:
+            return self.cache[key]
+        if key not in self.pending:
+            loop = asyncio.get_running_loop()
+            self.pending[key] = loop.run_in_executor(None, forecast_json, self.ticker, model, self.state,
+                                                     horizon, history)
+        future = self.pending[key]
+        try:
+            result = await asyncio.shield(future)
+        finally:
+            self.pending.pop(key, None)
+        if key[0] == self.generation:
+            self.cache[key] = result
+        return result
+
+    def health(self):
+        state = self.state or {}
+        mlp = state.get('mlp', (None, {}))[1]
+        return {
+            'ticker': self.ticker,
+            'ready': self.state is not None,
+            'data_until': state['data_until'].isoformat() if state else None,
+            'refreshed_at': self.refreshed_at.isoformat() if self.refreshed_at is not None else None,
+            'refresh_seconds': self.refresh_seconds,
+            'mlp_version': mlp.get('version'),
+            'mlp_status': state.get('mlp_status'),
+            'last_error': self.last_error,
+        }
+
+
+# -----------------------------------------------------------------------------
+# 3. HTTP
+# -----------------------------------------------------------------------------
+def response(status, body):
+    payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+    head = (f'HTTP/1.1 {status.value} {status.phrase}\r\n'
+            'Content-Type: application/json; charset=utf-8\r\n'
+            f'Content-Length: {len(payload)}\r\n'
+            'Access-Control-Allow-Origin: *\r\n'   # index.html(file://, 다른 포트)에서도 읽을 수 있도록
+            'Connection: close\r\n\r\n')
+    return head.encode('latin-1') + payload
+
+
+async def route(service, method, target):
+    url = urlsplit(target)
+    query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+    if url.path == '/health':
+        return HTTPStatus.OK, service.health()
+    if url.path == '/refresh' and method == 'POST':
+        ok = await service.refresh()
+        return (HTTPStatus.OK if ok else HTTPStatus.BAD_GATEWAY), service.health()
+    if url.path == '/forecast':
+        if service.state is None:
+            return HTTPStatus.SERVICE_UNAVAILABLE, {'error': '모델을 준비하는 중입니다'}
+        model = query.get('model', 'linear')
+        if model not in ('linear', 'mlp'):
+            return HTTPStatus.BAD_REQUEST, {'error': f'알 수 없는 모델: {model}'}
+        try:
+            horizon = int(query.get('horizon', 24))
+            history = int(query.get('history', 0))
+        except ValueError:
+            return HTTPStatus.BAD_REQUEST, {'error': 'horizon, history는 정수여야 합니다'}
+        if not 1 <= horizon <= MAX_HORIZON or history < 0:
+            return HTTPStatus.BAD_REQUEST, {'error': f'horizon은 1~{MAX_HORIZON}, history는 0 이상'}
+        return HTTPStatus.OK, await service.forecast(model, horizon, history)
+    return HTTPStatus.NOT_FOUND, {'error': f'없는 경로: {url.path}'}
+
+
+async def handle(service, reader, writer):
+    try:
+        request_line = await reader.readline()
+        while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+            pass  # 헤더는 쓰지 않음
+        parts = request_line.decode('latin-1').split()
+        if len(parts) < 2:
+            status, body = HTTPStatus.BAD_REQUEST, {'error': '잘못된 요청'}
+        elif parts[0] == 'OPTIONS':
+            status, body = HTTPStatus.OK, {}
+        else:
+            try:
+                status, body = await route(service, parts[0], parts[1])
+            except Exception as e:
+                status, body = HTTPStatus.INTERNAL_SERVER_ERROR, {'error': f'{type(e).__name__}: {e}'}
+        writer.write(response(status, body))
+        await writer.drain()
+    finally:
+        writer.close()
+
+
+async def serve(host='127.0.0.1', port=8765, ticker='BTC-USD', interval='1h', refresh_seconds=300):
+    service = ForecastService(ticker, interval, refresh_seconds)
+    print(f"Preparing {ticker} models...")
+    await service.refresh()
+    server = await asyncio.start_server(lambda r, w: handle(service, r, w), host, port)
+    print(f"Serving forecasts on http://{host}:{port} (refresh every {refresh_seconds}s)")
+    refresher = asyncio.ensure_future(service.refresh_loop())
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        refresher.cancel()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog='btc_forecast.server', description='예측 HTTP 서버')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--ticker', default='BTC-USD')
+    parser.add_argument('--interval', default='1h')
+    parser.add_argument('--refresh', type=int, default=300, help='데이터/모델 갱신 간격 (초, 기본 300)')
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.ticker, args.interval, args.refresh))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+store.py
+========
+[기능]
+Yahoo Finance에서 받은 OHLCV(시가/고가/저가/종가/거래량) 데이터를 디스크에 저장해 두고,
+다음 실행 때는 저장된 마지막 시각 이후의 데이터(꼬리)만 받아서 이어 붙이는 저장소입니다.
+
+[내용]
+1. 저장 형식: 종목 x 봉 간격마다 Parquet 파일 하나 (예: data/ohlcv/BTC-USD_1h.parquet)
+2. 증분 수집: 마지막 봉은 아직 끝나지 않았을 수 있으므로 마지막 봉부터 다시 받아서 덮어씀
+   - 저장된 데이터가 요청 기간보다 짧으면 앞부분까지 전체를 다시 받음
+3. 오프라인 재생(replay): 네트워크 없이 저장된 파일이나 지정한 CSV/Parquet 파일만 읽음
+   - 환경 변수 OHLCV_OFFLINE=1 이면 저장소 파일만 사용
+   - 환경 변수 OHLCV_REPLAY=<파일 경로> 이면 그 파일을 데이터 원본으로 사용
+   - source 인자로 yf.download와 같은 형식의 함수를 넘기면 그 함수에서 받음 (테스트/가짜 데이터용)
+"""
+
+import hashlib
+import os
+
+import pandas as pd
+
+# -----------------------------------------------------------------------------
+# 1. 설정 (Settings)
+# -----------------------------------------------------------------------------
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+STORE_DIR = os.path.join(os.path.dirname(PACKAGE_DIR), 'data', 'ohlcv')
+
+OHLCV_COLS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# 봉 간격 -> 한 봉의 길이
+INTERVALS = {
+    '1m': pd.Timedelta(minutes=1),
+    '5m': pd.Timedelta(minutes=5),
+    '15m': pd.Timedelta(minutes=15),
+    '30m': pd.Timedelta(minutes=30),
+    '1h': pd.Timedelta(hours=1),
+    '1d': pd.Timedelta(days=1),
+}
+
+# yf.download의 period 표기 -> 기간 (mo=30일, y=365일로 계산)
+PERIOD_UNITS = {'d': 1, 'wk': 7, 'mo': 30, 'y': 365}
+
+
+def period_length(period):
+    """
+    '3mo', '6mo', '1y', '7d' 같은 기간 문자열 -> pd.Timedelta ('max'면 None)
+    """
+    if period == 'max':
+        return None
+    for unit in sorted(PERIOD_UNITS, key=len, reverse=True):
+        if period.endswith(unit):
+            return pd.Timedelta(days=int(period[:-len(unit)]) * PERIOD_UNITS[unit])
+    raise ValueError(f'알 수 없는 기간 형식: {period}')
+
+
+def data_fingerprint(df):
+    """
+    OHLCV 데이터 내용(시각 + 값)으로 만든 지문 (같은 데이터로 만든 결과/모델을 재사용하기 위함)
+    """
+    h = hashlib.sha256(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return h.hexdigest()[:16]
+
+
+def store_path(ticker, interval, store_dir=STORE_DIR):
+    return os.path.join(store_dir, f'{ticker}_{interval}.parquet')
+
+
+# -----------------------------------------------------------------------------
+# 2. 읽기/쓰기
+# -----------------------------------------------------------------------------
+def normalize(df):
+    """
+    yf.download 결과를 저장 형식으로 정리 (MultiIndex 컬럼 평탄화, OHLCV 컬럼만, UTC 시각 순서)
+    """
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.get_level_values(0)
+    df = df[[c for c in OHLCV_COLS if c in df.columns]].copy()
+    index = pd.DatetimeIndex(df.index)
+    df.index = index.tz_localize('UTC') if index.tz is None else index.tz_convert('UTC')
+    df.index.name = 'Datetime'
+    df = df[~df.index.duplicated(keep='last')].sort_index()
+    return df.astype('float64')
+
+
+def read_file(path):
+    """
+    CSV 또는 Parquet 파일 -> OHLCV 데이터프레임 (오프라인 재생용)
+    """
+    if path.endswith('.parquet'):
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_csv(path, index_col=0, parse_dates=True)
+    return normalize(df)
+
+
+def read_store(ticker, interval, store_dir=STORE_DIR):
+    path = store_path(ticker, interval, store_dir)
+    if not os.path.exists(path):
+        return None
+    return pd.read_parquet(path)
+
+
+def write_store(df, ticker, interval, store_dir=STORE_DIR):
+    # 중간에 끊겨도 깨진 파일이 남지 않도록 임시 파일에 쓴 뒤 교체
+    path = store_path(ticker, interval, store_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    df.to_parquet(tmp_path, compression='zstd')
+    os.replace(tmp_path, path)
+
+
+def fetch(ticker, interval, source=None, **kwargs):
+    """
+    데이터 원본에서 받기 (기본은 yf.download, 필요할 때만 yfinance를 불러옴)
+    """
+    if source is None:
+        import yfinance as yf
+        source = yf.download
+    return normalize(source(ticker, interval=interval, progress=False, **kwargs))
+
+
+# -----------------------------------------------------------------------------
+# 3. 증분 수집
+# -----------------------------------------------------------------------------
+def load_ohlcv(ticker='BTC-USD', interval='1h', period='3mo', source=None, offline=None, replay=None):
+    """
+    최근 period 기간의 OHLCV 데이터 (저장소에 없는 꼬리만 새로 받아서 이어 붙임)
+    - offline: True면 네트워크 없이 저장소만 읽음 (기본값은 환경 변수 OHLCV_OFFLINE)
+    - replay : 데이터 원본으로 쓸 CSV/Parquet 파일 (기본값은 환경 변수 OHLCV_REPLAY)
+    """
+    offline = os.environ.get('OHLCV_OFFLINE') == '1' if offline is None else offline
+    replay = os.environ.get('OHLCV_REPLAY') if replay is None else replay
+    length = period_length(period)
+
+    if replay:
+        df = read_file(replay)
+    else:
+        df = read_store(ticker, interval)
+        if offline:
+            if df is None:
+                raise FileNotFoundError(f'오프라인 모드: 저장된 데이터가 없습니다 ({store_path(ticker, interval)})')
+        else:
+            df = update_store(df, ticker, interval, period, length, source)
+
+    if length is not None and len(df) > 0:
+        df = df[df.index > df.index[-1] - length]
+    return df
+
+
+def update_store(df, ticker, interval, period, length, source=None):
+    """
+    저장된 데이터 뒤에 새 봉만 받아서 합치고 저장
+    """
+    now = pd.Timestamp.now(tz='UTC')
+    covers_period = (df is not None and len(df) > 0
+                     and (length is None or df.index[0] <= now - length + INTERVALS.get(interval, pd.Timedelta(0))))
+    if not covers_period:
+        # 처음이거나 저장된 기간이 짧으면 요청 기간 전체를 받음
+        fresh = fetch(ticker, interval, source, period=period)
+    else:
+        # 마지막 봉(아직 진행 중일 수 있음)부터 다시 받아서 덮어씀
+        fresh = fetch(ticker, interval, source, start=df.index[-1])
+
+    if df is not None and len(df) > 0:
+        fresh = pd.concat([df, fresh])
+        fresh = fresh[~fresh.index.duplicated(keep='last')].sort_index()
+    if len(fresh) > 0:
+        write_store(fresh, ticker, interval)
+    return fresh
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+synthetic.py
+============
+[기능]
+Yahoo Finance 없이 쓸 수 있는 가짜 시간봉 OHLCV 데이터를 만듭니다. (벤치마크, 오프라인 실행용)
+같은 seed와 종목이면 항상 같은 데이터가 나옵니다.
+
+[모양]
+- 가격: 로그 수익률 랜덤워크 (봉 하나를 4개의 작은 걸음으로 나눠서 시가/고가/저가/종가를 만듦)
+- 변동성: 천천히 변하는 구간(AR(1))이 있어서 조용한 시기와 요동치는 시기가 번갈아 나옴
+- 거래량: 하루 주기(시간대별 차이) + 변동성이 클수록 많아짐
+"""
+
+import zlib
+
+import numpy as np
+import pandas as pd
+
+SUBSTEPS = 4  # 봉 하나 안의 가격 걸음 수 (고가/저가용)
+
+
+def synthetic_ohlcv(hours=4320, seed=42, start='2024-01-01', price=30000.0, volatility=0.006, drift=0.0,
+                    volume=1e9):
+    """
+    시간봉 OHLCV 데이터프레임 (store.normalize와 같은 형식: UTC 시각, float64)
+    - volatility: 1시간 로그 수익률 표준편차의 평균 수준, drift: 1시간 평균 로그 수익률
+    """
+    rng = np.random.default_rng(seed)
+
+    # 변동성 구간: log(변동성)이 평균 주위를 천천히 움직임
+    shocks = rng.normal(0.0, 0.08, hours)
+    log_vol = np.empty(hours)
+    level = 0.0
+    for i in range(hours):
+        level = 0.98 * level + shocks[i]
+        log_vol[i] = level
+    vol = volatility * np.exp(log_vol)
+
+    steps = rng.standard_normal((hours, SUBSTEPS)) * (vol / np.sqrt(SUBSTEPS))[:, None] + drift / SUBSTEPS
+    path = np.log(price) + np.cumsum(steps.ravel()).reshape(hours, SUBSTEPS)
+    close = np.exp(path[:, -1])
+    open_ = np.concatenate([[price], close[:-1]])
+    inner = np.exp(path)
+    high = np.maximum(open_, inner.max(axis=1))
+    low = np.minimum(open_, inner.min(axis=1))
+
+    index = pd.date_range(_utc(start), periods=hours, freq='h', name='Datetime')
+    daily = 1 + 0.3 * np.sin(2 * np.pi * (index.hour.to_numpy() - 8) / 24)
+    volumes = volume * daily * (vol / volatility) * rng.lognormal(0.0, 0.3, hours)
+    return pd.DataFrame({'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volumes},
+                        index=index)
+
+
+def _utc(ts):
+    ts = pd.Timestamp(ts)
+    return ts.tz_localize('UTC') if ts.tz is None else ts.tz_convert('UTC')
+
+
+def synthetic_source(seed=42, start='2020-01-01', end='2025-01-01'):
+    """
+    yf.download 대신 store.fetch / load_ohlcv(source=...)에 넘길 수 있는 함수
+    - 종목마다 seed가 달라지고, start~end 전체 데이터 중 요청한 기간(period 또는 start)만 돌려줌
+    """
+    from .store import period_length
+
+    end = _utc(end)
+    hours = int((end - _utc(start)) / pd.Timedelta(hours=1))
+    cache = {}
+
+    def download(ticker, interval='1h', period=None, start=None, progress=False, **kwargs):
+        if interval != '1h':
+            raise ValueError(f'가짜 데이터는 1h 봉만 지원합니다: {interval}')
+        if ticker not in cache:
+            cache[ticker] = synthetic_ohlcv(hours, seed=seed + zlib.crc32(ticker.encode('utf-8')),
+                                            start=end - pd.Timedelta(hours=hours))
+        df = cache[ticker]
+        if start is not None:
+            return df[df.index >= _utc(start)]
+        length = period_length(period) if period else None
+        return df if length is None else df[df.index > df.index[-1] - length]
+
+    return download
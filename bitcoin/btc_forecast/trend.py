@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""
+trend.py
+========
+[기능]
+여러 종목의 선형 추세(bitcoin_basic.py의 y = wx + b)를 한 번에 계산해서 순위를 매깁니다.
+
+[원리]
+종목마다 LinearRegression을 만들어 fit하지 않고, (종목 수 N x 시간 T) 가격 배열 전체에
+최소제곱 공식을 그대로 적용합니다. (합계 몇 개만 구하면 되므로 종목 수가 수백 개여도 배열 연산 몇 번)
+   slope     = Σ(x - x̄)(y - ȳ) / Σ(x - x̄)²
+   intercept = ȳ - slope * x̄
+   R²        = (Σ(x - x̄)(y - ȳ))² / (Σ(x - x̄)² * Σ(y - ȳ)²)
+빠진 값(NaN)은 마스크로 합계에서 빼므로, 종목마다 데이터가 빠진 시각이 달라도 같은 배열에서 계산합니다.
+x는 0, 1, 2, ... 시간 위치라서 빠진 시각이 있어도 실제 시간 간격이 유지됩니다.
+
+[이동 추세 (rolling_trend)]
+전체 기간의 모든 시각에서 "직전 window시간의 추세"를 구한 시계열입니다.
+윈도우 안의 x는 항상 0 ~ window-1이라 Σx, Σx²는 상수이고, Σy, Σy², Σxy는 누적합의 차이로 구하므로
+윈도우마다 다시 더하지 않고 시각 하나당 O(1)입니다. (전체 O(n), 윈도우 길이와 무관)
+
+[사용법]
+   python -m btc_forecast.trend --period 1y --window 200 --window 720   # 이동 추세 CSV + 그래프
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+RESULT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'trend')
+
+
+# -----------------------------------------------------------------------------
+# 1. 여러 종목 추세 (최근 lookback시간, 종목 x 시간 배열 한 번에)
+# -----------------------------------------------------------------------------
+def fit_trends(values, horizon=24, min_points=2):
+    """
+    (N, T) 가격 배열 -> 종목별 선형 추세 dict (모두 길이 N 배열, 예측은 (N, horizon))
+    - 'slope', 'intercept', 'r2', 'n_obs', 'predictions' (x = T, ..., T + horizon - 1의 추세선 값)
+    - 값이 min_points개보다 적은 종목은 NaN
+    """
+    y = np.asarray(values, dtype=np.float64)
+    if y.ndim == 1:
+        y = y[None, :]
+    mask = ~np.isnan(y)
+    n = mask.sum(axis=1)
+    x = np.arange(y.shape[1], dtype=np.float64)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # 평균을 뺀 값으로 합계를 구함 (가격이 커도 제곱합에서 자릿수가 사라지지 않도록)
+        x_mean = (mask * x).sum(axis=1) / n
+        y_mean = np.where(mask, y, 0.0).sum(axis=1) / n
+        dx = np.where(mask, x - x_mean[:, None], 0.0)
+        dy = np.where(mask, y - y_mean[:, None], 0.0)
+        sxx = (dx * dx).sum(axis=1)
+        sxy = (dx * dy).sum(axis=1)
+        syy = (dy * dy).sum(axis=1)
+
+        slope = sxy / sxx
+        intercept = y_mean - slope * x_mean
+        # 가격이 전혀 움직이지 않으면 (syy = 0) 추세선이 완벽히 맞는 것으로 봄
+        r2 = np.where(syy > 0, sxy * sxy / (sxx * syy), 1.0)
+
+    invalid = n < min_points
+    slope[invalid] = intercept[invalid] = r2[invalid] = np.nan
+    future_x = np.arange(y.shape[1], y.shape[1] + horizon, dtype=np.float64)
+    predictions = intercept[:, None] + slope[:, None] * future_x
+    return {'slope': slope, 'intercept': intercept, 'r2': r2, 'n_obs': n, 'predictions': predictions}
+
+
+def scan_trends(panel, lookback=200, horizon=24, min_points=None):
+    """
+    종가 표 (행: 시각, 열: 종목) -> 종목별 추세 요약 표 (예상 변화율 내림차순)
+    - 최근 lookback시간만 사용 (bitcoin_basic.py와 같은 설정)
+    - min_points: 최소 데이터 수 (기본은 lookback의 절반)
+    """
+    window = panel.tail(lookback)
+    min_points = lookback // 2 if min_points is None else min_points
+    fit = fit_trends(window.to_numpy(dtype=np.float64).T, horizon=horizon, min_points=min_points)
+
+    last_price = window.ffill().iloc[-1].to_numpy(dtype=np.float64)
+    future = fit['predictions'][:, -1]
+    table = pd.DataFrame({
+        'last_price': last_price,
+        f'pred_{horizon}h': future,
+        'change_pct': (future - last_price) / last_price * 100,
+        'slope': fit['slope'],
+        'intercept': fit['intercept'],
+        'r2': fit['r2'],
+        'n_obs': fit['n_obs'],
+    }, index=window.columns)
+    table.index.name = 'ticker'
+    return table.sort_values('change_pct', ascending=False, na_position='last')
+
+
+# -----------------------------------------------------------------------------
+# 2. 이동 추세 (전체 기간, 시각마다 직전 window시간)
+# -----------------------------------------------------------------------------
+def _window_sums(values, window):
+    """
+    누적합 배열 -> 길이 window인 모든 구간의 합 (i번째 = values[i : i + window]의 합)
+    """
+    cumsum = np.concatenate([[0.0], np.cumsum(values)])
+    return cumsum[window:] - cumsum[:-window]
+
+
+def rolling_trend(prices, window=200):
+    """
+    종가 시계열 -> 시각마다 직전 window시간(그 시각 포함)의 선형 추세 표 (앞의 window-1개는 NaN)
+    - slope: 시간당 가격 변화, intercept: 윈도우 첫 시각의 추세선 값 (bitcoin_basic.py와 같은 x 기준)
+    - r2: 결정 계수, resid_vol: 추세선 대비 잔차 표준편차 (가격 단위)
+    - fitted: 그 시각의 추세선 값, slope_pct: 시간당 변화율 (%, 가격 수준이 달라도 비교 가능)
+    - 윈도우 안에 NaN이 있으면 그 시각의 결과는 NaN
+    """
+    series = pd.Series(prices)
+    y = series.to_numpy(dtype=np.float64)
+    n, w = len(y), window
+    if w < 3:
+        raise ValueError(f'window는 3 이상이어야 합니다: {w}')
+    columns = ['slope', 'intercept', 'r2', 'resid_vol', 'fitted', 'slope_pct']
+    out = np.full((n, len(columns)), np.nan)
+    if n < w:
+        return pd.DataFrame(out, index=series.index, columns=columns)
+
+    # 가격 수준을 빼고 합계를 구함 (제곱 누적합이 커져서 정밀도가 떨어지지 않도록)
+    valid = ~np.isnan(y)
+    offset = np.nanmean(y) if valid.any() else 0.0
+    yc = np.where(valid, y - offset, 0.0)
+    j = np.arange(n, dtype=np.float64)
+
+    sy = _window_sums(yc, w)
+    syy = _window_sums(yc * yc, w)
+    sjy = _window_sums(j * yc, w)
+    complete = _window_sums((~valid).astype(np.float64), w) == 0
+    start = j[:n - w + 1]
+
+    # 윈도우 안의 x = 0 ~ w-1 (상수 합계), Σxy = Σ(j - start)y
+    sx = w * (w - 1) / 2
+    sxx_c = w * (w * w - 1) / 12                        # Σ(x - x̄)²
+    sxy_c = (sjy - start * sy) - sx * sy / w             # Σ(x - x̄)(y - ȳ)
+    syy_c = np.maximum(syy - sy * sy / w, 0.0)           # Σ(y - ȳ)²
+
+    slope = sxy_c / sxx_c
+    intercept = sy / w - slope * sx / w + offset
+    ssr = np.maximum(syy_c - slope * sxy_c, 0.0)         # 잔차 제곱합
+    with np.errstate(invalid='ignore', divide='ignore'):
+        r2 = np.where(syy_c > 0, 1 - ssr / syy_c, 1.0)
+        fitted = intercept + slope * (w - 1)
+        result = np.column_stack([slope, intercept, r2, np.sqrt(ssr / (w - 2)), fitted, slope / fitted * 100])
+    result[~complete] = np.nan
+    out[w - 1:] = result
+    return pd.DataFrame(out, index=series.index, columns=columns)
+
+
+def rolling_trends(prices, windows=(200,)):
+    """
+    여러 윈도우 길이의 이동 추세를 한 표로 (컬럼 이름: slope_200, r2_200, ...)
+    """
+    return pd.concat([rolling_trend(prices, w).add_suffix(f'_{w}') for w in windows], axis=1)
+
+
+# -----------------------------------------------------------------------------
+# 3. 여러 종목 데이터
+# -----------------------------------------------------------------------------
+def load_panel(tickers, period='3mo', interval='1h', **kwargs):
+    """
+    여러 종목의 종가를 시각 기준으로 맞춘 표 (한 종목에만 있는 시각은 다른 종목에서 NaN)
+    - 받지 못한 종목은 건너뜀
+    """
+    from . import load_data
+
+    closes = {}
+    for ticker in tickers:
+        try:
+            closes[ticker] = load_data(ticker, period=period, interval=interval, **kwargs)['Close']
+        except Exception as e:
+            print(f"Skipping {ticker}: {e}")
+    if not closes:
+        raise ValueError('불러온 종목이 없습니다')
+    return pd.DataFrame(closes).sort_index()
+
+
+if __name__ == "__main__":
+    import time
+
+    from . import load_data
+    from .plotting import plot_rolling_trend
+
+    parser = argparse.ArgumentParser(prog='btc_forecast.trend', description='전체 기간 이동 추세 (기울기, R², 잔차 변동성)')
+    parser.add_argument('--ticker', default='BTC-USD')
+    parser.add_argument('--period', default='1y', help='데이터 기간 (기본 1y)')
+    parser.add_argument('--interval', default='1h')
+    parser.add_argument('--window', type=int, action='append', help='윈도우 길이 (여러 번 지정 가능, 기본 200)')
+    parser.add_argument('--no-plot', action='store_true', help='그래프를 그리지 않음')
+    args = parser.parse_args()
+    windows = args.window or [200]
+
+    df = load_data(args.ticker, period=args.period, interval=args.interval)
+    start = time.perf_counter()
+    table = rolling_trends(df['Close'], windows)
+    print(f"Rolling trend over {len(df):,} bars, windows {windows} ({(time.perf_counter() - start) * 1000:.1f}ms)")
+
+    os.makedirs(RESULT_DIR, exist_ok=True)
+    name = f"{args.ticker}_{args.interval}_rolling_trend"
+    table.to_csv(os.path.join(RESULT_DIR, name + '.csv'))
+    print(f"Saved to {os.path.join(RESULT_DIR, name + '.csv')}")
+    if not args.no_plot:
+        output_path = os.path.join(RESULT_DIR, name + '.png')
+        plot_rolling_trend(df['Close'], table, windows, output_path, ticker=args.ticker)
+        print(f"Chart saved to {output_path}")
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+windows.py
+==========
+[기능]
+시계열 배열 하나에서 슬라이딩 윈도우 데이터셋(X: 과거 window_size개 행, y: 다음 horizon개 값)을 만듭니다.
+
+[원리]
+윈도우를 하나씩 잘라서 리스트에 담으면 윈도우마다 복사가 일어나서 메모리가 (window_size배) 늘어납니다.
+numpy의 sliding_window_view는 원본 버퍼를 가리키는 보기(view)만 만들기 때문에 복사가 없고,
+같은 버퍼에서 여러 window_size/horizon 조합과 학습/테스트 분할을 모두 보기로 꺼낼 수 있습니다.
+모델에 넣을 때만(as_model_input) 2차원 float32 배열로 한 번 복사합니다.
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def window_view(values, window_size):
+    """
+    (시간, 피처) 배열 -> 가능한 모든 윈도우 (윈도우 수, window_size, 피처 수) 보기
+    i번째 = values[i : i + window_size] (마지막 윈도우까지 포함, 예측 시작점용)
+    """
+    values = np.asarray(values)
+    if values.ndim == 1:
+        values = values[:, None]
+    # sliding_window_view의 결과는 (윈도우 수, 피처 수, window_size)이므로 축 순서만 바꿈 (여전히 보기)
+    return sliding_window_view(values, window_size, axis=0).transpose(0, 2, 1)
+
+
+def make_windows(values, window_size, horizon=1, target_col=0):
+    """
+    (시간, 피처) 배열 -> (X, y) 보기 (복사 없음)
+    - X: (윈도우 수, window_size, 피처 수), i번째 = values[i : i + window_size]
+    - y: (윈도우 수, horizon), i번째 = values[i + window_size : i + window_size + horizon, target_col]
+    """
+    values = np.asarray(values)
+    if values.ndim == 1:
+        values = values[:, None]
+    n = len(values) - window_size - horizon + 1
+    if n <= 0:
+        raise ValueError(f'데이터가 부족합니다: {len(values)}개 (window_size {window_size} + horizon {horizon})')
+
+    X = window_view(values, window_size)[:n]
+    y = sliding_window_view(values[window_size:, target_col], horizon)[:n]
+    return X, y
+
+
+def split_windows(X, y, test_ratio=0.1):
+    """
+    시간 순서대로 앞쪽은 학습, 최근 test_ratio는 테스트 (모두 보기)
+    """
+    split_idx = int(len(X) * (1 - test_ratio))
+    return {
+        'X_train': X[:split_idx], 'X_test': X[split_idx:],
+        'y_train': y[:split_idx], 'y_test': y[split_idx:],
+    }
+
+
+def as_model_input(X, dtype=np.float32):
+    """
+    (윈도우 수, window_size, 피처 수) 보기 -> 모델 입력용 2차원 배열 (여기서 한 번만 복사)
+    """
+    return np.ascontiguousarray(X.reshape(len(X), -1), dtype=dtype)
+
+
+def as_model_target(y, dtype=np.float32):
+    """
+    (윈도우 수, horizon) 보기 -> 모델 타깃 (horizon이 1이면 1차원)
+    """
+    y = np.asarray(y, dtype=dtype)
+    return y[:, 0].copy() if y.shape[1] == 1 else np.ascontiguousarray(y)
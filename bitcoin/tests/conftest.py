@@ -0,0 +1,12 @@
+# -*- coding: utf-8 -*-
+"""
+bitcoin 테스트 공통 설정
+- btc_forecast 패키지를 바로 import할 수 있게 bitcoin 폴더를 경로에 추가
+"""
+
+import os
+import sys
+
+BITCOIN_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BITCOIN_DIR not in sys.path:
+    sys.path.insert(0, BITCOIN_DIR)
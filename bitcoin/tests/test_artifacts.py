@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+artifacts.py: 저장된 모델 재사용 / 새 봉으로 증분 학습 / 다시 읽어서 예측
+"""
+
+import numpy as np
+
+from btc_forecast.artifacts import load_artifact, train_with_artifacts
+from btc_forecast.models import forecast
+from btc_forecast.synthetic import synthetic_ohlcv
+
+TRAIN_PARAMS = {'hidden_layer_sizes': (16,), 'max_iter': 50}
+
+
+def run(df, tmp_path, **kwargs):
+    return train_with_artifacts(df, ticker='TEST', train_params=TRAIN_PARAMS, artifact_dir=str(tmp_path), **kwargs)
+
+
+def test_update_then_reload(tmp_path):
+    df = synthetic_ohlcv(hours=1200, seed=9, volatility=0.002)
+    _, trained, status = run(df.iloc[:1100], tmp_path)
+    assert status == 'trained' and trained['version'] == 1
+    assert not trained['estimator'].early_stopping
+
+    # 같은 데이터면 학습 없이 그대로
+    _, trained, status = run(df.iloc[:1100], tmp_path)
+    assert status == 'reused' and trained['version'] == 1
+
+    # 새 봉이 붙으면 증분 학습 후 새 버전으로 저장
+    features, trained, status = run(df, tmp_path)
+    assert status == 'updated' and trained['version'] == 2
+    assert trained['estimator'].n_iter_ > 0
+    assert np.isfinite(forecast(trained, features, horizon=12)['predictions']).all()
+
+    # 다시 읽은 모델도 같은 예측
+    path = next(tmp_path.iterdir())
+    artifact = load_artifact(str(path))
+    assert artifact['status'] == 'updated' and artifact['updates'] == 1
+    features, reloaded, status = run(df, tmp_path)
+    assert status == 'reused'
+    np.testing.assert_allclose(forecast(reloaded, features, horizon=12)['predictions'],
+                               forecast(trained, features, horizon=12)['predictions'])
+
+
+def test_early_stopping_model_is_retrained(tmp_path):
+    df = synthetic_ohlcv(hours=1200, seed=9, volatility=0.002)
+    params = {**TRAIN_PARAMS, 'early_stopping': True}
+    train_with_artifacts(df.iloc[:1100], ticker='TEST', train_params=params, artifact_dir=str(tmp_path))
+    _, trained, status = train_with_artifacts(df, ticker='TEST', train_params=params, artifact_dir=str(tmp_path))
+    assert status == 'trained' and trained['version'] == 2
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+backtest.py: fold 구간이 겹치지 않고 미래를 보지 않는지, 프로세스 풀과 순차 실행 결과가 같은지
+"""
+
+import pandas as pd
+import pytest
+
+from btc_forecast.backtest import make_folds, walk_forward
+from btc_forecast.synthetic import synthetic_ohlcv
+
+METRICS = ['train_rows', 'mae', 'final_error', 'direction_acc']
+
+
+@pytest.mark.parametrize('window, train_size', [('expanding', None), ('rolling', 300)])
+@pytest.mark.parametrize('horizon, step', [(24, 24), (12, 30), (1, 1)])
+def test_folds_do_not_overlap_or_leak(window, train_size, horizon, step):
+    n_rows = 2000
+    folds = make_folds(n_rows, horizon=horizon, step=step, min_train=500, window=window, train_size=train_size)
+    assert folds
+    tests = [(origin, origin + horizon) for _, origin in folds]
+    for (start, origin), (test_start, test_end) in zip(folds, tests):
+        assert 0 <= start < origin == test_start   # 학습은 테스트 시작 전에 끝남
+        assert origin - start >= (train_size or 500)
+        assert test_end <= n_rows
+        if window == 'rolling':
+            assert origin - start == train_size
+    for (_, prev_end), (next_start, _) in zip(tests, tests[1:]):
+        assert prev_end <= next_start
+    # 가장 최근 fold는 데이터 끝까지 채점
+    assert tests[-1][1] == n_rows
+
+
+def test_n_folds_keeps_most_recent():
+    folds = make_folds(2000, horizon=24, step=24, n_folds=5)
+    assert len(folds) == 5
+    assert folds == make_folds(2000, horizon=24, step=24)[-5:]
+
+
+@pytest.mark.parametrize('model, train_params', [('linear', None),
+                                                 ('mlp', {'hidden_layer_sizes': (8,), 'max_iter': 20})])
+def test_pool_matches_sequential(model, train_params):
+    df = synthetic_ohlcv(hours=900, seed=2)
+    options = dict(model=model, horizon=12, step=48, n_folds=4, min_train=600, train_params=train_params)
+    table_seq, summary_seq = walk_forward(df, max_workers=1, **options)
+    table_pool, summary_pool = walk_forward(df, max_workers=2, **options)
+
+    assert summary_seq['workers'] == 1 and summary_pool['workers'] == 2
+    pd.testing.assert_frame_equal(table_seq[METRICS], table_pool[METRICS])
+    for key in ['folds', 'mae_mean', 'mae_median', 'direction_acc']:
+        assert summary_seq[key] == summary_pool[key]
+    assert list(table_seq.index) == [df.index[o] for _, o in make_folds(900, 12, 48, 4, 600)]
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""
+indicators.py: 링 버퍼로 한 봉씩 갱신한 지표가 늘어난 데이터 전체로 다시 계산한 값과 같은지
+"""
+
+import numpy as np
+import pytest
+
+from btc_forecast.indicators import INDICATORS, IndicatorState, compute_indicators, warmup
+from btc_forecast.synthetic import synthetic_ohlcv
+
+NAMES = list(INDICATORS)
+
+
+def test_update_matches_recomputation():
+    df = synthetic_ohlcv(hours=400, seed=11)
+    ends = np.array([warmup(NAMES), 150, 300])
+    steps = 60
+    state = IndicatorState(NAMES, df, ends)
+    full = compute_indicators(df, NAMES)
+
+    for step in range(steps):
+        # 시나리오마다 실제 다음 봉을 넣으면 전체 계산의 그 봉 값과 같아야 함
+        rows = df.iloc[ends + step]
+        values = state.update(rows['Close'].to_numpy(), rows['Volume'].to_numpy(),
+                              rows['High'].to_numpy(), rows['Low'].to_numpy())
+        expected = full.iloc[ends + step]
+        for name in NAMES:
+            np.testing.assert_allclose(values[name], expected[name].to_numpy(), rtol=1e-7, atol=1e-9,
+                                       err_msg=f'{name} (step {step})')
+
+
+def test_start_before_warmup_is_rejected():
+    df = synthetic_ohlcv(hours=100)
+    with pytest.raises(ValueError):
+        IndicatorState(NAMES, df, [warmup(NAMES) - 1])
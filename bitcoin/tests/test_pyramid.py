@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+pyramid.py: 증분 갱신(update_pyramid) 결과가 처음부터 새로 만든 피라미드(build_pyramid)와 같은지
+"""
+
+import pandas as pd
+import pytest
+
+from btc_forecast.pyramid import LEVELS, RULES, build_pyramid, horizon_steps, update_pyramid
+from btc_forecast.synthetic import synthetic_ohlcv
+
+DAY = 24
+
+
+@pytest.fixture
+def hourly():
+    # 수요일 03시 시작 (4h/1d/1w 봉 모두 중간부터 시작하도록)
+    return synthetic_ohlcv(hours=400 * DAY, seed=5, start='2024-01-03 03:00')
+
+
+def assert_same(levels, expected):
+    for level in RULES:
+        pd.testing.assert_frame_equal(levels[level], expected[level], check_freq=False, obj=level)
+
+
+def test_growing_data_matches_build(hourly, tmp_path):
+    # 마지막 봉이 진행 중인 상태로 여러 번 갱신
+    for end in [30 * DAY + 5, 30 * DAY + 7, 95 * DAY + 13, len(hourly)]:
+        df = hourly.iloc[:end]
+        assert_same(update_pyramid('TEST', df, tmp_path), build_pyramid(df))
+    # 저장된 것만 다시 읽어도 같아야 함
+    assert_same(update_pyramid('TEST', hourly, tmp_path), build_pyramid(hourly))
+
+
+def test_longer_period_backfills_head(hourly, tmp_path):
+    # 180일로 한 번 실행한 뒤 400일로 실행하면 앞부분이 채워져야 함
+    update_pyramid('TEST', hourly.iloc[-180 * DAY:], tmp_path)
+    assert_same(update_pyramid('TEST', hourly, tmp_path), build_pyramid(hourly))
+
+
+def test_revised_last_bar(hourly, tmp_path):
+    df = hourly.iloc[:50 * DAY + 9]
+    update_pyramid('TEST', df, tmp_path)
+    revised = df.copy()
+    revised.iloc[-1, revised.columns.get_loc('Close')] *= 1.05
+    revised.iloc[-1, revised.columns.get_loc('Volume')] *= 3
+    assert_same(update_pyramid('TEST', revised, tmp_path), build_pyramid(revised))
+
+
+def test_trimmed_window_keeps_old_bars(hourly, tmp_path):
+    # 1h 데이터가 기간만큼 잘려서 들어와도 저장된 과거 봉은 남고 새 봉만 붙음
+    end = len(hourly) - 20 * DAY
+    update_pyramid('TEST', hourly.iloc[:end], tmp_path)
+    levels = update_pyramid('TEST', hourly.iloc[end - 90 * DAY + 5:], tmp_path)
+    assert_same(levels, build_pyramid(hourly))
+
+
+def test_first_bars_are_complete(hourly, tmp_path):
+    for levels in [build_pyramid(hourly), update_pyramid('TEST', hourly.iloc[-180 * DAY:], tmp_path)]:
+        for level in RULES:
+            assert levels[level]['Bars'].iloc[0] * LEVELS['1h'] == LEVELS[level]
+
+
+def test_horizon_steps_round_up():
+    assert horizon_steps(168, '1d') == 7
+    assert horizon_steps(200, '1d') == 9
+    assert horizon_steps(2, '4h') == 1
+    assert horizon_steps(24, '1h') == 24
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+trend.py: 누적합으로 구한 이동 추세가 윈도우마다 np.polyfit으로 다시 구한 값과 같은지
+"""
+
+import numpy as np
+import pytest
+
+from btc_forecast.synthetic import synthetic_ohlcv
+from btc_forecast.trend import rolling_trend
+
+
+def naive_trend(y, window):
+    # 시각 i의 윈도우 = y[i - window + 1 : i + 1], x = 0 ~ window-1
+    x = np.arange(window, dtype=np.float64)
+    rows = []
+    for i in range(window - 1, len(y)):
+        seg = y[i - window + 1:i + 1]
+        slope, intercept = np.polyfit(x, seg, 1)
+        resid = seg - (intercept + slope * x)
+        ssr, sst = (resid ** 2).sum(), ((seg - seg.mean()) ** 2).sum()
+        fitted = intercept + slope * (window - 1)
+        rows.append([slope, intercept, 1 - ssr / sst, np.sqrt(ssr / (window - 2)), fitted, slope / fitted * 100])
+    return np.array(rows)
+
+
+@pytest.mark.parametrize('window', [3, 24, 200])
+def test_matches_polyfit(window):
+    prices = synthetic_ohlcv(hours=1500, seed=7)['Close']
+    table = rolling_trend(prices, window)
+    assert table.iloc[:window - 1].isna().all().all()
+
+    expected = naive_trend(prices.to_numpy(), window)
+    got = table[['slope', 'intercept', 'r2', 'resid_vol', 'fitted', 'slope_pct']].to_numpy()[window - 1:]
+    # 잔차가 작은 윈도우는 상쇄 오차가 있으므로 가격 수준 기준의 절대 오차도 허용
+    np.testing.assert_allclose(got[:, [0, 1, 4, 5]], expected[:, [0, 1, 4, 5]], rtol=1e-7, atol=1e-6)
+    np.testing.assert_allclose(got[:, 2], expected[:, 2], atol=1e-6)
+    np.testing.assert_allclose(got[:, 3], expected[:, 3], rtol=1e-5, atol=1e-4)
+
+
+def test_nan_only_affects_windows_containing_it():
+    prices = synthetic_ohlcv(hours=300, seed=3)['Close'].copy()
+    prices.iloc[100] = np.nan
+    table = rolling_trend(prices, 24)
+    assert table['slope'].iloc[100:124].isna().all()
+    assert table['slope'].iloc[23:100].notna().all()
+    assert table['slope'].iloc[124:].notna().all()
+
+    # NaN 뒤의 윈도우도 NaN이 없는 구간만으로 계산한 것과 같아야 함
+    clean = rolling_trend(prices.iloc[101:], 24)
+    np.testing.assert_allclose(table['slope'].iloc[124:], clean['slope'].iloc[23:], rtol=1e-7, atol=1e-9)
+
+
+def test_short_input_and_bad_window():
+    prices = synthetic_ohlcv(hours=10)['Close']
+    assert rolling_trend(prices, 24).isna().all().all()
+    with pytest.raises(ValueError):
+        rolling_trend(prices, 2)
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+search.py: 검증 구간이 윈도우 크기와 상관없이 같은 시각인지, 이어하기와 배열 캐시
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from btc_forecast.search import holdout, run_search
+from btc_forecast.synthetic import synthetic_ohlcv
+from btc_forecast.windows import make_windows
+
+SPACE = {
+    'window_size': [5, 24],
+    'features': {'base': ['Close', 'Volume', 'MA5', 'MA20'], 'all': ['Close', 'Volume', 'MA50', 'Return']},
+    'hidden_layer_sizes': [(8,)],
+}
+MLP_PARAMS = {'max_iter': 5}
+
+
+@pytest.mark.parametrize('n_rows', [1060, 1069, 1118, 4321])
+def test_holdout_scores_the_same_rows(n_rows):
+    scaled = np.random.default_rng(0).random((n_rows, 3))
+    n_test = int(n_rows * 0.1)
+    for window in [5, 10, 24, 48, 58]:
+        X, y = make_windows(scaled, window, horizon=1, target_col=0)
+        split = holdout(X, y, n_rows, 0.1)
+        np.testing.assert_array_equal(np.asarray(split['y_test']).ravel(), scaled[-n_test:, 0])
+        assert len(split['X_train']) + len(split['X_test']) == len(X)
+
+
+def cache_files(search_dir):
+    return sorted(os.listdir(os.path.join(search_dir, 'cache')))
+
+
+def test_resume_and_cache(tmp_path, capsys):
+    df = synthetic_ohlcv(hours=600, seed=4)
+    first = run_search(df.iloc[:500], space=SPACE, max_workers=1, search_dir=str(tmp_path), mlp_params=MLP_PARAMS)
+    assert len(first) == 4
+    assert '(0 already done, 4 to run)' in capsys.readouterr().out
+    cached = cache_files(tmp_path)
+    assert len(cached) == 2
+
+    # 같은 데이터 + 같은 설정이면 모두 건너뜀
+    again = run_search(df.iloc[:500], space=SPACE, max_workers=1, search_dir=str(tmp_path), mlp_params=MLP_PARAMS)
+    assert '(4 already done, 0 to run)' in capsys.readouterr().out
+    assert again.equals(first)
+
+    # 학습 설정이나 검증 비율이 다르면 다시 시험
+    run_search(df.iloc[:500], space=SPACE, max_workers=1, search_dir=str(tmp_path), mlp_params={'max_iter': 6})
+    assert '(0 already done, 4 to run)' in capsys.readouterr().out
+    run_search(df.iloc[:500], space=SPACE, max_workers=1, search_dir=str(tmp_path), mlp_params=MLP_PARAMS,
+               test_ratio=0.2)
+    assert '(0 already done, 4 to run)' in capsys.readouterr().out
+    assert cache_files(tmp_path) == cached
+
+    # 데이터가 바뀌면 새 배열만 남음
+    run_search(df, space=SPACE, max_workers=1, search_dir=str(tmp_path), mlp_params=MLP_PARAMS)
+    assert '(0 already done, 4 to run)' in capsys.readouterr().out
+    assert len(cache_files(tmp_path)) == 2
+    assert not set(cache_files(tmp_path)) & set(cached)
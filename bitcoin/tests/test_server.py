@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+server.py: 동시 요청에서 갱신은 한 번만, 같은 예측은 한 번만 계산되는지 (모델 준비/예측은 가짜로 대체)
+"""
+
+import asyncio
+import json
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from btc_forecast import server
+
+
+class StubModels:
+    """
+    prepare_models / forecast_json 대신 호출 수만 세는 가짜 (작업 스레드에서 불리므로 잠금 사용)
+    """
+
+    def __init__(self, prepare_seconds=0.3, forecast_seconds=0.1):
+        self.prepare_seconds, self.forecast_seconds = prepare_seconds, forecast_seconds
+        self.prepared = 0
+        self.forecasts = []
+        self.fail = False
+        self.lock = threading.Lock()
+
+    def prepare_models(self, ticker, interval):
+        time.sleep(self.prepare_seconds)
+        if self.fail:
+            raise RuntimeError('download failed')
+        with self.lock:
+            self.prepared += 1
+            version = self.prepared
+        return {'mlp': (None, {'version': version}), 'mlp_status': 'reused',
+                'data_until': pd.Timestamp('2024-01-01', tz='UTC') + pd.Timedelta(hours=version),
+                'ready_seconds': self.prepare_seconds, 'version': version}
+
+    def forecast_json(self, ticker, model, state, horizon, history):
+        time.sleep(self.forecast_seconds)
+        with self.lock:
+            self.forecasts.append((state['version'], model, horizon, history))
+        return {'model': model, 'horizon': horizon, 'version': state['version']}
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    models = StubModels()
+    monkeypatch.setattr(server, 'prepare_models', models.prepare_models)
+    monkeypatch.setattr(server, 'forecast_json', models.forecast_json)
+    return models
+
+
+async def request(port, method, target):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(f'{method} {target} HTTP/1.1\r\nHost: localhost\r\n\r\n'.encode('latin-1'))
+    await writer.drain()
+    data = await reader.read()
+    writer.close()
+    head, body = data.split(b'\r\n\r\n', 1)
+    return int(head.split()[1]), json.loads(body)
+
+
+def run_with_server(scenario):
+    async def main():
+        service = server.ForecastService(refresh_seconds=3600)
+        await service.refresh()
+        srv = await asyncio.start_server(lambda r, w: server.handle(service, r, w), '127.0.0.1', 0)
+        port = srv.sockets[0].getsockname()[1]
+        async with srv:
+            return await scenario(service, lambda method, target: request(port, method, target))
+    return asyncio.run(main())
+
+
+def test_concurrent_refresh_and_forecast(stub):
+    async def scenario(service, call):
+        assert stub.prepared == 1
+        calls = [call('POST', '/refresh') for _ in range(5)]
+        calls += [call('GET', '/forecast?model=mlp&horizon=24') for _ in range(10)]
+        results = await asyncio.gather(*calls)
+        return service, results
+
+    service, results = run_with_server(scenario)
+    refreshes, forecasts = results[:5], results[5:]
+
+    # 동시에 온 갱신 요청 5개 -> 실제 갱신은 한 번
+    assert stub.prepared == 2
+    assert service.generation == 2
+    assert all(status == 200 for status, _ in refreshes)
+    assert {body['mlp_version'] for _, body in refreshes} == {2}
+
+    # 같은 예측 10개 -> 계산은 한 번 (갱신이 끝나기 전이라 이전 모델로 응답)
+    assert all(status == 200 for status, _ in forecasts)
+    assert stub.forecasts == [(1, 'mlp', 24, 0)]
+    assert {body['version'] for _, body in forecasts} == {1}
+
+
+def test_cache_is_per_generation(stub):
+    async def scenario(service, call):
+        first = await call('GET', '/forecast?model=linear&horizon=12')
+        again = await call('GET', '/forecast?model=linear&horizon=12')
+        assert len(stub.forecasts) == 1           # 같은 모델이면 캐시에서
+        await call('POST', '/refresh')
+        after = await call('GET', '/forecast?model=linear&horizon=12')
+        return first, again, after
+
+    first, again, after = run_with_server(scenario)
+    assert first == again == (200, {'model': 'linear', 'horizon': 12, 'version': 1})
+    assert after == (200, {'model': 'linear', 'horizon': 12, 'version': 2})
+    assert [v for v, *_ in stub.forecasts] == [1, 2]
+
+
+def test_bad_requests_are_rejected(stub):
+    async def scenario(service, call):
+        return await asyncio.gather(
+            call('GET', f'/forecast?horizon={server.MAX_HORIZON + 1}'),
+            call('GET', '/forecast?horizon=0'),
+            call('GET', '/forecast?horizon=abc'),
+            call('GET', '/forecast?model=lstm'),
+            call('GET', '/forecast?history=-1'),
+            call('GET', '/nowhere'),
+            call('GET', f'/forecast?horizon={server.MAX_HORIZON}'),
+        )
+
+    results = run_with_server(scenario)
+    assert [status for status, _ in results] == [400, 400, 400, 400, 400, 404, 200]
+    assert stub.forecasts == [(1, 'linear', server.MAX_HORIZON, 0)]
+
+
+def test_failed_refresh_keeps_previous_models(stub):
+    async def scenario(service, call):
+        stub.fail = True
+        status, body = await call('POST', '/refresh')
+        forecast = await call('GET', '/forecast?model=mlp')
+        return service, status, body, forecast
+
+    service, status, body, forecast = run_with_server(scenario)
+    assert status == 502
+    assert 'download failed' in body['last_error'] and body['mlp_version'] == 1
+    assert service.generation == 1
+    assert forecast == (200, {'model': 'mlp', 'horizon': 24, 'version': 1})
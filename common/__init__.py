@@ -0,0 +1,9 @@
+"""
+common: traffic / exercise_app / bitcoin 세 프로젝트가 같이 쓰는 모듈 (render.py)
+
+각 프로젝트는 설치하지 않고 스크립트로 실행하므로, 그래프를 그리는 곳 한 군데에서만 저장소 최상위를
+sys.path에 넣고 가져옵니다.
+   - traffic     : src/02_analysis.py
+   - exercise_app: plan.py
+   - bitcoin     : btc_forecast/plotting.py의 render_module() (bench.py 등 다른 모듈도 이 함수를 씀)
+"""
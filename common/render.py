@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+render.py
+=========
+[기능]
+traffic / exercise_app / bitcoin 세 프로젝트가 같이 쓰는 그래프 저장 모듈입니다.
+
+[내용]
+1. matplotlib은 그래프를 실제로 그릴 때만, numpy/pandas는 지문을 만들 때만 불러옵니다.
+   (스크립트를 실행할 때마다 pyplot을 import하지 않음)
+   - 화면 없이 파일로만 저장하므로 Agg 백엔드로 고정
+2. 서로 관계없는 그래프 여러 개를 여러 프로세스에서 동시에 그립니다.
+3. 그래프 함수와 넘기는 데이터로 지문을 만들어 두고, 지문이 같고 PNG가 남아 있으면 다시 그리지 않습니다.
+   (지문은 PNG가 있는 폴더의 .render_cache.json에 저장)
+   - 함수가 읽는 모듈 전역 값(설정 상수 등)과, 이 저장소 안의 다른 함수를 부르면 그 함수의 코드/전역 값도 지문에 들어감
+   - 그래서 그래프 함수 안에서 datetime.now() 같은 바뀌는 값을 쓰면 안 됨 (필요하면 인자로 넘김)
+
+[사용법]
+   from common.render import pyplot, render_figures
+
+   def plot_something(df, save_path):
+       plt = pyplot()
+       ...
+       plt.savefig(save_path)
+       plt.close()
+
+   render_figures([
+       {'func': plot_something, 'path': 'a.png', 'args': (df,)},
+       ...
+   ])
+"""
+
+import hashlib
+import json
+import os
+import types
+from concurrent.futures import ProcessPoolExecutor
+
+CACHE_NAME = '.render_cache.json'  # 폴더별 그래프 지문 기록
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # 이 안의 함수만 코드까지 따라감
+MAX_WORKERS = os.cpu_count() or 1
+
+
+def pyplot(rc=None):
+    """
+    Agg 백엔드로 고정한 matplotlib.pyplot (처음 부를 때 import)
+    - rc: 함께 적용할 rcParams (예: {'axes.unicode_minus': False})
+    """
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+    import matplotlib.pyplot as plt
+    if rc:
+        plt.rcParams.update(rc)
+    return plt
+
+
+# -----------------------------------------------------------------------------
+# 1. 지문 (그래프 함수 + 데이터)
+# -----------------------------------------------------------------------------
+def _update(h, obj):
+    # numpy/pandas는 지문을 만들 때만 불러옴 (이 모듈을 import하는 것만으로는 불러오지 않음)
+    import numpy as np
+    import pandas as pd
+
+    if isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        h.update(repr((type(obj).__name__, obj.shape, getattr(obj, 'columns', None),
+                       getattr(obj, 'dtypes', None))).encode('utf-8'))
+        h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, np.ndarray):
+        h.update(repr((obj.dtype.str, obj.shape)).encode('utf-8'))
+        h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, (list, tuple)):
+        h.update(f'{type(obj).__name__}{len(obj)}'.encode('utf-8'))
+        for item in obj:
+            _update(h, item)
+    elif isinstance(obj, dict):
+        h.update(f'dict{len(obj)}'.encode('utf-8'))
+        for key in sorted(obj, key=repr):
+            _update(h, key)
+            _update(h, obj[key])
+    else:
+        h.update(repr(obj).encode('utf-8'))
+
+
+def _update_code(h, code):
+    # 안쪽 함수(lambda 등)의 코드 객체는 repr에 메모리 주소가 들어가므로 내용으로 풀어서 넣음
+    h.update(code.co_code)
+    for const in code.co_consts:
+        if hasattr(const, 'co_code'):
+            _update_code(h, const)
+        else:
+            h.update(repr(const).encode('utf-8'))
+
+
+def _code_names(code):
+    # 함수(와 안쪽 함수)가 이름으로 참조하는 전역 이름/속성 이름
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if hasattr(const, 'co_code'):
+            names |= _code_names(const)
+    return names
+
+
+def _update_func(h, func, seen):
+    """
+    함수 코드 + 그 함수가 읽는 전역 값 + 부르는 저장소 안 함수(재귀)를 지문에 넣음
+    - 모듈, 클래스, 라이브러리 함수는 이름만 (라이브러리 버전까지 추적하지는 않음)
+    """
+    if func in seen:
+        return
+    seen.add(func)
+    h.update(f'{func.__module__}.{func.__qualname__}'.encode('utf-8'))
+    _update_code(h, func.__code__)
+    for name in sorted(_code_names(func.__code__)):
+        if name not in func.__globals__:
+            continue  # 속성 이름이거나 내장 함수
+        value = func.__globals__[name]
+        h.update(name.encode('utf-8'))
+        if isinstance(value, types.FunctionType):
+            if os.path.abspath(value.__code__.co_filename).startswith(REPO_DIR + os.sep):
+                _update_func(h, value, seen)
+            else:
+                h.update(f'{value.__module__}.{value.__qualname__}'.encode('utf-8'))
+        elif isinstance(value, (types.ModuleType, type, types.BuiltinFunctionType)) or callable(value):
+            h.update(getattr(value, '__name__', type(value).__name__).encode('utf-8'))
+        else:
+            _update(h, value)
+
+
+def figure_key(func, args=(), kwargs=None):
+    """
+    그래프 하나의 지문: 그래프 함수(이름 + 코드 + 읽는 전역 값 + 부르는 함수)와 넘기는 데이터가 같으면 같은 값
+    """
+    h = hashlib.sha256()
+    _update_func(h, func, set())
+    _update(h, tuple(args))
+    _update(h, kwargs or {})
+    return h.hexdigest()
+
+
+def _load_cache(directory):
+    path = os.path.join(directory, CACHE_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _save_cache(directory, cache):
+    # 중간에 끊겨도 깨진 파일이 남지 않도록 임시 파일에 쓴 뒤 교체
+    path = os.path.join(directory, CACHE_NAME)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+# -----------------------------------------------------------------------------
+# 2. 그리기 (바뀐 그래프만, 여러 프로세스에서)
+# -----------------------------------------------------------------------------
+def _render(func, path, args, kwargs):
+    """
+    그래프 하나 그리기 (프로세스 풀의 작업 단위)
+    """
+    pyplot()  # 작업 프로세스에서도 Agg 백엔드로 고정
+    func(*args, path, **kwargs)
+    return path
+
+
+def render_figures(jobs, max_workers=None, force=False):
+    """
+    그래프 여러 개를 저장 -> 실제로 다시 그린 파일 경로 목록
+    - jobs: [{'func': 그래프 함수, 'path': 저장 경로, 'args': (...), 'kwargs': {...}}, ...]
+      그래프 함수는 func(*args, path, **kwargs) 형태로 불림
+    - 지문이 지난번과 같고 파일도 남아 있으면 건너뜀 (force=True면 모두 다시 그림)
+    """
+    todo = []
+    caches = {}
+    for job in jobs:
+        path = os.fspath(job['path'])
+        directory = os.path.dirname(os.path.abspath(path))
+        cache = caches.setdefault(directory, _load_cache(directory))
+        key = figure_key(job['func'], job.get('args', ()), job.get('kwargs'))
+        if not force and os.path.exists(path) and cache.get(os.path.basename(path)) == key:
+            continue
+        todo.append((job, path, directory, key))
+
+    if len(todo) == 1:
+        job, path, _, _ = todo[0]
+        _render(job['func'], path, job.get('args', ()), job.get('kwargs') or {})
+    elif todo:
+        workers = max(1, min(max_workers or MAX_WORKERS, len(todo)))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_render, job['func'], path, job.get('args', ()), job.get('kwargs') or {})
+                       for job, path, _, _ in todo]
+            for future in futures:
+                future.result()
+
+    for _, path, directory, key in todo:
+        caches[directory][os.path.basename(path)] = key
+    for directory in {directory for _, _, directory, _ in todo}:
+        _save_cache(directory, caches[directory])
+    return [path for _, path, _, _ in todo]
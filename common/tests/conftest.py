@@ -0,0 +1,12 @@
+# -*- coding: utf-8 -*-
+"""
+common 테스트 공통 설정
+- 저장소 최상위를 경로에 추가 (from common.render import ...)
+"""
+
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
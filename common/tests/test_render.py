@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+render.py: 그래프 지문(figure_key)이 바뀌어야 할 때만 바뀌는지, .render_cache.json으로 다시 그리기를 건너뛰는지
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+
+from common.render import CACHE_NAME, figure_key, pyplot, render_figures
+
+LINE_COLOR = 'tab:blue'
+TITLE = 'Speed'
+
+
+def _title(name):
+    return f'{TITLE} - {name}'
+
+
+def plot_line(values, save_path, name='a'):
+    plt = pyplot()
+    fig, ax = plt.subplots(figsize=(2, 2))
+    ax.plot(values, color=LINE_COLOR)
+    ax.set_title(_title(name))
+    fig.savefig(save_path, dpi=20)
+    plt.close(fig)
+
+
+def plot_other(values, save_path, name='a'):
+    plot_line(values, save_path, name)
+
+
+def test_key_follows_data_and_function():
+    values = np.arange(10.0)
+    key = figure_key(plot_line, (values,))
+    assert figure_key(plot_line, (values.copy(),)) == key
+    assert figure_key(plot_line, (values + 1,)) != key
+    assert figure_key(plot_line, (values.astype(np.float32),)) != key
+    assert figure_key(plot_line, (values,), {'name': 'b'}) != key
+    assert figure_key(plot_other, (values,)) != key
+
+    frame = pd.DataFrame({'v': values}, index=pd.date_range('2024-01-01', periods=10, freq='h'))
+    shifted = frame.set_axis(frame.index + pd.Timedelta(hours=1))
+    assert figure_key(plot_line, (frame,)) == figure_key(plot_line, (frame.copy(),))
+    assert figure_key(plot_line, (frame,)) != figure_key(plot_line, (shifted,))
+
+
+def test_key_follows_globals_and_helpers(monkeypatch):
+    values = np.arange(10.0)
+    key = figure_key(plot_line, (values,))
+    # 그래프 함수가 읽는 설정 상수
+    monkeypatch.setattr(sys.modules[__name__], 'LINE_COLOR', 'tab:red')
+    changed_color = figure_key(plot_line, (values,))
+    assert changed_color != key
+    # 그래프 함수가 부르는 함수가 읽는 상수 (plot_other -> plot_line -> _title -> TITLE)
+    before = figure_key(plot_other, (values,))
+    monkeypatch.setattr(sys.modules[__name__], 'TITLE', 'Flow')
+    assert figure_key(plot_other, (values,)) != before
+    assert figure_key(plot_line, (values,)) != changed_color
+
+
+def cache_of(directory):
+    with open(os.path.join(directory, CACHE_NAME), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_render_only_changed_figures(tmp_path):
+    a, b = str(tmp_path / 'a.png'), str(tmp_path / 'b.png')
+    jobs = [{'func': plot_line, 'path': a, 'args': (np.arange(5.0),)},
+            {'func': plot_line, 'path': b, 'args': (np.arange(6.0),), 'kwargs': {'name': 'b'}}]
+
+    assert sorted(render_figures(jobs, max_workers=2)) == [a, b]
+    assert os.path.exists(a) and os.path.exists(b)
+    assert set(cache_of(tmp_path)) == {'a.png', 'b.png'}
+
+    # 그대로면 다시 그리지 않음
+    assert render_figures(jobs) == []
+
+    # 데이터가 바뀐 그래프만
+    jobs[1]['args'] = (np.arange(7.0),)
+    assert render_figures(jobs) == [b]
+    assert cache_of(tmp_path)['b.png'] == figure_key(plot_line, (np.arange(7.0),), {'name': 'b'})
+
+    # 파일이 지워졌으면 지문이 같아도 다시 그림
+    os.remove(a)
+    assert render_figures(jobs) == [a]
+    assert render_figures(jobs, force=True) == [a, b]
+
+
+def test_import_is_lazy():
+    # 모듈을 불러오는 것만으로는 matplotlib/numpy/pandas를 부르지 않음 (새 프로세스에서 확인)
+    code = ("import sys; import common.render; "
+            "print([m for m in ('matplotlib', 'numpy', 'pandas') if m in sys.modules])")
+    repo_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    out = subprocess.run([sys.executable, '-c', code], cwd=repo_dir, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == '[]'
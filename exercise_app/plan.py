@@ -6,13 +6,19 @@ exercise_app: 운동 기록 관리 + 점진적 과부하 + 회복 감지 + 추
 
 import json
 import csv
+import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 
 import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
 
+# 세 프로젝트가 같이 쓰는 그래프 패키지 (저장소 최상위 common, common/__init__.py 참고)
+REPO_DIR = str(Path(__file__).resolve().parent.parent)
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+from common.render import pyplot, render_figures
+
 
 # ===============================
 # 경로 설정
@@ -179,6 +185,8 @@ def plot_weekday_heatmap(df, save_path):
     if df.empty:
         return
 
+    plt = pyplot()
+
     df2 = df.copy()
     df2["weekday"] = df2["date"].dt.weekday
     pivot = (
@@ -202,6 +210,8 @@ def plot_intensity_trend(df, save_path):
     if df.empty:
         return
 
+    plt = pyplot()
+
     df2 = df.copy()
     df2["month"] = df2["date"].dt.to_period("M")
     monthly = df2.groupby("month")["intensity"].mean()
@@ -221,6 +231,8 @@ def plot_stacked_volume(df, save_path):
     if df.empty:
         return
 
+    plt = pyplot()
+
     df2 = df.copy()
     df2["month"] = df2["date"].dt.to_period("M")
     agg = (
@@ -253,6 +265,8 @@ def plot_monthly_adherence(df, save_path):
     if df.empty:
         return
 
+    plt = pyplot()
+
     df2 = df.copy()
     df2["month"] = df2["date"].dt.to_period("M")
     adherence = df2.groupby("month")["done"].apply(lambda x: (x == "Y").mean())
@@ -301,10 +315,14 @@ def demo():
     for s in optimize_schedule(df, routines):
         print("- " + s)
 
-    plot_weekday_heatmap(df, BASE / "weekday_heatmap.png")
-    plot_intensity_trend(df, BASE / "intensity_trend.png")
-    plot_stacked_volume(df, BASE / "stacked_volume.png")
-    plot_monthly_adherence(df, BASE / "monthly_adherence.png")
+    # 그래프 4개를 동시에 그림 (기록이 그대로면 다시 그리지 않음)
+    if not df.empty:
+        render_figures([
+            {"func": plot_weekday_heatmap, "path": BASE / "weekday_heatmap.png", "args": (df,)},
+            {"func": plot_intensity_trend, "path": BASE / "intensity_trend.png", "args": (df,)},
+            {"func": plot_stacked_volume, "path": BASE / "stacked_volume.png", "args": (df,)},
+            {"func": plot_monthly_adherence, "path": BASE / "monthly_adherence.png", "args": (df,)},
+        ])
 
     print("\n그래프가 exercise_app/ 폴더에 생성되었습니다.")
 
@@ -14,7 +14,8 @@ document.addEventListener('DOMContentLoaded', function () {
     // --------------------------------------------------------
     // 1. 파라미터 설정 (분석 결과 기반)
     // --------------------------------------------------------
-    // 우리가 구한 분석값: 자유속도(uf) = 103.7 km/h, 용량(C) = 1301 대/시
+    // 기본값: 예전 분석값 자유속도(uf) = 103.7 km/h, 용량(C) = 1301 대/시
+    // src/04_assignment.py가 만든 결과 표(web/data/assignment_table.json)가 있으면 그 값으로 교체
     const PARAMS = {
         uf: 103.7,  // km/h
         capacity: 1301, // vph (Vehicle per Hour)
@@ -30,6 +31,9 @@ document.addEventListener('DOMContentLoaded', function () {
         B: { distance: 8.0, capacity_scale: 1.2 }  // 우회로가 조금 더 넓다고 가정 (용량 1.2배)
     };
 
+    // 사전 계산된 사용자 균형 표 (수요별 경로 교통량/시간)
+    let ASSIGNMENT_TABLE = null;
+
     // --------------------------------------------------------
     // 2. 차트 초기화
     // --------------------------------------------------------
@@ -72,8 +76,9 @@ document.addEventListener('DOMContentLoaded', function () {
     // --------------------------------------------------------
     // Time = (Distance / Speed_Free) * (1 + alpha * (Traffic / Capacity)^beta)
     function calculateTime(traffic, routeConfig) {
-        const t0 = (routeConfig.distance / PARAMS.uf) * 60; // 분 단위 변환
-        const cap = PARAMS.capacity * routeConfig.capacity_scale;
+        // 결과 표에서 읽은 경로는 자유 통행시간(t0)과 용량이 이미 계산되어 있음
+        const t0 = routeConfig.t0 !== undefined ? routeConfig.t0 : (routeConfig.distance / PARAMS.uf) * 60; // 분 단위 변환
+        const cap = routeConfig.capacity !== undefined ? routeConfig.capacity : PARAMS.capacity * routeConfig.capacity_scale;
 
         // BPR 공식 적용
         const congestionFactor = 1 + PARAMS.alpha * Math.pow((traffic / cap), PARAMS.beta);
@@ -127,6 +132,22 @@ document.addEventListener('DOMContentLoaded', function () {
             eqMsg.innerHTML = `⚠️ <strong>불균형</strong>: Route B가 ${diff.toFixed(1)}분 더 빠름<br>운전자들이 B로 몰리게 됩니다.`;
         }
 
+        // 사전 계산된 균형 분배 (가장 가까운 수요의 결과)
+        if (ASSIGNMENT_TABLE) {
+            const demands = ASSIGNMENT_TABLE.demand;
+            let i = 0;
+            for (let j = 1; j < demands.length; j++) {
+                if (Math.abs(demands[j] - totalQ) < Math.abs(demands[i] - totalQ)) i = j;
+            }
+            // 경로 이름은 표에서 읽음 (--network로 만든 표는 A/B가 아닐 수 있음)
+            // 비율은 각 경로의 OD 수요 대비 (04_assignment.py는 모든 OD에 같은 수요를 실음)
+            const parts = Object.keys(ASSIGNMENT_TABLE.flow).map(name => {
+                const share = demands[i] > 0 ? Math.round(ASSIGNMENT_TABLE.flow[name][i] / demands[i] * 100) : 0;
+                return `${name} ${share}% (${ASSIGNMENT_TABLE.time[name][i].toFixed(1)}분)`;
+            });
+            eqMsg.innerHTML += `<br>📋 계산된 균형 분배: ${parts.join(' / ')}`;
+        }
+
         // 차트 업데이트 (숫자 값 전달 - toFixed는 문자열 반환하므로)
         simChart.data.datasets[0].data = [parseFloat(tA.toFixed(1)), parseFloat(tB.toFixed(1))];
         simChart.update();
@@ -140,4 +161,25 @@ document.addEventListener('DOMContentLoaded', function () {
 
     // 초기 실행
     updateSimulation();
+
+    // 결과 표 불러오기 (없거나 로컬 파일로 열어서 못 읽으면 기본값 그대로 사용)
+    fetch('web/data/assignment_table.json')
+        .then(response => response.ok ? response.json() : Promise.reject(response.status))
+        .then(table => {
+            ASSIGNMENT_TABLE = table;
+            PARAMS.uf = table.params.uf;
+            PARAMS.capacity = table.params.capacity;
+            // 슬라이더의 A/B 경로는 표에 같은 이름의 경로가 있을 때만 값을 바꿈
+            ['A', 'B'].forEach(name => {
+                if (table.routes[name]) {
+                    ROUTES[name].t0 = table.routes[name].t0;
+                    ROUTES[name].capacity = table.routes[name].capacity;
+                } else {
+                    console.warn(`Route ${name} not in assignment table, using default values.`);
+                }
+            });
+            console.log("Assignment table loaded.");
+            updateSimulation();
+        })
+        .catch(err => console.warn("Assignment table not available, using defaults:", err));
 });
@@ -6,15 +6,33 @@
 한국도로공사 VDS(차량검지시스템) 원본 데이터를 불러와서 우리가 필요한 형태로 정리하는 코드입니다.
 
 [수행 과정]
-1. 여러 개의 csv 파일을 하나로 합칩니다. (7일치 데이터)
+1. 여러 개의 csv 파일을 프로세스 풀로 동시에 읽습니다. (7일치 데이터)
+   - 필요한 컬럼만 파싱하고, 청크 단위로 읽으면서 바로 필터링합니다.
 2. 분석 대상인 4개 JC(안현, 일직, 조남, 도리)만 남기고 나머지는 지웁니다.
 3. 오류 데이터(속도 0 이하 등)를 제거합니다.
+   - 필터를 통과한 조각들만 마지막에 한 번 합칩니다.
 4. 분석하기 좋게 '밀도(Density)' 같은 값을 미리 계산해둡니다.
+5. 결과를 노드명/기준일로 파티션된 Parquet 데이터셋으로 저장합니다.
+   - 분석 코드는 필요한 컬럼과 파티션만 골라 읽을 수 있습니다.
+6. 처리한 파일 목록(manifest)을 기록해 두고, 다음 실행 때는
+   새로 생기거나 바뀐 파일만 다시 읽어서 그 파일의 행만 교체합니다.
+   (전체 재처리: python 01_data_loader.py --full)
+7. 노드별 색인(_node_index.json)을 만들어 노드 하나만 빠르게 꺼내 볼 수 있게 합니다.
+   (전체 노드 모드: python 01_data_loader.py --all-nodes -> all_nodes_dataset 폴더)
 """
 
 import pandas as pd
+import argparse
 import glob
+import hashlib
+import json
 import os
+import shutil
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from node_index import build_node_index
+from vds_schema import (CSV_DTYPES, DENSITY_DTYPE, FRAME_DTYPES, NA_VALUES, TEXT_DTYPES, THOUSANDS,
+                        coerce_chunk, finish_chunk, memory_stats, print_memory_report, write_dataset)
 
 # -----------------------------------------------------------------------------
 # 1. 설정 (Settings)
@@ -22,72 +40,243 @@ import os
 # 데이터가 있는 폴더 위치
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 RAW_DATA_DIR = os.path.join(BASE_DIR, 'VDS_*')  # VDS_로 시작하는 모든 폴더
-OUTPUT_PATH = os.path.join(BASE_DIR, 'data', 'processed', 'jc_filtered_data.csv')
+# 전처리 결과 저장 위치 (노드명=.../기준일=.../*.parquet 구조의 폴더)
+OUTPUT_DIR = os.path.join(BASE_DIR, 'data', 'processed', 'jc_dataset')
+# 처리한 원본 파일 기록 (경로, 크기, 수정시각, 내용 해시)
+MANIFEST_PATH = os.path.join(BASE_DIR, 'data', 'processed', 'manifest.json')
+
+# 전체 노드 모드 (--all-nodes) 결과는 따로 저장 (JC 4개 결과와 섞이지 않도록)
+ALL_NODES_OUTPUT_DIR = os.path.join(BASE_DIR, 'data', 'processed', 'all_nodes_dataset')
+ALL_NODES_MANIFEST_PATH = os.path.join(BASE_DIR, 'data', 'processed', 'all_nodes_manifest.json')
 
-# 분석하고 싶은 고속도로 분기점(JC) 목록
+# 분석하고 싶은 고속도로 분기점(JC) 목록 (--all-nodes면 무시하고 모든 노드 처리)
 TARGET_NODES = ['안현JC', '일직JC', '조남JC', '도리JC']
 
-def load_and_process():
+# 필요한 컬럼 (이 컬럼만 파싱해서 메모리 절약)
+# 기준시간, 날짜, 요일, JC이름, 교통량, 속도
+USE_COLS = ['기준시간', '기준일', '요일명', '노드명', '교통량', '평균속도']
+
+# 대상 JC 목록을 범주로 하는 노드명 자료형 (모든 청크/파일이 같은 범주를 갖도록)
+NODE_DTYPE = pd.CategoricalDtype(TARGET_NODES)
+
+# 병렬 처리 설정
+MAX_WORKERS = os.cpu_count() or 1  # 파일을 동시에 읽을 프로세스 수
+MAX_PENDING = 2                    # 프로세스당 동시에 맡겨 두는 파일 수 (끝난 결과가 메모리에 쌓이지 않도록)
+CHUNK_SIZE = 200_000               # 파일 하나를 이 행 수만큼씩 나눠 읽음
+
+
+def filter_chunk(chunk, all_nodes=False, text=False):
+    """
+    읽어 들인 조각(chunk) 하나에 JC 필터와 오류 데이터 필터를 바로 적용
+    - text: 숫자 컬럼을 문자열로 읽은 조각 (TEXT_DTYPES, 자료형대로 읽을 수 없던 파일)
+    """
+    # (1) 우리가 원하는 JC만 남기기 (전체 노드 모드면 건너뜀)
+    # (노드명은 read_csv 단계에서 이미 범주형이므로 변환 없이 바로 비교)
+    if not all_nodes:
+        chunk = chunk[chunk['노드명'].isin(TARGET_NODES)].copy()
+        chunk['노드명'] = chunk['노드명'].cat.set_categories(NODE_DTYPE.categories)
+
+    # 결측('-', 빈 칸)이 있는 행은 버리고 기준일 범주를 날짜로
+    chunk = coerce_chunk(chunk) if text else finish_chunk(chunk)
+
+    # (2) 이상한 데이터 지우기
+    # 교통량이 0 이하이거나, 속도가 0 이하인 데이터는 측정 오류일 가능성이 높음
+    return chunk[(chunk['교통량'] > 0) & (chunk['평균속도'] > 0)]
+
+
+def file_hash(file):
+    """
+    파일 내용의 SHA-256 해시 (수정시각만 바뀌고 내용은 같은 파일을 구분하기 위함)
+    """
+    h = hashlib.sha256()
+    with open(file, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def file_id(rel_path):
+    """
+    원본 파일 하나가 만든 Parquet 조각들의 이름표 (경로 기준이라 내용이 바뀌어도 같음)
+    """
+    return hashlib.sha1(rel_path.encode('utf-8')).hexdigest()[:16]
+
+
+def load_manifest(manifest_path):
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_manifest(manifest, manifest_path):
+    # 중간에 끊겨도 깨진 파일이 남지 않도록 임시 파일에 쓴 뒤 교체
+    tmp_path = manifest_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+
+def remove_file_rows(output_dir, fid):
+    """
+    원본 파일 하나에서 나온 행(Parquet 조각)을 데이터셋에서 모두 삭제
+    """
+    pattern = os.path.join(output_dir, '**', f'{fid}-*.parquet')
+    for part in glob.glob(pattern, recursive=True):
+        os.remove(part)
+        # 비어버린 파티션 폴더도 정리
+        part_dir = os.path.dirname(part)
+        while part_dir != output_dir and not os.listdir(part_dir):
+            os.rmdir(part_dir)
+            part_dir = os.path.dirname(part_dir)
+
+
+def read_vds_file(file, all_nodes=False):
+    """
+    VDS 파일 하나를 청크 단위로 읽으면서 필터링 (프로세스 풀의 작업 단위)
+    - 원본 파일 전체를 메모리에 올리지 않고, 살아남은 행만 돌려줌
+    """
+    # CSV 파일 읽기 (인코딩: euc-kr)
+    # usecols : 필요한 컬럼만 파싱 (실제 파일에 없는 컬럼은 무시)
+    # dtype : 읽는 순간 범주형/작은 숫자 자료형 ('-'와 빈 칸은 결측, "1,200" 같은 쉼표는 read_csv가 처리)
+    try:
+        reader = pd.read_csv(file, encoding='euc-kr', sep=',',
+                             usecols=lambda c: c in USE_COLS, dtype=CSV_DTYPES,
+                             na_values=NA_VALUES, thousands=THOUSANDS, chunksize=CHUNK_SIZE)
+        parts = [filter_chunk(chunk, all_nodes) for chunk in reader]
+    except ValueError:
+        # 숫자 칸에 예상 못 한 값이 있으면 이 파일만 문자열로 다시 읽어서 변환 (그 값이 있는 행만 버림)
+        reader = pd.read_csv(file, encoding='euc-kr', sep=',',
+                             usecols=lambda c: c in USE_COLS, dtype=TEXT_DTYPES,
+                             na_values=NA_VALUES, chunksize=CHUNK_SIZE)
+        parts = [filter_chunk(chunk, all_nodes, text=True) for chunk in reader]
+    if parts:
+        df = pd.concat(parts, ignore_index=True)
+    else:
+        df = pd.DataFrame({c: pd.Series(dtype=FRAME_DTYPES[c]) for c in USE_COLS})
+        if not all_nodes:
+            df['노드명'] = df['노드명'].astype(NODE_DTYPE)
+
+    # 추가 변수 만들기
+    # 밀도(Density) = 교통량(Q) / 속도(V)
+    # 의미: 1km 구간 안에 차가 몇 대나 있는가? (단위: 대/km)
+    df['밀도'] = (df['교통량'] / df['평균속도']).astype(DENSITY_DTYPE)
+    return df
+
+
+def load_and_process(full=False, all_nodes=False):
     """
     데이터를 로드하고 전처리하는 메인 함수
+
+    full=False(기본): manifest와 비교해서 새로 생기거나 바뀐 파일만 처리
+    full=True       : 기존 결과를 지우고 모든 파일을 다시 처리
+    all_nodes=True  : TARGET_NODES 대신 VDS에 있는 모든 노드를 처리
     """
     print("🚀 데이터 전처리를 시작합니다...")
 
+    output_dir = ALL_NODES_OUTPUT_DIR if all_nodes else OUTPUT_DIR
+    manifest_path = ALL_NODES_MANIFEST_PATH if all_nodes else MANIFEST_PATH
+    if all_nodes:
+        print("🌐 전체 노드 모드: 모든 노드를 처리합니다.")
+
+    if full and os.path.exists(output_dir):
+        shutil.rmtree(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = {} if full else load_manifest(manifest_path)
+
     # 1. 파일 찾기
-    all_files = glob.glob(os.path.join(RAW_DATA_DIR, "*"))
+    all_files = sorted(glob.glob(os.path.join(RAW_DATA_DIR, "*")))
     print(f"📄 발견된 데이터 파일 개수: {len(all_files)}개")
 
-    merged_df = pd.DataFrame() # 빈 데이터프레임 생성
-
+    # 크기/수정시각이 기록과 같으면 내용도 같다고 보고 건너뜀
+    # 다르면 해시를 먼저 계산해서, 내용이 같으면(수정시각만 바뀜) 파싱 없이 기록만 갱신
+    todo = []
+    touched = 0
     for file in all_files:
-        try:
-            # CSV 파일 읽기 (인코딩: euc-kr)
-            # thousands=',' : "1,200" 같은 숫자의 쉼표를 제거하고 숫자로 인식
-            df = pd.read_csv(file, encoding='euc-kr', sep=',', thousands=',')
-            
-            # 필요한 컬럼만 선택 (메모리 절약)
-            # 기준시간, 날짜, 요일, JC이름, 교통량, 속도
-            cols = ['기준시간', '기준일', '요일명', '노드명', '교통량', '평균속도']
-            # 실제 파일에 '평균속도'라는 컬럼이 있는지 확인 후 선택
-            available_cols = [c for c in cols if c in df.columns]
-            df = df[available_cols]
-            
-            merged_df = pd.concat([merged_df, df])
-        
-        except Exception as e:
-            print(f"⚠️ 파일 읽기 오류 ({os.path.basename(file)}): {e}")
-
-    print(f"📥 1차 병합 완료: 총 {len(merged_df):,}개 행")
-
-    # 2. 데이터 필터링 (청소하기)
-    # (1) 우리가 원하는 JC만 남기기
-    df_filtered = merged_df[merged_df['노드명'].isin(TARGET_NODES)].copy()
-    
-    # (2) 이상한 데이터 지우기
-    # 교통량이 0 이하이거나, 속도가 0 이하인 데이터는 측정 오류일 가능성이 높음
-    df_filtered = df_filtered[
-        (df_filtered['교통량'] > 0) & 
-        (df_filtered['평균속도'] > 0)
-    ]
-    
-    # (3) 데이터 타입 정리 (숫자로 변환)
-    df_filtered['교통량'] = pd.to_numeric(df_filtered['교통량'])
-    df_filtered['평균속도'] = pd.to_numeric(df_filtered['평균속도'])
-
-    # 3. 추가 변수 만들기
-    # 밀도(Density) = 교통량(Q) / 속도(V)
-    # 의미: 1km 구간 안에 차가 몇 대나 있는가? (단위: 대/km)
-    df_filtered['밀도'] = df_filtered['교통량'] / df_filtered['평균속도']
+        rel = os.path.relpath(file, BASE_DIR)
+        stat = os.stat(file)
+        entry = manifest.get(rel)
+        if entry and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime:
+            continue
+        digest = file_hash(file)
+        if entry and entry['sha256'] == digest:
+            manifest[rel] = {**entry, 'size': stat.st_size, 'mtime': stat.st_mtime}
+            touched += 1
+            continue
+        todo.append((file, rel, stat, digest))
+    print(f"🆕 새로 처리할 파일: {len(todo)}개 (나머지 {len(all_files) - len(todo)}개는 이미 처리됨)")
+
+    # 원본이 사라진 파일의 행은 데이터셋에서도 삭제
+    current = {os.path.relpath(file, BASE_DIR) for file in all_files}
+    removed = [rel for rel in manifest if rel not in current]
+    for rel in removed:
+        remove_file_rows(output_dir, manifest.pop(rel)['file_id'])
+        print(f"🗑️ 사라진 파일의 데이터 삭제: {rel}")
+    if removed or touched:
+        save_manifest(manifest, manifest_path)  # 새로 처리할 파일이 없어도 기록은 맞춰 둠
+
+    # 2. 파일별 병렬 읽기 + 필터링
+    # 각 프로세스가 파일 하나씩 맡아서 필터링까지 끝낸 결과만 돌려줌
+    # 끝나는 순서대로 저장하고, 맡겨 두는 파일 수를 제한해서 느린 파일 하나 때문에 결과가 쌓이지 않게 함
+    # 3. 파일 단위로 저장 (컬럼 단위 압축 + 노드명/기준일 파티션)
+    # 조각 이름에 파일 ID를 붙여 두어서, 파일이 바뀌면 그 파일의 행만 교체할 수 있음
+    new_rows = 0
+    usage, dtypes = None, None
+    with ProcessPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        queue = iter(todo)
+        pending = {}
+        while True:
+            for item in queue:
+                pending[executor.submit(read_vds_file, item[0], all_nodes)] = item
+                if len(pending) >= MAX_WORKERS * MAX_PENDING:
+                    break
+            if not pending:
+                break
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                file, rel, stat, digest = pending.pop(future)
+                try:
+                    df = future.result()
+                except Exception as e:
+                    print(f"⚠️ 파일 읽기 오류 ({os.path.basename(file)}): {e}")
+                    continue
+
+                fid = file_id(rel)
+                remove_file_rows(output_dir, fid)
+                if len(df) > 0:
+                    write_dataset(df, output_dir, basename_template=f'{fid}-{{i}}.parquet')
+                new_rows += len(df)
+                file_usage, dtypes, _ = memory_stats(df)
+                usage = file_usage if usage is None else usage + file_usage
+
+                # 해시를 계산한 시점의 크기/수정시각 (읽는 도중 바뀌었으면 다음 실행에서 다시 읽음)
+                manifest[rel] = {
+                    'size': stat.st_size,
+                    'mtime': stat.st_mtime,
+                    'sha256': digest,
+                    'file_id': fid,
+                }
+                save_manifest(manifest, manifest_path)
+
+    print(f"📥 필터링 및 저장 완료: 새로 반영된 행 {new_rows:,}개")
+    if usage is not None:
+        print_memory_report(usage, dtypes, new_rows, title='새로 반영된 데이터 메모리')
+
+    # 4. 노드 색인 갱신 (노드명 -> 조각 파일 목록/행 수)
+    node_index = build_node_index(output_dir)
+    print(f"🗂️ 노드 색인 갱신: {len(node_index):,}개 노드")
 
-    # 4. 저장하기
-    os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
-    df_filtered.to_csv(OUTPUT_PATH, index=False, encoding='utf-8-sig')
-    
     print("-" * 50)
     print(f"✅ 전처리 완료!")
-    print(f"💾 저장 위치: {OUTPUT_PATH}")
-    print(f"📊 최종 데이터 개수: {len(df_filtered):,}개")
+    print(f"💾 저장 위치: {output_dir}")
+    print(f"📊 처리된 원본 파일 수: {len(manifest):,}개")
     print("-" * 50)
 
 if __name__ == "__main__":
-    load_and_process()
+    parser = argparse.ArgumentParser(description='VDS 원본 데이터 전처리')
+    parser.add_argument('--full', action='store_true',
+                        help='manifest를 무시하고 모든 파일을 다시 처리')
+    parser.add_argument('--all-nodes', action='store_true',
+                        help='TARGET_NODES 대신 모든 노드를 처리')
+    args = parser.parse_args()
+    load_and_process(full=args.full, all_nodes=args.all_nodes)
@@ -8,71 +8,187 @@
 [분석 내용]
 1. 기초 통계: 평균 속도, 가장 막히는 요일 등
 2. 그래프 그리기: 산점도, 요일별 패턴 등
+   (모든 통계는 노드 x 요일 x 시간대 집계 큐브에서 계산, 데이터가 그대로면 큐브를 재사용)
 3. 심화 분석 (Greenshields Model):
    - 속도와 밀도의 관계를 선형 회귀로 분석
    - 자유속도, 도로용량 계산
+4. 노드별 Greenshields 분석: 모든 노드(선택 시 노드 x 시간대)의 추세선을 한 번에 구하고
+   부트스트랩 신뢰구간을 여러 CPU 코어에서 나눠 계산 (greenshields.py)
+   - 시간대별: python 02_analysis.py --by-hour
+   - 전체 노드 모드: python 02_analysis.py --all-nodes
+   - 노드 하나만 조회: python 02_analysis.py --node 안현JC
 """
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 import os
+import sys
 import json
+import argparse
+
+from cube import FIT_COLS, load_or_build_cube, mean_of, rollup, std_of
+from greenshields import SUM_COLS, fit_groups, fit_units
+from node_index import load_node
+from vds_schema import WEEK_ORDER, memory_stats, print_memory_report
+
+# 세 프로젝트가 같이 쓰는 그래프 패키지 (저장소 최상위 common, common/__init__.py 참고)
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+from common.render import pyplot, render_figures
 
 # -----------------------------------------------------------------------------
 # 1. 설정 (Settings)
 # -----------------------------------------------------------------------------
-# 한글 폰트 설정 (그래프에 한글 깨짐 방지)
-plt.rcParams['font.family'] = 'DejaVu Sans' # 기본 폰트
-plt.rcParams['axes.unicode_minus'] = False  # 마이너스 기호 깨짐 방지
+# 한글 폰트 설정 (그래프에 한글 깨짐 방지), matplotlib은 그래프를 그릴 때만 불러옴
+PLOT_RC = {
+    'font.family': 'DejaVu Sans',  # 기본 폰트
+    'axes.unicode_minus': False,   # 마이너스 기호 깨짐 방지
+}
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-DATA_PATH = os.path.join(BASE_DIR, 'data', 'processed', 'jc_filtered_data.csv')
+DATA_DIR = os.path.join(BASE_DIR, 'data', 'processed', 'jc_dataset')  # 01_data_loader.py 결과 (Parquet)
+ALL_NODES_DATA_DIR = os.path.join(BASE_DIR, 'data', 'processed', 'all_nodes_dataset')  # --all-nodes 결과
 WEB_DATA_DIR = os.path.join(BASE_DIR, 'web', 'data')     # JSON 결과 저장
 WEB_IMG_DIR = os.path.join(BASE_DIR, 'web')              # 그래프 이미지 저장 (웹사이트용)
+CACHE_DIR = os.path.join(BASE_DIR, 'data', 'processed', 'cache')  # 집계 큐브 저장 (cube.py)
 
-def run_analysis():
-    print("🚀 데이터 분석을 시작합니다...")
-    
-    # 데이터 불러오기
-    if not os.path.exists(DATA_PATH):
+# 분석 범위 (None이면 전체). 파티션 단위로 걸러지므로 범위 밖 파일은 열지 않음
+ANALYSIS_NODES = None       # 예: ['안현JC', '도리JC']
+DATE_FROM = None            # 예: '2024-01-01' (기준일)
+DATE_TO = None
+
+# 부트스트랩 신뢰구간 계산에 쓸 프로세스 수
+MAX_WORKERS = os.cpu_count() or 1
+# 추세선을 구할 때 쓰는 밀도 범위 (이상치 제외)
+DENSITY_RANGE = (0, 200)
+# 속도-밀도 그래프 방식: 'hist2d' (칸별 개수를 색으로, 행 수와 상관없이 빠름) / 'scatter' (표본 점 찍기)
+SCATTER_MODE = 'hist2d'
+# 부트스트랩 반복 횟수 (0이면 신뢰구간 계산 안 함)와 신뢰수준
+N_BOOTSTRAP = 200
+CI_LEVEL = 0.95
+
+
+def build_filters():
+    """
+    분석 범위 설정을 Parquet 읽기 필터(pushdown)로 변환
+    """
+    filters = []
+    if ANALYSIS_NODES is not None:
+        filters.append(('노드명', 'in', list(ANALYSIS_NODES)))
+    if DATE_FROM is not None:
+        filters.append(('기준일', '>=', pd.Timestamp(DATE_FROM).date()))
+    if DATE_TO is not None:
+        filters.append(('기준일', '<=', pd.Timestamp(DATE_TO).date()))
+    return filters or None
+
+
+def clean_rows(df):
+    """
+    추세선에 쓸 행만 남기기 (밀도가 너무 크거나 작은 이상치 제외)
+    """
+    return df[(df['밀도'] > DENSITY_RANGE[0]) & (df['밀도'] < DENSITY_RANGE[1])]
+
+
+def format_ci(row, col, fmt='.0f'):
+    """
+    '3129 (95% CI 3050~3210)' 형식의 문자열 (신뢰구간이 없으면 값만)
+    """
+    text = f"{row[col]:{fmt}}"
+    if f'{col}_lo' in row and not np.isnan(row[f'{col}_lo']):
+        text += f" ({CI_LEVEL:.0%} CI {row[f'{col}_lo']:{fmt}}~{row[f'{col}_hi']:{fmt}})"
+    return text
+
+
+def lookup_node(node, all_nodes=False):
+    """
+    노드 하나만 조회해서 결과 출력 (전체 데이터를 읽지 않음)
+    """
+    data_dir = ALL_NODES_DATA_DIR if all_nodes else DATA_DIR
+    df = load_node(data_dir, node, columns=['노드명', '평균속도', '밀도'], filters=build_filters())
+    result = fit_groups(clean_rows(df), ['노드명'], n_boot=N_BOOTSTRAP,
+                        level=CI_LEVEL, max_workers=MAX_WORKERS).iloc[0]
+    print(f"[🔎 {node}] 데이터 {len(df):,}개, 평균 속도 {df['평균속도'].mean():.1f} km/h")
+    print(f"   자유속도 {format_ci(result, 'free_flow_speed', '.1f')} km/h")
+    print(f"   혼잡밀도 {format_ci(result, 'jam_density', '.1f')} 대/km")
+    print(f"   도로용량 {format_ci(result, 'capacity')} 대/시")
+    return result
+
+
+def load_cube(all_nodes=False):
+    """
+    노드 x 요일 x 시간대 집계 큐브 불러오기 (cube.py)
+    원본을 한 번 훑어서 만들고, 데이터가 그대로면 저장된 큐브를 재사용하므로 원본을 읽지 않음
+    -> (큐브, 산점도 표본, 히스토그램), 데이터가 없으면 None
+    """
+    data_dir = ALL_NODES_DATA_DIR if all_nodes else DATA_DIR
+    if not os.path.exists(data_dir):
         print("❌ 처리된 데이터 파일이 없습니다. 01_data_loader.py를 먼저 실행하세요.")
-        return
+        return None
 
-    df = pd.read_csv(DATA_PATH)
-    print(f"📊 분석 대상 데이터: {len(df):,}개\n")
+    cache_dir = os.path.join(CACHE_DIR, os.path.basename(data_dir))
+    cube, sample, histogram, cached = load_or_build_cube(data_dir, cache_dir, filters=build_filters(),
+                                                         density_range=DENSITY_RANGE)
+    if cached:
+        print("♻️ 데이터 변경 없음: 저장된 집계 큐브를 사용합니다.")
+    return cube, sample, histogram
 
-    # -------------------------------------------------------
-    # 2. 기초 통계 분석 (Basic Statistics)
-    # -------------------------------------------------------
+
+def fit_cube(cube, by=None, n_boot=None):
+    """
+    큐브 칸 단위로 추세선 구하기 (이상치 제외 행의 n, Σk, Σv, Σk², Σkv 합계 사용)
+    - by=None이면 모든 칸을 그룹 하나로 본 전체 추세선 (Series)
+    - n_boot를 주지 않으면 N_BOOTSTRAP번 칸 단위 부트스트랩으로 신뢰구간 계산
+    """
+    n_boot = N_BOOTSTRAP if n_boot is None else n_boot
+    cells = cube.reset_index()
+    fit_sums = cube[FIT_COLS].to_numpy()
+    if by is None:
+        return fit_units(cells.assign(전체='전체'), ['전체'], fit_sums, n_boot=n_boot,
+                         level=CI_LEVEL, max_workers=MAX_WORKERS).iloc[0]
+    return fit_units(cells, by, fit_sums, n_boot=n_boot, level=CI_LEVEL, max_workers=MAX_WORKERS)
+
+
+def print_weekday_stats(cube):
+    """
+    요일별 평균 속도 (큐브를 요일별로 더해서 평균(합계/개수)과 표준편차 구하기)
+    """
     print("[1] 요일별 평균 속도 분석")
-    # 요일별로 그룹을 묶어서 속도 평균 구하기
-    daily_stats = df.groupby('요일명')['평균속도'].mean().sort_values()
-    print(daily_stats)
+    daily = rollup(cube, '요일명')
+    daily_stats = mean_of(daily, '평균속도').sort_values()
+    print(pd.DataFrame({'평균속도': daily_stats, '표준편차': std_of(daily, '평균속도')}).loc[daily_stats.index].round(1))
     print(f"🐢 가장 느린 요일: {daily_stats.index[0]} ({daily_stats.iloc[0]:.1f} km/h)")
     print(f"🐇 가장 빠른 요일: {daily_stats.index[-1]} ({daily_stats.iloc[-1]:.1f} km/h)\n")
 
-    # -------------------------------------------------------
-    # 3. 그래프 그리기 (Visualizations)
-    # -------------------------------------------------------
-    os.makedirs(WEB_IMG_DIR, exist_ok=True)
 
-    # (A) 속도-밀도 관계 (Greenshields Model 검증용)
-    # 이론: 차가 많아지면(밀도 증가), 속도는 직선으로 떨어진다.
+def plot_speed_density(cube, sample, histogram, pooled, path=None):
+    """
+    (A) 속도-밀도 관계 (Greenshields Model 검증용)
+    이론: 차가 많아지면(밀도 증가), 속도는 직선으로 떨어진다.
+    """
+    from matplotlib.colors import LogNorm
+
+    path = path or os.path.join(WEB_IMG_DIR, 'speed_density.png')
+    plt = pyplot(PLOT_RC)
     plt.figure(figsize=(10, 6))
     
-    # 1. 실제 데이터 점 찍기
-    # 밀도가 너무 크거나 작은 이상치는 제외하고 그림
-    clean_df = df[(df['밀도'] > 0) & (df['밀도'] < 200)]
-    plt.scatter(clean_df['밀도'], clean_df['평균속도'], alpha=0.1, s=5, color='blue', label='실제 데이터')
+    # 1. 실제 데이터 그리기 (밀도가 너무 크거나 작은 이상치는 제외)
+    if SCATTER_MODE == 'hist2d':
+        # 칸마다 들어있는 점의 개수를 색으로 표시 (로그 스케일, 빈 칸은 투명)
+        counts, k_edges, v_edges = histogram
+        masked = np.ma.masked_equal(counts.T, 0)
+        mesh = plt.pcolormesh(k_edges, v_edges, masked, cmap='Blues',
+                              norm=LogNorm(vmin=1, vmax=max(counts.max(), 1)))
+        plt.colorbar(mesh, label='Count')
+    else:
+        # 큐브를 만들 때 뽑아둔 표본 점 찍기
+        plt.scatter(sample['밀도'], sample['평균속도'], alpha=0.1, s=5, color='blue', label='실제 데이터')
     
     # 2. 추세선 그리기 (선형 회귀: y = ax + b)
-    # polyfit(x, y, 1): 1차 함수(직선)를 찾아라
-    z = np.polyfit(clean_df['밀도'], clean_df['평균속도'], 1)
-    p = np.poly1d(z) # 함수 만들기
+    p = np.poly1d([pooled['slope'], pooled['intercept']]) # 함수 만들기
     
     # x축(밀도) 범위: 0부터 최대값까지
-    x_range = np.linspace(0, clean_df['밀도'].max(), 100)
+    x_range = np.linspace(0, cube['fit_max_k'].max(), 100)
     plt.plot(x_range, p(x_range), "r-", linewidth=2, label='Greenshields Model (추세선)')
     
     plt.title('Speed vs Density (Greenshields Model)')
@@ -80,15 +196,23 @@ def run_analysis():
     plt.ylabel('Speed (km/h)')
     plt.legend()
     plt.grid(True, alpha=0.3)
-    plt.savefig(os.path.join(WEB_IMG_DIR, 'speed_density.png'), dpi=100)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    plt.savefig(path, dpi=100)
     plt.close()
-    print("✅ 그래프 저장 완료: speed_density.png")
+    print(f"✅ 그래프 저장 완료: {os.path.basename(path)}")
+
 
-    # (B) 요일별 패턴 (막대 + 꺾은선)
+def plot_weekly_pattern(cube, path=None):
+    """
+    (B) 요일별 패턴 (막대: 교통량 + 꺾은선: 속도)
+    """
+    path = path or os.path.join(WEB_IMG_DIR, 'weekly_pattern.png')
+    plt = pyplot(PLOT_RC)
     # 요일 순서 정렬 (월화수목금토일)
-    week_order = ['월요일', '화요일', '수요일', '목요일', '금요일', '토요일', '일요일']
-    daily_vol = df.groupby('요일명')['교통량'].mean().reindex(week_order)
-    daily_spd = df.groupby('요일명')['평균속도'].mean().reindex(week_order)
+    week_order = WEEK_ORDER
+    daily = rollup(cube, '요일명')
+    daily_vol = mean_of(daily, '교통량').reindex(week_order)
+    daily_spd = mean_of(daily, '평균속도').reindex(week_order)
 
     fig, ax1 = plt.subplots(figsize=(10, 6))
     
@@ -102,36 +226,117 @@ def run_analysis():
     ax2.set_ylabel('Speed (km/h)', color='red')
     
     plt.title('Weekly Pattern (Traffic vs Speed)')
-    plt.savefig(os.path.join(WEB_IMG_DIR, 'weekly_pattern.png'), dpi=100)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    plt.savefig(path, dpi=100)
     plt.close()
-    print("✅ 그래프 저장 완료: weekly_pattern.png")
+    print(f"✅ 그래프 저장 완료: {os.path.basename(path)}")
 
-    # -------------------------------------------------------
-    # 4. 교통류 파라미터 계산 (심화 분석용)
-    # -------------------------------------------------------
-    # 추세선(y = ax + b)에서 파라미터 추출
+
+def export_results(cube, pooled, by_hour=False):
+    """
+    교통류 파라미터(전체 + 노드별) 출력 및 저장
+    - web/data/node_params.csv, node_hour_params.csv(--by-hour), analysis_result.json
+    """
+    # 추세선(y = ax + b)에서 파라미터 추출 (greenshields.py 참고)
     # b (y절편) = 자유속도 (차가 없을 때 속도)
     # -b/a (x절편) = 혼잡밀도 (속도가 0이 되는 밀도)
-    slope, intercept = z
-    
-    uf = intercept          # 자유속도 (Free Flow Speed)
-    kj = -intercept / slope # 혼잡밀도 (Jam Density)
-    q_max = (uf * kj) / 4   # 도로용량 (Capacity, 포물선의 꼭짓점)
+    uf = float(pooled['free_flow_speed'])  # 자유속도 (Free Flow Speed)
+    kj = float(pooled['jam_density'])      # 혼잡밀도 (Jam Density)
+    q_max = float(pooled['capacity'])      # 도로용량 (Capacity, 포물선의 꼭짓점)
 
     print("\n[🚦 Greenshields 모델 분석 결과]")
-    print(f"1. 자유속도(uf): {uf:.1f} km/h (차가 없을 때 예상 속도)")
-    print(f"2. 혼잡밀도(kj): {kj:.1f} 대/km (이만큼 차면 멈춤)")
-    print(f"3. 도로용량(C) : {q_max:.0f} 대/시 (최대 통행 가능량)")
+    print(f"1. 자유속도(uf): {format_ci(pooled, 'free_flow_speed', '.1f')} km/h (차가 없을 때 예상 속도)")
+    print(f"2. 혼잡밀도(kj): {format_ci(pooled, 'jam_density', '.1f')} 대/km (이만큼 차면 멈춤)")
+    print(f"3. 도로용량(C) : {format_ci(pooled, 'capacity')} 대/시 (최대 통행 가능량)")
+
+    # 노드별 Greenshields 분석 (한 번에 계산 + 칸 단위 부트스트랩 신뢰구간)
+    by_node = rollup(cube, '노드명')
+    node_stats = pd.DataFrame({
+        'rows': by_node['n'],
+        'mean_volume': mean_of(by_node, '교통량'),
+        'mean_speed': mean_of(by_node, '평균속도'),
+    })
+    node_results = node_stats.join(fit_cube(cube, ['노드명']).drop(columns=SUM_COLS))
+    print(f"\n[🗺️ 노드별 분석 결과] {len(node_results):,}개 노드 (도로용량 상위 20개)")
+    for node, row in node_results.sort_values('capacity', ascending=False).head(20).iterrows():
+        print(f"   - {node}: 자유속도 {row['free_flow_speed']:.1f} km/h, 도로용량 {format_ci(row, 'capacity')} 대/시")
 
-    # 결과를 파일로 저장 (웹사이트 연동은 안하지만 기록용)
+    os.makedirs(WEB_DATA_DIR, exist_ok=True)
+    node_results.to_csv(os.path.join(WEB_DATA_DIR, 'node_params.csv'), encoding='utf-8-sig')
+
+    # 노드 x 시간대별 추세선 (선택)
+    if by_hour:
+        hour_fits = fit_cube(cube, ['노드명', '기준시간'])
+        hour_fits.drop(columns=SUM_COLS).to_csv(
+            os.path.join(WEB_DATA_DIR, 'node_hour_params.csv'), encoding='utf-8-sig')
+        print(f"💾 노드 x 시간대 결과 저장 완료: {len(hour_fits):,}개 그룹")
+
+    # 결과를 파일로 저장 (04_assignment.py가 노드별 용량을 읽어서 씀)
     results = {
         'free_flow_speed': uf,
         'jam_density': kj,
-        'capacity': q_max
+        'capacity': q_max,
+        **{col: float(pooled[col]) for col in pooled.index if col.endswith(('_lo', '_hi'))},
+        'nodes': (node_results.dropna(subset=['capacity'])
+                  .filter(regex='^(free_flow_speed|jam_density|capacity)')
+                  .to_dict(orient='index')),
     }
-    with open(os.path.join(WEB_DATA_DIR, 'analysis_result.json'), 'w') as f:
-        json.dump(results, f, indent=4)
+    with open(os.path.join(WEB_DATA_DIR, 'analysis_result.json'), 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=4, ensure_ascii=False)
         print("💾 분석 결과 JSON 저장 완료.")
+    return results
+
+
+def run_analysis(all_nodes=False, by_hour=False):
+    print("🚀 데이터 분석을 시작합니다...")
+    loaded = load_cube(all_nodes)
+    if loaded is None:
+        return
+    cube, sample, histogram = loaded
+    print(f"📊 분석 대상 데이터: {cube['n'].sum():,}개 (큐브 {len(cube):,}칸)")
+    print_memory_report(*memory_stats(cube), title='집계 큐브 메모리')
+    print()
+
+    # -------------------------------------------------------
+    # 2. 기초 통계 분석 (Basic Statistics)
+    # -------------------------------------------------------
+    print_weekday_stats(cube)
+
+    # 전체 추세선 (모든 칸을 그룹 하나로, 칸 단위 부트스트랩으로 신뢰구간)
+    pooled = fit_cube(cube)
+
+    # -------------------------------------------------------
+    # 3. 그래프 그리기 (Visualizations)
+    # -------------------------------------------------------
+    # 두 그래프를 동시에 그리고, 데이터가 그대로인 그래프는 다시 그리지 않음
+    # (산점도 모드가 아니면 표본은 그래프에 쓰이지 않으므로 지문에서도 제외)
+    scatter_sample = sample if SCATTER_MODE != 'hist2d' else None
+    rendered = render_figures([
+        {'func': plot_speed_density, 'path': os.path.join(WEB_IMG_DIR, 'speed_density.png'),
+         'args': (cube, scatter_sample, histogram, pooled[['slope', 'intercept']])},
+        {'func': plot_weekly_pattern, 'path': os.path.join(WEB_IMG_DIR, 'weekly_pattern.png'),
+         'args': (cube,)},
+    ], max_workers=MAX_WORKERS)
+    if not rendered:
+        print("♻️ 그래프 데이터 변경 없음: 기존 그래프를 그대로 둡니다.")
+
+    # -------------------------------------------------------
+    # 4. 교통류 파라미터 계산 + 5. 노드별 Greenshields 분석
+    # -------------------------------------------------------
+    export_results(cube, pooled, by_hour=by_hour)
 
 if __name__ == "__main__":
-    run_analysis()
+    parser = argparse.ArgumentParser(description='교통 데이터 분석')
+    parser.add_argument('--all-nodes', action='store_true',
+                        help='전체 노드 데이터셋(01_data_loader.py --all-nodes 결과)을 분석')
+    parser.add_argument('--node', help='노드 하나만 조회 (예: 안현JC)')
+    parser.add_argument('--by-hour', action='store_true',
+                        help='노드 x 시간대별 추세선도 계산')
+    parser.add_argument('--bootstrap', type=int, default=N_BOOTSTRAP,
+                        help=f'부트스트랩 반복 횟수 (0이면 신뢰구간 생략, 기본 {N_BOOTSTRAP})')
+    args = parser.parse_args()
+    N_BOOTSTRAP = args.bootstrap
+    if args.node:
+        lookup_node(args.node, all_nodes=args.all_nodes)
+    else:
+        run_analysis(all_nodes=args.all_nodes, by_hour=args.by_hour)
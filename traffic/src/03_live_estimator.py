@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+"""
+03_live_estimator.py
+====================
+[기능]
+실시간으로 들어오는 VDS 기록을 받아서 Greenshields 파라미터(자유속도, 혼잡밀도, 도로용량)를
+계속 갱신하는 코드입니다. (01 -> 02를 다시 돌리지 않고 운영 대시보드에 바로 반영)
+
+[수행 과정]
+1. 입력: 표준입력(stdin)으로 CSV 줄을 받거나, 폴더를 감시하면서 새로 추가된 줄을 읽습니다.
+   - 예: tail -f vds.csv | python 03_live_estimator.py
+   - 예: python 03_live_estimator.py --watch ../VDS_live
+2. 기록 하나가 들어올 때마다 노드별 합계(n, Σk, Σv, Σk², Σkv)만 갱신합니다. (O(1))
+   - 망각 계수(--forget, 예: 0.999)를 주면 오래된 기록의 비중이 점점 줄어듭니다.
+     (기록 하나가 들어올 때마다 모든 노드의 기존 기록이 같이 줄어듦, 조용한 노드도 똑같이 잊음)
+3. 일정 개수마다 analysis_result.json과 같은 형식으로 live_result.json을 씁니다.
+"""
+
+import argparse
+import csv
+import glob
+import io
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+from greenshields import fit_from_sums
+
+# -----------------------------------------------------------------------------
+# 1. 설정 (Settings)
+# -----------------------------------------------------------------------------
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WEB_DATA_DIR = os.path.join(BASE_DIR, 'web', 'data')
+OUTPUT_PATH = os.path.join(WEB_DATA_DIR, 'live_result.json')
+
+DENSITY_RANGE = (0, 200)  # 02_analysis.py와 같은 이상치 기준
+PUBLISH_EVERY = 1000      # 이 개수의 기록마다 결과 JSON 갱신
+POLL_SECONDS = 5          # 폴더 감시 주기 (초)
+ENCODING = 'euc-kr'       # VDS 원본 파일 인코딩 (표준입력, 폴더 감시 기본값)
+REQUIRED_COLUMNS = ['노드명', '교통량', '평균속도']
+
+
+# -----------------------------------------------------------------------------
+# 2. 온라인 추정기
+# -----------------------------------------------------------------------------
+class OnlineGreenshields:
+    """
+    노드별 회귀 합계를 기록 하나씩 갱신하는 추정기
+
+    forget=1.0이면 모든 기록을 똑같이 반영(누적), 1보다 작으면 기록마다
+    (어느 노드의 기록이든) 모든 기존 합계에 forget을 곱해서 최근 기록의 비중을 높임 (지수 망각)
+    - 노드별 합계는 마지막으로 갱신한 시점만 기억하고, 그 뒤에 밀린 망각은 쓸 때 한 번에 곱함
+      그래서 기록 하나는 여전히 O(1)이고, 노드별 합계를 더하면 항상 전체 합계와 같음
+    """
+
+    def __init__(self, forget=1.0):
+        self.forget = forget
+        self.node_ids = {}                 # 노드명 -> 행 번호
+        self.sums = np.zeros((0, 5))       # 노드별 (n, Σk, Σv, Σk², Σkv), seen 시점 기준
+        self.seen = np.zeros(0, dtype=np.int64)  # 노드별 합계를 마지막으로 갱신한 시점 (records)
+        self.pooled = np.zeros(5)          # 전체 합계
+        self.records = 0
+
+    def update(self, node, k, v):
+        """
+        기록 하나 반영 (노드 하나의 합계와 전체 합계만 갱신)
+        """
+        idx = self.node_ids.get(node)
+        if idx is None:
+            idx = self.node_ids[node] = len(self.node_ids)
+            self.sums = np.vstack([self.sums, np.zeros(5)])
+            self.seen = np.append(self.seen, self.records)
+        x = np.array([1.0, k, v, k * k, k * v])
+        self.records += 1
+        self.sums[idx] = self.forget ** (self.records - self.seen[idx]) * self.sums[idx] + x
+        self.seen[idx] = self.records
+        self.pooled = self.forget * self.pooled + x
+
+    def node_sums(self):
+        """
+        지금 시점 기준 노드별 합계 (밀린 망각을 적용)
+        """
+        return self.sums * (self.forget ** (self.records - self.seen))[:, None]
+
+    def estimates(self):
+        """
+        analysis_result.json과 같은 형식의 결과 (전체 + 노드별)
+        """
+        pooled = fit_from_sums(self.pooled)
+        by_node = fit_from_sums(self.node_sums())
+        nodes = {}
+        for node, idx in self.node_ids.items():
+            if np.isnan(by_node['capacity'][idx]):
+                continue
+            nodes[node] = {c: float(by_node[c][idx])
+                           for c in ('free_flow_speed', 'jam_density', 'capacity')}
+        return {
+            'free_flow_speed': float(pooled['free_flow_speed']),
+            'jam_density': float(pooled['jam_density']),
+            'capacity': float(pooled['capacity']),
+            'nodes': nodes,
+            'records': self.records,
+            'updated_at': datetime.now().isoformat(timespec='seconds'),
+        }
+
+
+def publish(estimator, path=OUTPUT_PATH):
+    """
+    현재 추정값을 JSON으로 저장 (대시보드가 반쯤 쓰인 파일을 읽지 않도록 교체 방식)
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(estimator.estimates(), f, indent=4, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+# -----------------------------------------------------------------------------
+# 3. 입력 처리
+# -----------------------------------------------------------------------------
+def check_header(header, source):
+    """
+    필요한 컬럼이 헤더에 없으면 바로 중단 (인코딩이 틀리면 모든 줄이 조용히 버려지므로)
+    """
+    missing = [c for c in REQUIRED_COLUMNS if c not in (header or [])]
+    if missing:
+        raise ValueError(f"{source}: 헤더에 {missing} 컬럼이 없습니다 (인코딩 확인, --encoding). 헤더: {header}")
+
+
+def parse_record(row, nodes=None):
+    """
+    CSV 한 줄(dict) -> (노드명, 밀도, 속도). 쓸 수 없는 기록이면 None
+    """
+    try:
+        node = row['노드명']
+        q = float(row['교통량'].replace(',', ''))
+        v = float(row['평균속도'].replace(',', ''))
+    except (KeyError, ValueError, AttributeError):
+        return None
+    if (nodes is not None and node not in nodes) or q <= 0 or v <= 0:
+        return None
+    k = q / v  # 밀도 = 교통량 / 속도
+    if not (DENSITY_RANGE[0] < k < DENSITY_RANGE[1]):
+        return None
+    return node, k, v
+
+
+def feed(estimator, rows, nodes=None):
+    """
+    기록 묶음을 추정기에 넣고, PUBLISH_EVERY개마다 결과 저장
+    """
+    for row in rows:
+        record = parse_record(row, nodes)
+        if record is None:
+            continue
+        estimator.update(*record)
+        if estimator.records % PUBLISH_EVERY == 0:
+            publish(estimator)
+
+
+def read_stdin(estimator, nodes=None, encoding=ENCODING):
+    """
+    표준입력에서 CSV 줄을 받음 (첫 줄은 헤더, 바이트를 encoding으로 직접 해석)
+    """
+    reader = csv.DictReader(io.TextIOWrapper(sys.stdin.buffer, encoding=encoding))
+    check_header(reader.fieldnames, 'stdin')
+    feed(estimator, reader, nodes)
+
+
+def watch_directory(directory, estimator, nodes=None, encoding=ENCODING):
+    """
+    폴더 안의 CSV 파일들을 주기적으로 확인해서 새로 추가된 줄만 읽음
+    (파일별로 읽은 위치를 기억하므로 이미 읽은 줄은 다시 읽지 않음)
+    - 파일이 줄어들었거나(잘림) 다른 파일로 바뀌었으면(교체, inode 변경) 처음부터 다시 읽음
+    """
+    offsets = {}  # 파일 -> (헤더, 읽은 바이트 위치, inode)
+    print(f"👀 폴더 감시 시작: {directory} ({POLL_SECONDS}초 간격, 종료: Ctrl+C)")
+    while True:
+        for file in sorted(glob.glob(os.path.join(directory, '**', '*.csv'), recursive=True)):
+            header, offset, inode = offsets.get(file, (None, 0, None))
+            stat = os.stat(file)
+            if stat.st_size < offset or (inode is not None and stat.st_ino != inode):
+                header, offset = None, 0
+            if stat.st_size <= offset:
+                offsets[file] = (header, offset, stat.st_ino)
+                continue
+            with open(file, 'rb') as f:
+                f.seek(offset)
+                chunk = f.read()
+            # 마지막 줄이 아직 쓰이는 중일 수 있으므로 완성된 줄까지만 처리
+            end = chunk.rfind(b'\n') + 1
+            if end == 0:
+                continue
+            lines = chunk[:end].decode(encoding).splitlines()
+            if header is None:
+                header, lines = next(csv.reader([lines[0]])), lines[1:]
+                check_header(header, file)
+            feed(estimator, csv.DictReader(io.StringIO('\n'.join(lines)), fieldnames=header), nodes)
+            offsets[file] = (header, offset + end, stat.st_ino)
+        publish(estimator)
+        time.sleep(POLL_SECONDS)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='실시간 Greenshields 추정')
+    parser.add_argument('--watch', help='감시할 폴더 (없으면 표준입력에서 읽음)')
+    parser.add_argument('--forget', type=float, default=1.0,
+                        help='망각 계수 (1.0=전체 누적, 예: 0.999=최근 기록 중심)')
+    parser.add_argument('--nodes', nargs='*', help='이 노드만 반영 (예: 안현JC 도리JC)')
+    parser.add_argument('--encoding', default=ENCODING, help=f'입력 CSV 인코딩 (기본 {ENCODING})')
+    args = parser.parse_args()
+
+    estimator = OnlineGreenshields(forget=args.forget)
+    nodes = set(args.nodes) if args.nodes else None
+    try:
+        if args.watch:
+            watch_directory(args.watch, estimator, nodes, args.encoding)
+        else:
+            read_stdin(estimator, nodes, args.encoding)
+    except KeyboardInterrupt:
+        pass
+    publish(estimator)
+    print(f"💾 실시간 결과 저장: {OUTPUT_PATH} (반영된 기록 {estimator.records:,}개)")
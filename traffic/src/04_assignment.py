@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+"""
+04_assignment.py
+================
+[기능]
+02_analysis.py에서 구한 도로용량/자유속도를 이용해서, 경로가 여러 개인 도로망에
+교통량을 나눠 싣는(교통 배분) 코드입니다. 웹의 시뮬레이션(lab.html)이 이 결과 표를 읽어서 씁니다.
+
+[수행 과정]
+1. 도로망 정의: 링크(도로 구간) -> 경로(링크 묶음) -> OD(출발-도착 쌍)
+   - 링크 통행시간은 BPR 함수: t = t0 * (1 + alpha * (x / C)^beta)
+   - 링크 용량은 노드별 분석 결과(analysis_result.json의 nodes)가 있으면 그 값을 사용
+2. 사용자 균형(User Equilibrium)을 Frank-Wolfe 방법으로 풉니다.
+   - 모든 계산이 (시나리오 수 x 링크 수) 배열 연산이라 수천 개 수요 시나리오를 한 번에 풉니다.
+3. 수요별 균형 결과 표를 web/data/assignment_table.json으로 저장합니다.
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+# -----------------------------------------------------------------------------
+# 1. 설정 (Settings)
+# -----------------------------------------------------------------------------
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WEB_DATA_DIR = os.path.join(BASE_DIR, 'web', 'data')
+ANALYSIS_PATH = os.path.join(WEB_DATA_DIR, 'analysis_result.json')  # 02_analysis.py 결과
+OUTPUT_PATH = os.path.join(WEB_DATA_DIR, 'assignment_table.json')
+
+# 분석 결과가 없을 때 쓰는 기본값 (예전 분석 결과)
+DEFAULT_UF = 103.7        # 자유속도 (km/h)
+DEFAULT_CAPACITY = 1301   # 도로용량 (대/시)
+
+# BPR 함수 계수 (표준값)
+ALPHA = 0.15
+BETA = 4.0
+
+# 기본 도로망: 안현JC -> 조남JC, 단거리(A: 도리JC 경유) / 우회로(B: 일직JC 경유)
+# --network 옵션으로 같은 형식의 JSON 파일을 주면 다른 도로망도 풀 수 있음
+DEFAULT_NETWORK = {
+    'links': {
+        '안현-도리-조남': {'distance': 5.0, 'capacity_scale': 1.0, 'node': '도리JC'},
+        '안현-일직-조남': {'distance': 8.0, 'capacity_scale': 1.2, 'node': '일직JC'},  # 우회로가 조금 더 넓다고 가정
+    },
+    'paths': {
+        'A': {'od': '안현JC-조남JC', 'links': ['안현-도리-조남']},
+        'B': {'od': '안현JC-조남JC', 'links': ['안현-일직-조남']},
+    },
+}
+
+# 웹 시뮬레이션용 수요 범위 (대/시)
+DEMAND_GRID = np.arange(0, 10001, 10)
+
+MAX_ITER = 500
+TOLERANCE = 1e-6  # 상대 갭(relative gap)이 이보다 작으면 균형으로 봄
+
+
+# -----------------------------------------------------------------------------
+# 2. 도로망 배열 만들기
+# -----------------------------------------------------------------------------
+def load_flow_params(path=ANALYSIS_PATH):
+    """
+    02_analysis.py 결과에서 자유속도/도로용량을 읽음 (없으면 기본값)
+    """
+    if not os.path.exists(path):
+        return {'free_flow_speed': DEFAULT_UF, 'capacity': DEFAULT_CAPACITY, 'nodes': {}}
+    with open(path, encoding='utf-8') as f:
+        result = json.load(f)
+    result.setdefault('nodes', {})
+    return result
+
+
+def positive(value, default):
+    """
+    분석 값이 양의 유한값이면 그대로, 아니면(추세선이 반대로 나온 노드, 결측) default
+    """
+    if value is None or not np.isfinite(value) or value <= 0:
+        return default
+    return float(value)
+
+
+def build_network(network, params):
+    """
+    도로망 정의 -> 계산용 배열
+    - incidence: (경로 수, 링크 수) 0/1 행렬, 경로가 그 링크를 지나면 1
+    - path_od  : 경로별 OD 번호
+    - t0, cap  : 링크별 자유 통행시간(분), 용량(대/시)
+    - uf, capacity: 실제로 쓴 전체 자유속도/용량 (분석 값이 이상하면 기본값)
+    """
+    link_names = list(network['links'])
+    path_names = list(network['paths'])
+    od_names = list(dict.fromkeys(p['od'] for p in network['paths'].values()))
+
+    incidence = np.zeros((len(path_names), len(link_names)))
+    for i, name in enumerate(path_names):
+        for link in network['paths'][name]['links']:
+            incidence[i, link_names.index(link)] = 1.0
+    path_od = np.array([od_names.index(network['paths'][p]['od']) for p in path_names])
+
+    # 전체 값도 이상하면 기본값 (음수/무한대 t0, cap이면 균형 계산 결과가 의미 없음)
+    uf = positive(params.get('free_flow_speed'), DEFAULT_UF)
+    capacity = positive(params.get('capacity'), DEFAULT_CAPACITY)
+    t0 = np.empty(len(link_names))
+    cap = np.empty(len(link_names))
+    for j, name in enumerate(link_names):
+        link = network['links'][name]
+        # 링크에 연결된 노드의 용량이 분석되어 있고 양수이면 그 값을, 아니면 전체 값을 사용
+        node_params = params['nodes'].get(link.get('node'), {})
+        t0[j] = link['distance'] / positive(node_params.get('free_flow_speed'), uf) * 60  # 분 단위
+        cap[j] = positive(node_params.get('capacity'), capacity) * link.get('capacity_scale', 1.0)
+
+    return {
+        'link_names': link_names, 'path_names': path_names, 'od_names': od_names,
+        'incidence': incidence, 'path_od': path_od, 't0': t0, 'cap': cap,
+        'uf': uf, 'capacity': capacity,
+    }
+
+
+# -----------------------------------------------------------------------------
+# 3. 사용자 균형 (Frank-Wolfe, 시나리오 묶음 계산)
+# -----------------------------------------------------------------------------
+def bpr_time(x, t0, cap, alpha=ALPHA, beta=BETA):
+    """
+    BPR 함수: 링크 교통량 x (..., 링크 수) -> 통행시간 (분)
+    """
+    return t0 * (1 + alpha * (x / cap) ** beta)
+
+
+def all_or_nothing(path_cost, demand, path_od):
+    """
+    OD별로 가장 빠른 경로 하나에 수요를 전부 싣기 -> 경로 교통량 (시나리오 수, 경로 수)
+    """
+    flows = np.zeros_like(path_cost)
+    rows = np.arange(len(path_cost))
+    for od in range(demand.shape[1]):
+        paths = np.flatnonzero(path_od == od)
+        best = paths[np.argmin(path_cost[:, paths], axis=1)]
+        flows[rows, best] = demand[:, od]
+    return flows
+
+
+def solve_equilibrium(net, demand, max_iter=MAX_ITER, tol=TOLERANCE):
+    """
+    시나리오 여러 개의 사용자 균형을 한 번에 풂
+    - demand: (시나리오 수, OD 수) 수요 행렬
+    -> 경로 교통량, 경로 통행시간, 링크 교통량, 상대 갭, 반복 횟수
+    """
+    A, t0, cap, path_od = net['incidence'], net['t0'], net['cap'], net['path_od']
+    demand = np.atleast_2d(np.asarray(demand, dtype=np.float64))
+
+    # 시작점: 자유 통행시간 기준으로 전부 최단 경로에
+    h = all_or_nothing(np.broadcast_to(t0 @ A.T, (len(demand), len(A))).copy(), demand, path_od)
+    for it in range(1, max_iter + 1):
+        x = h @ A                      # 링크 교통량 (S, L)
+        path_cost = bpr_time(x, t0, cap) @ A.T
+        y = all_or_nothing(path_cost, demand, path_od)
+
+        # 상대 갭: 현재 총 통행시간이 최단 경로 기준 총 통행시간보다 얼마나 큰가
+        current = (h * path_cost).sum(axis=1)
+        shortest = (y * path_cost).sum(axis=1)
+        gap = np.where(current > 0, (current - shortest) / np.maximum(current, 1e-12), 0.0)
+        if np.all(gap < tol):
+            break
+
+        # 이동 방향 d = y - h, 이동 거리 lam은 이분법으로 (목적함수 기울기 = 0인 지점)
+        d = y - h
+        dx = d @ A
+        lo = np.zeros(len(h))
+        hi = np.ones(len(h))
+        for _ in range(40):
+            mid = (lo + hi) / 2
+            slope = (dx * bpr_time(x + mid[:, None] * dx, t0, cap)).sum(axis=1)
+            hi = np.where(slope > 0, mid, hi)
+            lo = np.where(slope > 0, lo, mid)
+        h = h + ((lo + hi) / 2)[:, None] * d
+
+    x = h @ A
+    path_cost = bpr_time(x, t0, cap) @ A.T
+    return {'path_flow': h, 'path_time': path_cost, 'link_flow': x, 'gap': gap, 'iterations': it}
+
+
+# -----------------------------------------------------------------------------
+# 4. 웹 시뮬레이션용 결과 표
+# -----------------------------------------------------------------------------
+def run_assignment(network=None, demands=DEMAND_GRID):
+    print("🚀 교통 배분(사용자 균형) 계산을 시작합니다...")
+    params = load_flow_params()
+    net = build_network(network or DEFAULT_NETWORK, params)
+    print(f"🛣️ 링크 {len(net['link_names'])}개, 경로 {len(net['path_names'])}개, "
+          f"OD {len(net['od_names'])}개, 수요 시나리오 {len(demands):,}개")
+
+    # 모든 OD에 같은 총수요를 싣는 시나리오 (OD가 여럿이면 JSON 도로망에서 따로 지정 가능)
+    demand = np.repeat(np.asarray(demands, dtype=np.float64)[:, None], len(net['od_names']), axis=1)
+
+    start = time.perf_counter()
+    result = solve_equilibrium(net, demand)
+    elapsed = time.perf_counter() - start
+    print(f"✅ 계산 완료: {elapsed:.2f}초, 반복 {result['iterations']}회, 최대 상대 갭 {result['gap'].max():.1e}")
+
+    total_time = (result['link_flow'] * bpr_time(result['link_flow'], net['t0'], net['cap'])).sum(axis=1)
+    table = {
+        'params': {
+            'uf': net['uf'],
+            'capacity': net['capacity'],
+            'alpha': ALPHA,
+            'beta': BETA,
+        },
+        'routes': {
+            name: {
+                'od': net['od_names'][net['path_od'][i]],
+                't0': float(net['t0'] @ net['incidence'][i]),
+                'capacity': float(net['cap'][net['incidence'][i] > 0].min()),
+            }
+            for i, name in enumerate(net['path_names'])
+        },
+        'demand': [float(q) for q in demands],
+        'flow': {name: np.round(result['path_flow'][:, i], 1).tolist()
+                 for i, name in enumerate(net['path_names'])},
+        'time': {name: np.round(result['path_time'][:, i], 2).tolist()
+                 for i, name in enumerate(net['path_names'])},
+        'total_system_time': np.round(total_time, 1).tolist(),
+    }
+
+    os.makedirs(WEB_DATA_DIR, exist_ok=True)
+    with open(OUTPUT_PATH, 'w', encoding='utf-8') as f:
+        json.dump(table, f, ensure_ascii=False)
+    print(f"💾 결과 표 저장: {OUTPUT_PATH}")
+
+    # 예시 출력: 웹 시뮬레이터 기본값(3,000대)
+    i = int(np.argmin(np.abs(np.asarray(demands) - 3000)))
+    print(f"\n[⚖️ 사용자 균형 예시] 총 교통량 {demands[i]:,.0f}대/시")
+    for j, name in enumerate(net['path_names']):
+        print(f"   - 경로 {name}: {result['path_flow'][i, j]:,.0f}대, {result['path_time'][i, j]:.1f}분")
+    return table
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='교통 배분 (사용자 균형)')
+    parser.add_argument('--network', help='도로망 정의 JSON 파일 (없으면 기본 2경로 도로망)')
+    args = parser.parse_args()
+
+    network = None
+    if args.network:
+        with open(args.network, encoding='utf-8') as f:
+            network = json.load(f)
+    run_assignment(network)
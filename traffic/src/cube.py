@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+cube.py
+=======
+[기능]
+02_analysis.py의 모든 통계/그래프/JSON이 공통으로 쓰는 집계 큐브입니다.
+
+[내용]
+1. 원본 데이터를 한 번만 훑어서 노드 x 요일 x 시간대 칸마다
+   개수, 합계, 제곱합(교통량/평균속도/밀도)을 모읍니다.
+   - 평균 = 합계 / 개수, 분산 = 제곱합 / 개수 - 평균² 이므로 어떤 묶음의 통계든 칸을 더해서 구함
+2. 추세선용 합계(이상치를 뺀 행의 n, Σk, Σv, Σk², Σkv), 속도-밀도 2차원 히스토그램,
+   산점도용 표본도 같은 패스에서 모읍니다.
+3. 결과는 디스크에 저장하고, 데이터셋이 바뀌지 않았으면 다음 실행 때 원본을 읽지 않고 재사용합니다.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from greenshields import SUM_COLS, row_sums
+from vds_schema import WEEKDAY_DTYPE, memory_stats, print_memory_report, read_dataset
+
+CUBE_DIMS = ['노드명', '요일명', '기준시간']
+MEASURES = ['교통량', '평균속도', '밀도']
+RAW_COLS = CUBE_DIMS + MEASURES
+FIT_COLS = [f'fit_{c}' for c in SUM_COLS]  # 추세선용 합계 (이상치 제외 행)
+SAMPLE_SIZE = 50_000                        # 산점도용 표본 크기
+HIST_BINS = (200, 160)                      # 속도-밀도 히스토그램 칸 수 (밀도, 속도)
+SPEED_RANGE = (0, 160)                      # 히스토그램 속도 축 범위 (km/h)
+CUBE_VERSION = 2                            # 큐브 구성이 바뀌면 올려서 캐시 무효화
+
+
+# -----------------------------------------------------------------------------
+# 1. 큐브 만들기 (원본 한 번 훑기)
+# -----------------------------------------------------------------------------
+def build_cube(df, density_range):
+    """
+    원본 행 -> (노드명, 요일명, 기준시간) 칸별 개수/합계/제곱합 + 추세선용 합계
+    """
+    lo, hi = density_range
+    clean = ((df['밀도'] > lo) & (df['밀도'] < hi)).to_numpy()
+
+    values = {'n': np.ones(len(df))}
+    for col in MEASURES:
+        x = df[col].to_numpy(dtype=np.float64)
+        values[f'{col}_sum'] = x
+        values[f'{col}_sumsq'] = x * x
+    fit = row_sums(df['밀도'], df['평균속도']) * clean[:, None]
+    for j, col in enumerate(FIT_COLS):
+        values[col] = fit[:, j]
+    values['fit_max_k'] = np.where(clean, df['밀도'].to_numpy(dtype=np.float64), 0.0)
+
+    parts = pd.DataFrame(values, index=df.index)
+    for dim in CUBE_DIMS:
+        parts[dim] = df[dim]
+    grouped = parts.groupby(CUBE_DIMS, observed=True, sort=True)
+    cube = grouped.sum().drop(columns='fit_max_k')
+    cube['fit_max_k'] = grouped['fit_max_k'].max()
+    cube['n'] = cube['n'].astype(np.int64)
+    return cube
+
+
+def sample_points(df, density_range, size=SAMPLE_SIZE, seed=42):
+    """
+    산점도용 표본 (이상치 제외 행 중 최대 size개)
+    """
+    lo, hi = density_range
+    clean = df.loc[(df['밀도'] > lo) & (df['밀도'] < hi), ['밀도', '평균속도']]
+    if len(clean) > size:
+        clean = clean.sample(size, random_state=seed)
+    return clean.reset_index(drop=True)
+
+
+def density_histogram(df, density_range, bins=HIST_BINS, speed_range=SPEED_RANGE):
+    """
+    이상치 제외 행의 (밀도, 평균속도) 2차원 히스토그램 -> (개수 배열, 밀도 경계, 속도 경계)
+    - 행이 몇 개든 결과 크기는 bins로 고정이라 그래프 그리는 시간/파일 크기가 일정함
+    """
+    counts, k_edges, v_edges = np.histogram2d(
+        df['밀도'].to_numpy(dtype=np.float64), df['평균속도'].to_numpy(dtype=np.float64),
+        bins=bins, range=[density_range, speed_range])
+    return counts, k_edges, v_edges
+
+
+# -----------------------------------------------------------------------------
+# 2. 캐시 (데이터셋 지문이 같으면 재사용)
+# -----------------------------------------------------------------------------
+def dataset_fingerprint(data_dir, filters, density_range):
+    """
+    데이터셋 조각 파일들의 (경로, 크기, 수정시각) + 분석 설정으로 만든 지문
+    (파일 내용을 읽지 않고 stat만 하므로 빠름)
+    """
+    h = hashlib.sha256()
+    h.update(json.dumps([CUBE_VERSION, repr(filters), list(density_range)]).encode('utf-8'))
+    for root, dirs, files in os.walk(data_dir):
+        dirs.sort()
+        for name in sorted(files):
+            if not name.endswith('.parquet'):
+                continue
+            path = os.path.join(root, name)
+            stat = os.stat(path)
+            h.update(f'{os.path.relpath(path, data_dir)}|{stat.st_size}|{stat.st_mtime_ns}\n'.encode('utf-8'))
+    return h.hexdigest()
+
+
+def load_or_build_cube(data_dir, cache_dir, filters=None, density_range=(0, 200)):
+    """
+    캐시된 큐브가 현재 데이터셋과 같으면 그대로 읽고, 아니면 원본을 한 번 훑어서 새로 만듦
+    -> (큐브, 산점도 표본, 히스토그램(개수, 밀도 경계, 속도 경계), 캐시 사용 여부)
+    """
+    fingerprint = dataset_fingerprint(data_dir, filters, density_range)
+    meta_path = os.path.join(cache_dir, 'cube_meta.json')
+    cube_path = os.path.join(cache_dir, 'cube.parquet')
+    sample_path = os.path.join(cache_dir, 'sample.parquet')
+    hist_path = os.path.join(cache_dir, 'density_hist.npz')
+
+    if os.path.exists(meta_path):
+        with open(meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('fingerprint') == fingerprint:
+            cube = pd.read_parquet(cube_path)
+            cube = cube.reset_index()
+            cube['요일명'] = cube['요일명'].astype(WEEKDAY_DTYPE)
+            cube = cube.set_index(CUBE_DIMS)
+            with np.load(hist_path) as hist:
+                histogram = (hist['counts'], hist['k_edges'], hist['v_edges'])
+            return cube, pd.read_parquet(sample_path), histogram, True
+
+    df = read_dataset(data_dir, columns=RAW_COLS, filters=filters)
+    print(f"📊 원본 데이터: {len(df):,}개 (집계 큐브를 새로 만듭니다)")
+    print_memory_report(*memory_stats(df), title='원본 데이터 메모리')
+    cube = build_cube(df, density_range)
+    sample = sample_points(df, density_range)
+    histogram = density_histogram(df, density_range)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    cube.to_parquet(cube_path)
+    sample.to_parquet(sample_path, index=False)
+    np.savez_compressed(hist_path, counts=histogram[0], k_edges=histogram[1], v_edges=histogram[2])
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump({'fingerprint': fingerprint, 'rows': len(df), 'cells': len(cube)}, f)
+    return cube, sample, histogram, False
+
+
+# -----------------------------------------------------------------------------
+# 3. 큐브에서 통계 꺼내기
+# -----------------------------------------------------------------------------
+def rollup(cube, by):
+    """
+    큐브의 칸들을 by 기준으로 더함 (예: by='요일명' -> 요일별 합계, fit_max_k만 최댓값)
+    """
+    how = {col: ('max' if col == 'fit_max_k' else 'sum') for col in cube.columns}
+    return cube.groupby(level=by, observed=True).agg(how)
+
+
+def mean_of(sums, col):
+    """
+    합계 표에서 평균 (합계 / 개수)
+    """
+    return sums[f'{col}_sum'] / sums['n']
+
+
+def std_of(sums, col):
+    """
+    합계 표에서 표준편차 (제곱합 / 개수 - 평균²의 제곱근)
+    """
+    mean = mean_of(sums, col)
+    return np.sqrt(np.maximum(sums[f'{col}_sumsq'] / sums['n'] - mean ** 2, 0))
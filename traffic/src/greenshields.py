@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+greenshields.py
+===============
+[기능]
+여러 그룹(노드, 노드 x 시간대)의 Greenshields 추세선을 한 번에 구하는 계산 모듈입니다.
+
+[원리]
+직선 속도 = a * 밀도 + b 의 최소제곱 해는 그룹별 합계 5개만 있으면 바로 나옵니다.
+   n, Σk, Σv, Σk², Σkv   (k: 밀도, v: 속도)
+   a = (nΣkv - ΣkΣv) / (nΣk² - (Σk)²),   b = (Σv - aΣk) / n
+그래서 그룹마다 polyfit을 부르는 대신, 합계를 bincount로 한 번에 모으고 배열 연산으로 끝냅니다.
+
+[신뢰구간]
+부트스트랩: 각 표본 단위에 포아송(1) 가중치를 주고 가중 합계로 다시 추세선을 구하는 것을 여러 번 반복합니다.
+(다시 뽑지 않고 가중치만 바꾸므로 그룹이 몇 개든 반복 한 번이 bincount 5번입니다.)
+- 표본 단위는 행 하나일 수도 있고, 집계 큐브의 칸(노드 x 요일 x 시간대) 하나일 수도 있습니다.
+  칸 단위로 하면 원본 행 없이 큐브의 합계만으로 신뢰구간을 구할 수 있습니다.
+"""
+
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+SUM_COLS = ['n', 'sum_k', 'sum_v', 'sum_kk', 'sum_kv']
+PARAM_COLS = ['free_flow_speed', 'jam_density', 'capacity']
+
+
+def row_sums(k, v):
+    """
+    행 하나하나를 표본 단위로 본 합계 (1, k, v, k², kv) -> 배열 (행 수, 5)
+    """
+    k = np.asarray(k, dtype=np.float64)
+    v = np.asarray(v, dtype=np.float64)
+    return np.stack([np.ones_like(k), k, v, k * k, k * v], axis=-1)
+
+
+def group_sums(codes, n_groups, unit_sums, weights=None):
+    """
+    표본 단위별 합계(unit_sums, (단위 수, 5))를 그룹 번호(codes)별로 더함 -> 배열 (n_groups, 5)
+    """
+    w = 1.0 if weights is None else weights[:, None]
+    weighted = unit_sums * w
+    return np.stack([np.bincount(codes, weights=weighted[:, j], minlength=n_groups)
+                     for j in range(unit_sums.shape[1])], axis=-1)
+
+
+def fit_from_sums(sums):
+    """
+    합계 배열 (..., 5)에서 그룹별 추세선과 Greenshields 파라미터를 한 번에 계산
+    - 점이 2개 미만이거나 밀도가 한 값뿐인 그룹은 NaN
+    """
+    n, sk, sv, skk, skv = np.moveaxis(np.asarray(sums, dtype=np.float64), -1, 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        denom = n * skk - sk * sk
+        slope = np.where((n >= 2) & (denom > 0), (n * skv - sk * sv) / denom, np.nan)
+        intercept = (sv - slope * sk) / n
+        uf = intercept          # 자유속도 (y절편)
+        kj = -intercept / slope  # 혼잡밀도 (x절편)
+        capacity = uf * kj / 4  # 도로용량 (포물선의 꼭짓점)
+    return {
+        'slope': slope,
+        'intercept': intercept,
+        'free_flow_speed': uf,
+        'jam_density': kj,
+        'capacity': capacity,
+    }
+
+
+def fit_groups(df, by, n_boot=0, level=0.95, max_workers=None):
+    """
+    데이터프레임을 by 컬럼으로 묶어서 그룹별 추세선을 한 번에 구함
+    (밀도/평균속도 컬럼 사용) -> 그룹별 합계(SUM_COLS) + 파라미터 표
+    - n_boot > 0 이면 파라미터별 신뢰구간(<파라미터>_lo, <파라미터>_hi)도 추가
+    """
+    return fit_units(df, by, row_sums(df['밀도'], df['평균속도']),
+                     n_boot=n_boot, level=level, max_workers=max_workers)
+
+
+def fit_units(df, by, unit_sums, n_boot=0, level=0.95, max_workers=None):
+    """
+    표본 단위(df의 각 행)별 합계 unit_sums를 by 컬럼으로 묶어서 그룹별 추세선을 구함
+    - 원본 행이면 row_sums, 집계 큐브의 칸이면 큐브의 합계 컬럼을 넘김
+    """
+    grouper = df.groupby(by, observed=True, sort=True)
+    codes = grouper.ngroup().to_numpy()
+    unit_sums = np.asarray(unit_sums, dtype=np.float64)
+    sums = group_sums(codes, grouper.ngroups, unit_sums)
+    result = pd.DataFrame(sums, columns=SUM_COLS, index=grouper.size().index)
+    result['n'] = result['n'].astype(np.int64)
+    result = result.assign(**fit_from_sums(sums))
+
+    if n_boot > 0:
+        ci = bootstrap_ci(codes, grouper.ngroups, unit_sums,
+                          n_boot=n_boot, level=level, max_workers=max_workers)
+        for col, (lower, upper) in ci.items():
+            result[f'{col}_lo'] = lower
+            result[f'{col}_hi'] = upper
+    return result
+
+
+def _bootstrap_batch(codes, n_groups, unit_sums, n_boot, seed):
+    """
+    부트스트랩 n_boot번 (프로세스 풀의 작업 단위) -> 배열 (n_boot, n_groups, 3)
+    """
+    rng = np.random.default_rng(seed)
+    out = np.empty((n_boot, n_groups, len(PARAM_COLS)))
+    for b in range(n_boot):
+        weights = rng.poisson(1.0, size=len(unit_sums)).astype(np.float64)
+        params = fit_from_sums(group_sums(codes, n_groups, unit_sums, weights))
+        out[b] = np.stack([params[c] for c in PARAM_COLS], axis=-1)
+    return out
+
+
+def bootstrap_ci(codes, n_groups, unit_sums, n_boot=200, level=0.95, seed=42, max_workers=None):
+    """
+    그룹별 Greenshields 파라미터의 부트스트랩 신뢰구간 (여러 CPU 코어에서 나눠 계산)
+    -> {'capacity': (하한 배열, 상한 배열), ...}
+    """
+    codes = np.asarray(codes)
+    unit_sums = np.asarray(unit_sums, dtype=np.float64)
+
+    # 반복 횟수를 작업자 수만큼 나누고, 작업마다 서로 다른 난수 씨앗을 줌
+    workers = max(1, min(max_workers or 1, n_boot))
+    batches = np.array_split(np.arange(n_boot), workers)
+    seeds = np.random.SeedSequence(seed).spawn(len(batches))
+    if workers == 1:
+        samples = _bootstrap_batch(codes, n_groups, unit_sums, n_boot, seeds[0])
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_bootstrap_batch, codes, n_groups, unit_sums, len(batch), s)
+                       for batch, s in zip(batches, seeds)]
+            samples = np.concatenate([future.result() for future in futures])
+
+    tail = (1 - level) / 2 * 100
+    with warnings.catch_warnings():
+        # 추세선을 못 구한 그룹(전부 NaN)은 신뢰구간도 NaN으로 둠
+        warnings.simplefilter('ignore', RuntimeWarning)
+        lower, upper = np.nanpercentile(samples, [tail, 100 - tail], axis=0)
+    return {c: (lower[:, i], upper[:, i]) for i, c in enumerate(PARAM_COLS)}
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+node_index.py
+=============
+[기능]
+노드(JC/IC) 단위로 데이터를 빨리 찾기 위한 색인(index)입니다.
+
+[내용]
+- 노드명 -> (Parquet 조각 파일 목록, 행 수)
+- 데이터셋이 노드명으로 파티션되어 있으므로 파일 메타데이터만 보고 만듦 (데이터는 읽지 않음)
+- 노드 하나를 조회할 때 그 노드의 파일만 읽음
+"""
+
+import json
+import os
+from urllib.parse import unquote
+
+import pyarrow.parquet as pq
+
+from vds_schema import read_dataset
+
+INDEX_NAME = '_node_index.json'  # '_'로 시작하는 파일은 Parquet 읽기에서 무시됨
+
+
+def build_node_index(dataset_dir):
+    """
+    데이터셋 폴더를 훑어서 노드별 조각 파일 목록과 행 수를 기록 (dataset_dir/_node_index.json)
+    """
+    dataset = pq.ParquetDataset(dataset_dir)
+    index = {}
+    for fragment in dataset.fragments:
+        # 경로 예: .../노드명=안현JC/기준일=2024-01-01/xxxx-0.parquet
+        rel = os.path.relpath(fragment.path, dataset_dir)
+        node = None
+        for part in rel.split(os.sep):
+            if part.startswith('노드명='):
+                node = part[len('노드명='):]
+        if node is None:
+            continue
+        node = unquote(node)
+        entry = index.setdefault(node, {'rows': 0, 'files': []})
+        entry['rows'] += fragment.metadata.num_rows
+        entry['files'].append(rel)
+
+    index = dict(sorted(index.items()))
+    with open(os.path.join(dataset_dir, INDEX_NAME), 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+    return index
+
+
+def load_node_index(dataset_dir):
+    """
+    저장된 노드 색인을 읽음 (없으면 새로 만듦)
+    """
+    path = os.path.join(dataset_dir, INDEX_NAME)
+    if not os.path.exists(path):
+        return build_node_index(dataset_dir)
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_node(dataset_dir, node, columns=None, filters=None, index=None):
+    """
+    노드 하나의 데이터만 읽기 (색인에 적힌 그 노드의 조각 파일만 열어봄)
+    """
+    index = index if index is not None else load_node_index(dataset_dir)
+    if node not in index:
+        raise KeyError(f"색인에 없는 노드입니다: {node}")
+    files = [os.path.join(dataset_dir, rel) for rel in index[node]['files']]
+    # 조각 파일 목록을 직접 넘기면 나머지 파티션은 건드리지 않음
+    return read_dataset(files, columns=columns, filters=filters)
+
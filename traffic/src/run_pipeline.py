@@ -0,0 +1,334 @@
+# -*- coding: utf-8 -*-
+"""
+run_pipeline.py
+===============
+[기능]
+01 -> 02 -> 04 스크립트를 "앞 단계를 먼저 실행" 약속 대신 단계(stage) 정의로 묶어서 돌리는 실행기입니다.
+입력이 바뀐 단계만 다시 실행하므로, 새 VDS 데이터가 없는 날의 야간 작업은 아무것도 하지 않고 끝납니다.
+
+[수행 과정]
+1. 단계마다 입력 파일과 출력 파일을 선언합니다.
+   원본 VDS -> 전처리 데이터셋 -> 집계 큐브 -> 그래프/JSON -> 교통 배분 표
+   (단계의 코드 파일과 설정도 입력에 포함되므로 코드가 바뀌어도 다시 실행)
+2. 입력/출력 파일의 내용 해시(SHA-256)로 단계의 지문을 만들고 pipeline_state.json에 기록합니다.
+   - 크기/수정시각이 기록과 같은 파일은 해시를 다시 계산하지 않음 (원본 전체를 매번 읽지 않도록)
+   - 입력 지문이 그대로이고 출력도 기록된 그대로 남아 있으면 그 단계는 건너뜀
+3. 앞 단계가 끝나서 실행할 수 있게 된 단계들(예: 그래프 두 개와 결과 JSON)은 여러 프로세스에서 동시에 실행합니다.
+
+[사용법]
+   python run_pipeline.py               # 바뀐 단계만 실행
+   python run_pipeline.py --dry-run     # 실행할 단계만 출력
+   python run_pipeline.py --force       # 모든 단계 다시 실행
+   python run_pipeline.py --full        # 원본 전체 재처리 (01_data_loader.py --full), 뒤 단계는 출력이 바뀐 경우만
+"""
+
+import argparse
+import glob
+import hashlib
+import importlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# -----------------------------------------------------------------------------
+# 1. 설정 (Settings)
+# -----------------------------------------------------------------------------
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(SRC_DIR)
+RAW_DATA_GLOB = os.path.join(BASE_DIR, 'VDS_*', '*')  # 01_data_loader.py가 읽는 원본 파일
+PROCESSED_DIR = os.path.join(BASE_DIR, 'data', 'processed')
+CACHE_DIR = os.path.join(PROCESSED_DIR, 'cache')       # 02_analysis.py의 집계 큐브 저장 위치
+WEB_DIR = os.path.join(BASE_DIR, 'web')
+WEB_DATA_DIR = os.path.join(WEB_DIR, 'data')
+STATE_PATH = os.path.join(PROCESSED_DIR, 'pipeline_state.json')
+RENDER_CODE = os.path.join(os.path.dirname(BASE_DIR), 'common', 'render.py')  # 그래프 모듈
+
+# 동시에 실행할 단계 수
+MAX_WORKERS = os.cpu_count() or 1
+
+CUBE_FILES = ['cube.parquet', 'sample.parquet', 'density_hist.npz', 'cube_meta.json']
+
+
+# -----------------------------------------------------------------------------
+# 2. 단계 실행 함수 (프로세스 풀에서 부를 수 있도록 모듈 최상위 함수)
+# -----------------------------------------------------------------------------
+def _module(name):
+    # 01_data_loader.py처럼 숫자로 시작하는 스크립트도 모듈로 불러옴
+    return importlib.import_module(name)
+
+
+def run_ingest(opts):
+    _module('01_data_loader').load_and_process(full=opts['full'], all_nodes=opts['all_nodes'])
+
+
+def run_cube(opts):
+    analysis = _module('02_analysis')
+    if analysis.load_cube(opts['all_nodes']) is None:
+        raise RuntimeError('전처리된 데이터셋이 없습니다.')
+
+
+def run_speed_density(opts):
+    analysis = _module('02_analysis')
+    cube, sample, histogram = analysis.load_cube(opts['all_nodes'])
+    # 그래프에는 추세선만 필요하므로 신뢰구간은 계산하지 않음
+    analysis.plot_speed_density(cube, sample, histogram, analysis.fit_cube(cube, n_boot=0))
+
+
+def run_weekly_pattern(opts):
+    analysis = _module('02_analysis')
+    cube, _, _ = analysis.load_cube(opts['all_nodes'])
+    analysis.plot_weekly_pattern(cube)
+
+
+def run_results(opts):
+    analysis = _module('02_analysis')
+    analysis.N_BOOTSTRAP = opts['bootstrap']
+    cube, _, _ = analysis.load_cube(opts['all_nodes'])
+    analysis.print_weekday_stats(cube)
+    analysis.export_results(cube, analysis.fit_cube(cube), by_hour=opts['by_hour'])
+
+
+def run_assignment(opts):
+    _module('04_assignment').run_assignment()
+
+
+# -----------------------------------------------------------------------------
+# 3. 단계 정의 (입력 -> 출력)
+# -----------------------------------------------------------------------------
+def define_stages(opts):
+    """
+    단계 목록 (앞에서부터 의존 순서)
+    - inputs/outputs: 파일 또는 폴더 경로 (폴더는 안의 모든 파일), glob 패턴 가능
+    - code: 단계의 결과를 바꾸는 소스 파일 (src 폴더 기준 또는 절대 경로)
+    - config: 결과를 바꾸는 실행 옵션
+    - force: 입력이 그대로여도 실행 (지문에는 넣지 않음)
+    """
+    dataset = 'all_nodes_dataset' if opts['all_nodes'] else 'jc_dataset'
+    manifest = 'all_nodes_manifest.json' if opts['all_nodes'] else 'manifest.json'
+    dataset_dir = os.path.join(PROCESSED_DIR, dataset)
+    cube_files = [os.path.join(CACHE_DIR, dataset, name) for name in CUBE_FILES]
+    analysis_code = ['02_analysis.py', 'cube.py', 'greenshields.py', 'vds_schema.py', RENDER_CODE]
+    analysis_json = os.path.join(WEB_DATA_DIR, 'analysis_result.json')
+
+    result_outputs = [analysis_json, os.path.join(WEB_DATA_DIR, 'node_params.csv')]
+    if opts['by_hour']:
+        result_outputs.append(os.path.join(WEB_DATA_DIR, 'node_hour_params.csv'))
+
+    return [
+        {'name': 'ingest', 'run': run_ingest,
+         'inputs': [RAW_DATA_GLOB],
+         'outputs': [dataset_dir, os.path.join(PROCESSED_DIR, manifest)],
+         'code': ['01_data_loader.py', 'vds_schema.py', 'node_index.py'],
+         'config': [opts['all_nodes']],
+         'force': opts['full']},
+        {'name': 'cube', 'run': run_cube,
+         'inputs': [dataset_dir],
+         'outputs': cube_files,
+         'code': analysis_code,
+         'config': [opts['all_nodes']]},
+        {'name': 'speed_density', 'run': run_speed_density,
+         'inputs': cube_files,
+         'outputs': [os.path.join(WEB_DIR, 'speed_density.png')],
+         'code': analysis_code},
+        {'name': 'weekly_pattern', 'run': run_weekly_pattern,
+         'inputs': cube_files,
+         'outputs': [os.path.join(WEB_DIR, 'weekly_pattern.png')],
+         'code': analysis_code},
+        {'name': 'results', 'run': run_results,
+         'inputs': cube_files,
+         'outputs': result_outputs,
+         'code': analysis_code,
+         'config': [opts['by_hour'], opts['bootstrap']]},
+        {'name': 'assignment', 'run': run_assignment,
+         'inputs': [analysis_json],
+         'outputs': [os.path.join(WEB_DATA_DIR, 'assignment_table.json')],
+         'code': ['04_assignment.py']},
+    ]
+
+
+# -----------------------------------------------------------------------------
+# 4. 내용 해시 지문
+# -----------------------------------------------------------------------------
+def expand_paths(patterns):
+    """
+    경로/glob 패턴/폴더 -> 실제 파일 목록 (정렬, 중복 제거)
+    """
+    files = set()
+    for pattern in patterns:
+        for path in glob.glob(pattern):
+            if os.path.isdir(path):
+                for root, dirs, names in os.walk(path):
+                    files.update(os.path.join(root, name) for name in names
+                                 if not name.endswith('.tmp'))
+            else:
+                files.add(path)
+    return sorted(files)
+
+
+def file_digest(path, file_cache):
+    """
+    파일 내용의 SHA-256 (크기/수정시각이 기록과 같으면 기록된 해시를 그대로 사용)
+    """
+    stat = os.stat(path)
+    cached = file_cache.get(path)
+    if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+        return cached[2]
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    file_cache[path] = [stat.st_size, stat.st_mtime_ns, h.hexdigest()]
+    return file_cache[path][2]
+
+
+def fingerprint(paths, file_cache, extra=None):
+    """
+    파일 목록(경로 + 내용 해시) + 추가 값으로 만든 지문 (파일이 하나도 없으면 None)
+    """
+    files = expand_paths(paths)
+    if not files:
+        return None
+    h = hashlib.sha256(json.dumps(extra, ensure_ascii=False).encode('utf-8'))
+    for path in files:
+        h.update(f'{os.path.relpath(path, BASE_DIR)}|{file_digest(path, file_cache)}\n'.encode('utf-8'))
+    return h.hexdigest()
+
+
+def stage_inputs(stage, file_cache):
+    code = [os.path.join(SRC_DIR, name) for name in stage['code']]
+    return fingerprint(stage['inputs'] + code, file_cache, extra=stage.get('config'))
+
+
+def load_state(path=STATE_PATH):
+    if not os.path.exists(path):
+        return {'files': {}, 'stages': {}}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_state(state, path=STATE_PATH):
+    # 중간에 끊겨도 깨진 파일이 남지 않도록 임시 파일에 쓴 뒤 교체
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+# -----------------------------------------------------------------------------
+# 5. 실행
+# -----------------------------------------------------------------------------
+def needs_run(stage, state, file_cache, force=False):
+    """
+    단계를 다시 실행해야 하는지 -> (실행 여부, 이유)
+    """
+    record = state['stages'].get(stage['name'])
+    if force:
+        return True, '강제 실행'
+    if stage.get('force'):
+        return True, '전체 재처리'
+    if record is None:
+        return True, '실행 기록 없음'
+    if record['inputs'] != stage_inputs(stage, file_cache):
+        return True, '입력 변경'
+    if any(not glob.glob(path) for path in stage['outputs']):
+        return True, '출력 없음'
+    if record['outputs'] != fingerprint(stage['outputs'], file_cache):
+        return True, '출력 변경'
+    return False, '변경 없음'
+
+
+def run_pipeline(all_nodes=False, by_hour=False, bootstrap=200, force=False, dry_run=False, full=False):
+    """
+    바뀐 단계만 실행 -> 실제로 다시 실행한 단계 이름 집합
+    - force: 모든 단계 다시 실행, full: ingest 단계만 원본 전체 재처리로 다시 실행
+    """
+    print("🚀 파이프라인 실행을 시작합니다...")
+    opts = {'all_nodes': all_nodes, 'by_hour': by_hour, 'bootstrap': bootstrap, 'full': full}
+    stages = define_stages(opts)
+    state = load_state()
+    file_cache = state['files']
+
+    # 단계 사이의 의존 관계: 앞 단계의 출력을 입력으로 쓰면 그 단계 뒤에 실행
+    producers = {}
+    deps = {}
+    for stage in stages:
+        deps[stage['name']] = {producers[path] for path in stage['inputs'] if path in producers}
+        producers.update({path: stage['name'] for path in stage['outputs']})
+
+    done = set()     # 끝난 단계 (실행했거나 건너뜀)
+    changed = set()  # 실제로 다시 실행한 단계
+    ran = 0
+    start = time.perf_counter()
+    while len(done) < len(stages):
+        ready = [s for s in stages if s['name'] not in done and deps[s['name']] <= done]
+        if not ready:
+            break
+
+        todo = []
+        for stage in ready:
+            # 앞 단계가 다시 실행됐어도 출력 내용이 그대로면 입력 지문도 그대로라서 건너뜀
+            run, reason = needs_run(stage, state, file_cache, force=force)
+            if dry_run and not run and deps[stage['name']] & changed:
+                run, reason = True, '앞 단계 실행 예정'
+            if run:
+                print(f"▶️ {stage['name']}: {reason}")
+                todo.append(stage)
+            else:
+                print(f"⏭️ {stage['name']}: {reason}, 건너뜀")
+                done.add(stage['name'])
+        if dry_run:
+            # 실제로 실행하지 않으므로 뒤 단계는 앞 단계가 바뀐다고 가정하고 표시
+            done.update(s['name'] for s in ready)
+            changed.update(s['name'] for s in todo)
+            continue
+
+        # 준비된 단계가 여러 개면 프로세스를 나눠서 동시에 실행
+        if len(todo) == 1:
+            todo[0]['run'](opts)
+        elif todo:
+            with ProcessPoolExecutor(max_workers=min(MAX_WORKERS, len(todo))) as executor:
+                futures = [executor.submit(s['run'], opts) for s in todo]
+                for future in futures:
+                    future.result()
+
+        # 실행한 단계의 입력/출력 지문 기록 (출력 파일이 바뀐 경우 해시를 새로 계산)
+        for stage in todo:
+            state['stages'][stage['name']] = {
+                'inputs': stage_inputs(stage, file_cache),
+                'outputs': fingerprint(stage['outputs'], file_cache),
+                'finished_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            }
+            done.add(stage['name'])
+            changed.add(stage['name'])
+        ran += len(todo)
+        save_state(state)
+
+    elapsed = time.perf_counter() - start
+    print("-" * 50)
+    if dry_run:
+        print(f"📝 실행 예정 단계: {', '.join(sorted(changed)) or '없음'}")
+    elif ran == 0:
+        print(f"✅ 바뀐 입력이 없어 실행한 단계가 없습니다. ({elapsed:.1f}초)")
+    else:
+        print(f"✅ 파이프라인 완료: {ran}개 단계 실행 ({elapsed:.1f}초)")
+    print("-" * 50)
+    return changed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='교통 분석 파이프라인 (바뀐 단계만 실행)')
+    parser.add_argument('--all-nodes', action='store_true',
+                        help='전체 노드 데이터셋으로 실행')
+    parser.add_argument('--by-hour', action='store_true',
+                        help='노드 x 시간대별 추세선도 계산')
+    parser.add_argument('--bootstrap', type=int, default=200,
+                        help='부트스트랩 반복 횟수 (기본 200)')
+    parser.add_argument('--force', action='store_true', help='모든 단계 다시 실행')
+    parser.add_argument('--dry-run', action='store_true', help='실행할 단계만 출력')
+    parser.add_argument('--full', action='store_true',
+                        help='원본 전체 재처리 (manifest 무시, 뒤 단계는 결과가 바뀐 경우만 실행)')
+    args = parser.parse_args()
+    run_pipeline(all_nodes=args.all_nodes, by_hour=args.by_hour, bootstrap=args.bootstrap,
+                 force=args.force, dry_run=args.dry_run, full=args.full)
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+vds_schema.py
+=============
+[기능]
+01_data_loader.py와 02_analysis.py가 함께 쓰는 교통 데이터 형식(스키마) 정의입니다.
+
+[내용]
+1. 컬럼별 자료형: 노드명/요일명은 범주형(category), 기준일은 날짜, 숫자는 작은 자료형(float32/int8)
+   (read_csv가 바로 이 자료형으로 읽음, '-'나 빈 칸 같은 결측 행만 버림)
+2. Parquet 데이터셋 읽기/쓰기 (노드명/기준일 파티션 + 자료형 유지)
+3. 메모리 사용량 리포트
+"""
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# -----------------------------------------------------------------------------
+# 1. 컬럼 자료형 (Schema)
+# -----------------------------------------------------------------------------
+# 요일 순서 (월화수목금토일) - 순서가 있는 범주형이라 정렬하면 요일 순서대로 나옴
+WEEK_ORDER = ['월요일', '화요일', '수요일', '목요일', '금요일', '토요일', '일요일']
+WEEKDAY_DTYPE = pd.CategoricalDtype(WEEK_ORDER, ordered=True)
+
+# read_csv에 넘기는 자료형 (읽는 순간 이 자료형으로 파싱, 문자열 컬럼을 거치지 않음)
+# - 노드명/요일명: category (필터 후 노드 목록으로 범주를 맞춰서 파일끼리 합쳐도 범주형 유지)
+# - 기준일: category로 읽은 뒤 범주(파일마다 며칠뿐)만 날짜로 바꿈 (행마다 날짜를 파싱하지 않음)
+# - 기준시간: 0~23시 (Int8, 빈 값을 담을 수 있는 정수형 -> 빈 값 행을 버린 뒤 int8)
+#   시간대별로 묶는 키라서 날짜와 합친 시각 대신 정수로 둠 (시각 = 기준일 + 기준시간)
+# - 교통량/평균속도: float32 (소수점 한 자리 정도면 충분, 빈 값은 NaN)
+CSV_DTYPES = {
+    '요일명': WEEKDAY_DTYPE,
+    '노드명': 'category',
+    '기준일': 'category',
+    '기준시간': 'Int8',
+    '교통량': 'float32',
+    '평균속도': 'float32',
+}
+# 원본에 섞여 있는 결측 표시 (빈 칸은 read_csv 기본값으로 이미 결측) + 천 단위 쉼표("1,234")
+NA_VALUES = ['-']
+THOUSANDS = ','
+# 기준일 원본 형식: 20240101
+DATE_COL = '기준일'
+DATE_FORMAT = '%Y%m%d'
+# 정리가 끝난 데이터프레임의 자료형 (빈 결과를 만들 때도 사용)
+FRAME_DTYPES = {**CSV_DTYPES, '기준시간': 'int8', DATE_COL: 'datetime64[ns]'}
+# 위 자료형으로 읽을 수 없는 값(예: 숫자 칸의 'N/A')이 있는 파일은 그 파일만 문자열로 다시 읽어서 변환
+TEXT_DTYPES = {**CSV_DTYPES, '기준시간': str, '교통량': str, '평균속도': str}
+
+
+def finish_chunk(chunk):
+    """
+    CSV_DTYPES로 읽은 청크 -> FRAME_DTYPES (결측 행은 버림)
+    - 기준일은 범주만 날짜로 바꾼 뒤 코드로 펼침, 형식이 틀린 날짜는 결측
+    """
+    dates = pd.to_datetime(chunk[DATE_COL].cat.categories, format=DATE_FORMAT, errors='coerce')
+    codes = chunk[DATE_COL].cat.codes.to_numpy()
+    day = pd.Series(dates.take(codes), index=chunk.index).where(codes >= 0)
+    valid = day.notna() & chunk[['기준시간', '교통량', '평균속도']].notna().all(axis=1)
+    chunk = chunk[valid].copy()
+    chunk[DATE_COL] = day[valid].astype(FRAME_DTYPES[DATE_COL])
+    chunk['기준시간'] = chunk['기준시간'].astype(FRAME_DTYPES['기준시간'])
+    return chunk
+
+
+def coerce_chunk(chunk):
+    """
+    TEXT_DTYPES로 읽은 청크 (느린 경로) -> 숫자로 바꿀 수 없는 값은 결측으로 두고 finish_chunk
+    """
+    chunk = chunk.copy()
+    for col in ['기준시간', '교통량', '평균속도']:
+        text = chunk[col].astype(str).str.replace(THOUSANDS, '', regex=False).str.strip()
+        chunk[col] = pd.to_numeric(text, errors='coerce').astype(CSV_DTYPES[col])
+    return finish_chunk(chunk)
+
+# 파생 컬럼 자료형
+DENSITY_DTYPE = 'float32'
+
+# -----------------------------------------------------------------------------
+# 2. Parquet 데이터셋 (노드명/기준일 파티션)
+# -----------------------------------------------------------------------------
+PARTITION_COLS = ['노드명', '기준일']
+# 파티션 폴더 이름(노드명=안현JC/기준일=2024-01-01)을 읽을 때 쓰는 자료형
+PARTITIONING = ds.partitioning(
+    pa.schema([('노드명', pa.dictionary(pa.int32(), pa.string())),
+               ('기준일', pa.date32())]),
+    flavor='hive',
+    dictionaries='infer',
+)
+
+
+def write_dataset(df, path, basename_template):
+    """
+    데이터프레임을 노드명/기준일 파티션 Parquet 데이터셋에 추가로 씀
+    (기준일은 날짜 단위 폴더명이 되도록 date32로 저장)
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    idx = table.schema.get_field_index('기준일')
+    table = table.set_column(idx, '기준일', table['기준일'].cast(pa.date32()))
+    pq.write_to_dataset(table, path, partition_cols=PARTITION_COLS,
+                        compression='zstd',
+                        basename_template=basename_template,
+                        existing_data_behavior='overwrite_or_ignore')
+
+
+def read_dataset(path, columns=None, filters=None):
+    """
+    Parquet 데이터셋에서 필요한 컬럼/파티션만 읽어서 스키마 자료형으로 돌려줌
+    - filters: [('노드명', 'in', [...]), ('기준일', '>=', date)] 형식 (읽기 단계에서 적용)
+    """
+    table = pq.read_table(path, columns=columns, filters=filters,
+                          partitioning=PARTITIONING)
+    df = table.to_pandas(date_as_object=False)
+    if '요일명' in df.columns:
+        df['요일명'] = df['요일명'].astype(WEEKDAY_DTYPE)
+    return df
+
+
+# -----------------------------------------------------------------------------
+# 3. 메모리 리포트
+# -----------------------------------------------------------------------------
+def memory_stats(df):
+    """
+    (컬럼별 메모리 사용량, 컬럼별 자료형, 행 수) - 여러 조각의 사용량을 더해서 출력할 때 사용
+    """
+    usage = df.memory_usage(deep=True, index=False)
+    return usage, df.dtypes.astype(str), len(df)
+
+
+def print_memory_report(usage, dtypes, n_rows, title='메모리 사용량'):
+    """
+    컬럼별 메모리 사용량(문자열 내용까지 포함)을 출력
+    """
+    total = usage.sum()
+    print(f"[🧠 {title}] 총 {total / 1024 ** 2:,.2f} MB ({n_rows:,}행, 행당 {total / max(n_rows, 1):.1f} bytes)")
+    for col, nbytes in usage.items():
+        print(f"   - {col:<6} {dtypes.get(col, ''):<12} {nbytes / 1024 ** 2:>10,.2f} MB")
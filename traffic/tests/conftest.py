@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""
+traffic 테스트 공통 설정
+- src 폴더의 모듈(greenshields, vds_schema 등)을 바로 import할 수 있게 경로 추가
+- 숫자로 시작하는 스크립트(01_data_loader.py 등)는 load_script로 불러옴
+"""
+
+import importlib.util
+import os
+import sys
+
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+
+@pytest.fixture
+def load_script():
+    """
+    스크립트 파일 이름 -> 모듈 (프로세스 풀에서 함수를 넘길 수 있도록 sys.modules에도 등록)
+    """
+    def load(filename):
+        name = 'traffic_' + os.path.splitext(filename)[0].lstrip('0123456789_')
+        spec = importlib.util.spec_from_file_location(name, os.path.join(SRC_DIR, filename))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+        return module
+    return load
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+04_assignment.py: 2경로 도로망의 사용자 균형 (쓰이는 경로끼리 통행시간이 같음), 이상한 분석 값 대체
+"""
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def assignment(load_script):
+    return load_script('04_assignment.py')
+
+
+def params(nodes=None):
+    return {'free_flow_speed': 100.0, 'capacity': 1300.0, 'nodes': nodes or {}}
+
+
+def test_used_paths_have_equal_times(assignment):
+    net = assignment.build_network(assignment.DEFAULT_NETWORK, params())
+    demands = np.array([0.0, 100.0, 1000.0, 3000.0, 8000.0])
+    result = assignment.solve_equilibrium(net, demands[:, None])
+
+    flow, time = result['path_flow'], result['path_time']
+    np.testing.assert_allclose(flow.sum(axis=1), demands)
+    for q, f, t in zip(demands, flow, time):
+        used = f > 1e-6 * max(q, 1)
+        if used.all():
+            np.testing.assert_allclose(t[0], t[1], rtol=1e-4)
+        elif used.any():
+            # 한 경로만 쓰이면 그 경로가 더 빠름
+            assert t[used].max() <= t[~used].min() + 1e-9
+    # 수요가 많으면 두 경로 모두 쓰임
+    assert (flow[-1] > 0).all()
+
+
+@pytest.mark.parametrize('bad', [{'free_flow_speed': -20.0, 'capacity': -500.0},
+                                 {'free_flow_speed': 0.0, 'capacity': float('inf')},
+                                 {'free_flow_speed': None, 'capacity': float('nan')}])
+def test_bad_node_fit_falls_back_to_pooled(assignment, bad):
+    net = assignment.build_network(assignment.DEFAULT_NETWORK, params({'도리JC': bad}))
+    reference = assignment.build_network(assignment.DEFAULT_NETWORK, params())
+    np.testing.assert_allclose(net['t0'], reference['t0'])
+    np.testing.assert_allclose(net['cap'], reference['cap'])
+
+
+def test_bad_pooled_values_fall_back_to_defaults(assignment):
+    net = assignment.build_network(assignment.DEFAULT_NETWORK,
+                                   {'free_flow_speed': float('nan'), 'capacity': -1.0, 'nodes': {}})
+    assert np.isfinite(net['t0']).all() and (net['t0'] > 0).all()
+    np.testing.assert_allclose(net['cap'], assignment.DEFAULT_CAPACITY * np.array([1.0, 1.2]))
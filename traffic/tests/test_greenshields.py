@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+greenshields.py: 합계로 구한 닫힌 형태의 추세선이 그룹별 np.polyfit과 같은지
+"""
+
+import numpy as np
+import pandas as pd
+
+from greenshields import fit_from_sums, fit_groups, fit_units, row_sums
+
+
+def make_frame(seed=0, n=3000):
+    rng = np.random.default_rng(seed)
+    node = rng.choice(['안현JC', '도리JC', '일직JC'], size=n)
+    hour = rng.integers(0, 24, size=n)
+    k = rng.uniform(5, 120, size=n)
+    v = 100 - 0.7 * k + rng.normal(0, 6, size=n)
+    return pd.DataFrame({'노드명': node, '기준시간': hour, '밀도': k, '평균속도': v})
+
+
+def test_fit_groups_matches_polyfit():
+    df = make_frame()
+    result = fit_groups(df, ['노드명', '기준시간'])
+    for (node, hour), row in result.iterrows():
+        group = df[(df['노드명'] == node) & (df['기준시간'] == hour)]
+        slope, intercept = np.polyfit(group['밀도'], group['평균속도'], 1)
+        assert row['n'] == len(group)
+        np.testing.assert_allclose(row['slope'], slope, rtol=1e-9)
+        np.testing.assert_allclose(row['intercept'], intercept, rtol=1e-9)
+        np.testing.assert_allclose(row['free_flow_speed'], intercept, rtol=1e-9)
+        np.testing.assert_allclose(row['jam_density'], -intercept / slope, rtol=1e-9)
+        np.testing.assert_allclose(row['capacity'], intercept * (-intercept / slope) / 4, rtol=1e-9)
+
+
+def test_cube_cells_give_same_fit_as_rows():
+    # 칸(노드 x 시간대) 합계를 다시 묶어도 원본 행으로 구한 것과 같아야 함
+    df = make_frame(seed=1)
+    sums = pd.DataFrame(row_sums(df['밀도'], df['평균속도']), columns=['n', 'sk', 'sv', 'skk', 'skv'])
+    cells = pd.concat([df[['노드명', '기준시간']], sums], axis=1).groupby(
+        ['노드명', '기준시간'], as_index=False).sum()
+    by_cells = fit_units(cells, '노드명', cells[['n', 'sk', 'sv', 'skk', 'skv']].to_numpy())
+    by_rows = fit_groups(df, '노드명')
+    np.testing.assert_allclose(by_cells['slope'], by_rows['slope'], rtol=1e-9)
+    np.testing.assert_allclose(by_cells['capacity'], by_rows['capacity'], rtol=1e-9)
+
+
+def test_degenerate_groups_are_nan():
+    # 점 하나, 밀도가 한 값뿐인 그룹은 추세선을 구할 수 없음
+    sums = np.stack([row_sums([10.0], [80.0]).sum(axis=0),
+                     row_sums([10.0, 10.0], [80.0, 70.0]).sum(axis=0)])
+    params = fit_from_sums(sums)
+    assert np.isnan(params['slope']).all()
+    assert np.isnan(params['capacity']).all()
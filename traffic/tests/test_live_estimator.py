@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+03_live_estimator.py: 온라인 합계가 배치 계산과 같은지, 입력 인코딩/헤더 처리
+"""
+
+import io
+import sys
+
+import numpy as np
+import pytest
+
+from greenshields import row_sums
+
+
+@pytest.fixture
+def live(load_script):
+    return load_script('03_live_estimator.py')
+
+
+def records(seed=0, n=600):
+    rng = np.random.default_rng(seed)
+    nodes = rng.choice(['안현JC', '도리JC', '일직JC'], size=n, p=[0.7, 0.2, 0.1])
+    k = rng.uniform(5, 100, size=n)
+    v = 100 - 0.6 * k + rng.normal(0, 5, size=n)
+    return nodes, k, v
+
+
+def test_cumulative_sums_match_batch(live):
+    nodes, k, v = records()
+    estimator = live.OnlineGreenshields()
+    for node, ki, vi in zip(nodes, k, v):
+        estimator.update(node, ki, vi)
+    for node, idx in estimator.node_ids.items():
+        mask = nodes == node
+        np.testing.assert_allclose(estimator.node_sums()[idx], row_sums(k[mask], v[mask]).sum(axis=0))
+    np.testing.assert_allclose(estimator.pooled, row_sums(k, v).sum(axis=0))
+
+
+def test_forgetting_is_global(live):
+    # 기록 i의 가중치 = forget^(뒤에 들어온 기록 수), 어느 노드의 기록이든 같음
+    nodes, k, v = records(seed=1)
+    forget = 0.99
+    estimator = live.OnlineGreenshields(forget=forget)
+    for node, ki, vi in zip(nodes, k, v):
+        estimator.update(node, ki, vi)
+    weights = forget ** np.arange(len(k) - 1, -1, -1)
+    sums = row_sums(k, v) * weights[:, None]
+    for node, idx in estimator.node_ids.items():
+        np.testing.assert_allclose(estimator.node_sums()[idx], sums[nodes == node].sum(axis=0))
+    np.testing.assert_allclose(estimator.node_sums().sum(axis=0), estimator.pooled)
+
+
+def test_stdin_is_decoded_as_euc_kr(live, monkeypatch):
+    lines = ['노드명,교통량,평균속도'] + [f'안현JC,{(20 + i) * (90 - i)},{90 - i}' for i in range(10)]
+    data = ('\n'.join(lines) + '\n').encode('euc-kr')
+    monkeypatch.setattr(sys, 'stdin', io.TextIOWrapper(io.BytesIO(data), encoding='utf-8'))
+    monkeypatch.setattr(live, 'publish', lambda estimator: None)
+    estimator = live.OnlineGreenshields()
+    live.read_stdin(estimator)
+    assert estimator.records == 10
+
+
+def test_missing_columns_fail_loudly(live, monkeypatch):
+    data = 'node,q,v\nA,100,80\n'.encode('euc-kr')
+    monkeypatch.setattr(sys, 'stdin', io.TextIOWrapper(io.BytesIO(data), encoding='utf-8'))
+    with pytest.raises(ValueError, match='노드명'):
+        live.read_stdin(live.OnlineGreenshields())
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+01_data_loader.py: manifest 기반 증분 수집 (새 파일/바뀐 파일/사라진 파일만 반영)
+"""
+
+import glob
+import os
+
+import pytest
+
+from vds_schema import read_dataset
+
+HEADER = '기준일,기준시간,요일명,노드명,교통량,평균속도'
+
+
+def write_vds(path, rows):
+    with open(path, 'w', encoding='euc-kr') as f:
+        f.write('\n'.join([HEADER] + rows) + '\n')
+
+
+def day_rows(day, node, hours=24):
+    return [f'{day},{h},월요일,{node},{100 + h},{80 - h * 0.5}' for h in range(hours)]
+
+
+@pytest.fixture
+def loader(load_script, tmp_path, monkeypatch):
+    module = load_script('01_data_loader.py')
+    processed = tmp_path / 'data' / 'processed'
+    monkeypatch.setattr(module, 'BASE_DIR', str(tmp_path))
+    monkeypatch.setattr(module, 'RAW_DATA_DIR', str(tmp_path / 'VDS_*'))
+    monkeypatch.setattr(module, 'OUTPUT_DIR', str(processed / 'jc_dataset'))
+    monkeypatch.setattr(module, 'MANIFEST_PATH', str(processed / 'manifest.json'))
+    monkeypatch.setattr(module, 'MAX_WORKERS', 1)
+    monkeypatch.setattr(module, 'MAX_PENDING', 1)  # 한 번에 한 파일씩 맡기는 경우도 확인
+    (tmp_path / 'VDS_1').mkdir()
+    return module
+
+
+def run(loader, capsys):
+    loader.load_and_process()
+    out = capsys.readouterr().out
+    todo = next(line for line in out.splitlines() if '새로 처리할 파일' in line)
+    return int(todo.split(':')[1].split('개')[0]), loader.load_manifest(loader.MANIFEST_PATH)
+
+
+def parts_of(loader, rel):
+    # 원본 파일 하나가 만든 Parquet 조각 (경로, 수정시각)
+    pattern = os.path.join(loader.OUTPUT_DIR, '**', f'{loader.file_id(rel)}-*.parquet')
+    return sorted((path, os.stat(path).st_mtime_ns) for path in glob.glob(pattern, recursive=True))
+
+
+def count_by_node(loader):
+    df = read_dataset(loader.OUTPUT_DIR, columns=['노드명', '교통량'])
+    return df.groupby('노드명', observed=True).size().to_dict()
+
+
+def test_incremental_ingest(loader, tmp_path, capsys):
+    raw = tmp_path / 'VDS_1'
+    write_vds(raw / 'a.csv', day_rows('20240101', '안현JC') + day_rows('20240101', '기타IC'))
+    write_vds(raw / 'b.csv', day_rows('20240102', '도리JC'))
+
+    todo, manifest = run(loader, capsys)
+    assert todo == 2 and len(manifest) == 2
+    assert count_by_node(loader) == {'안현JC': 24, '도리JC': 24}
+
+    # 그대로면 아무 파일도 다시 읽지 않음
+    todo, again = run(loader, capsys)
+    assert todo == 0 and again == manifest
+
+    # 바뀐 파일은 그 파일의 행만 교체 (다른 파일의 조각은 그대로)
+    a_parts = parts_of(loader, os.path.join('VDS_1', 'a.csv'))
+    assert a_parts
+    write_vds(raw / 'b.csv', day_rows('20240102', '도리JC') + day_rows('20240103', '도리JC', hours=12))
+    todo, manifest = run(loader, capsys)
+    assert todo == 1
+    assert count_by_node(loader) == {'안현JC': 24, '도리JC': 36}
+    assert parts_of(loader, os.path.join('VDS_1', 'a.csv')) == a_parts
+
+    # 수정시각만 바뀌고 내용이 같으면 (해시로 확인) 다시 읽지 않고 기록만 갱신
+    os.utime(raw / 'a.csv', (1, 1))
+    todo, manifest = run(loader, capsys)
+    assert todo == 0
+    assert manifest[os.path.join('VDS_1', 'a.csv')]['mtime'] == 1
+    assert parts_of(loader, os.path.join('VDS_1', 'a.csv')) == a_parts
+    assert count_by_node(loader) == {'안현JC': 24, '도리JC': 36}
+    todo, _ = run(loader, capsys)
+    assert todo == 0
+
+    # 사라진 파일의 행은 삭제
+    os.remove(raw / 'a.csv')
+    todo, manifest = run(loader, capsys)
+    assert list(manifest) == [os.path.join('VDS_1', 'b.csv')]
+    assert count_by_node(loader) == {'도리JC': 36}
+
+
+def test_full_rebuild_matches_incremental(loader, tmp_path, capsys):
+    raw = tmp_path / 'VDS_1'
+    write_vds(raw / 'a.csv', day_rows('20240101', '안현JC'))
+    run(loader, capsys)
+    write_vds(raw / 'b.csv', day_rows('20240102', '조남JC'))
+    run(loader, capsys)
+    incremental = count_by_node(loader)
+
+    loader.load_and_process(full=True)
+    capsys.readouterr()
+    assert count_by_node(loader) == incremental == {'안현JC': 24, '조남JC': 24}
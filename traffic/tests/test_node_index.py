@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+node_index.py: 색인으로 노드 하나를 읽어도 파티션 컬럼(노드명)이 살아 있는지
+"""
+
+import pandas as pd
+
+from node_index import build_node_index, load_node
+from vds_schema import FRAME_DTYPES, write_dataset
+
+
+def frame(node, day, n=3):
+    df = pd.DataFrame({
+        '기준일': pd.to_datetime([day] * n),
+        '기준시간': range(n),
+        '요일명': ['월요일'] * n,
+        '노드명': [node] * n,
+        '교통량': [100.0 * (i + 1) for i in range(n)],
+        '평균속도': [80.0] * n,
+    })
+    return df.astype({c: FRAME_DTYPES[c] for c in df.columns})
+
+
+def test_load_node_round_trip(tmp_path):
+    path = str(tmp_path / 'dataset')
+    write_dataset(pd.concat([frame('안현JC', '2024-01-01'), frame('도리JC', '2024-01-01', n=2)]),
+                  path, 'a-{i}.parquet')
+    write_dataset(frame('안현JC', '2024-01-02'), path, 'b-{i}.parquet')
+
+    index = build_node_index(path)
+    assert {node: entry['rows'] for node, entry in index.items()} == {'도리JC': 2, '안현JC': 6}
+
+    df = load_node(path, '안현JC')
+    assert len(df) == 6
+    assert set(df['노드명'].astype(str)) == {'안현JC'}
+    assert sorted(df['기준일'].dt.strftime('%Y-%m-%d').unique()) == ['2024-01-01', '2024-01-02']
+    assert sorted(df['교통량'].tolist()) == [100.0, 100.0, 200.0, 200.0, 300.0, 300.0]
+
+    df = load_node(path, '도리JC', columns=['노드명', '교통량'])
+    assert df.columns.tolist() == ['노드명', '교통량']
+    assert set(df['노드명'].astype(str)) == {'도리JC'}
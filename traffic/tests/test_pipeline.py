@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+run_pipeline.py: 입력이 그대로면 뒤 단계를 건너뛰고, 입력 내용이 바뀌면 다시 실행하는지 (가짜 단계로 확인)
+"""
+
+import functools
+import os
+
+import pytest
+
+RUNS = 'runs.log'  # 단계가 실행될 때마다 한 줄씩 (작업 프로세스에서도 남도록 파일로 기록)
+
+
+def _log(root, name):
+    with open(os.path.join(root, RUNS), 'a', encoding='utf-8') as f:
+        f.write(name + '\n')
+
+
+def ingest(root, opts):
+    _log(root, 'ingest')
+    raw = sorted(os.listdir(os.path.join(root, 'raw')))
+    text = ''.join(open(os.path.join(root, 'raw', name), encoding='utf-8').read() for name in raw)
+    with open(os.path.join(root, 'dataset.txt'), 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def summarize(root, output, opts):
+    _log(root, output)
+    text = open(os.path.join(root, 'dataset.txt'), encoding='utf-8').read()
+    with open(os.path.join(root, output), 'w', encoding='utf-8') as f:
+        f.write(f'{output}: {len(text.split())}\n')
+
+
+def stub_stages(root, opts):
+    dataset = os.path.join(root, 'dataset.txt')
+    return [
+        {'name': 'ingest', 'run': functools.partial(ingest, root), 'inputs': [os.path.join(root, 'raw', '*')],
+         'outputs': [dataset], 'code': [__file__], 'config': [], 'force': opts['full']},
+        {'name': 'summary', 'run': functools.partial(summarize, root, 'summary.txt'), 'inputs': [dataset],
+         'outputs': [os.path.join(root, 'summary.txt')], 'code': [__file__]},
+        {'name': 'report', 'run': functools.partial(summarize, root, 'report.txt'), 'inputs': [dataset],
+         'outputs': [os.path.join(root, 'report.txt')], 'code': [__file__]},
+    ]
+
+
+@pytest.fixture
+def pipeline(load_script, tmp_path, monkeypatch):
+    module = load_script('run_pipeline.py')
+    (tmp_path / 'raw').mkdir()
+    (tmp_path / 'raw' / 'a.csv').write_text('1 2 3\n', encoding='utf-8')
+    state_path = str(tmp_path / 'pipeline_state.json')
+    monkeypatch.setattr(module, 'define_stages', functools.partial(stub_stages, str(tmp_path)))
+    monkeypatch.setattr(module, 'load_state', functools.partial(module.load_state, state_path))
+    monkeypatch.setattr(module, 'save_state', functools.partial(module.save_state, path=state_path))
+    monkeypatch.setattr(module, 'MAX_WORKERS', 2)
+    return module
+
+
+def runs(tmp_path):
+    path = tmp_path / RUNS
+    names = path.read_text(encoding='utf-8').split() if path.exists() else []
+    path.unlink(missing_ok=True)
+    return sorted(names)
+
+
+def test_only_changed_stages_run(pipeline, tmp_path, capsys):
+    assert pipeline.run_pipeline() == {'ingest', 'summary', 'report'}
+    assert runs(tmp_path) == ['ingest', 'report.txt', 'summary.txt']
+
+    # 그대로면 아무것도 실행하지 않음
+    assert pipeline.run_pipeline() == set()
+    assert runs(tmp_path) == []
+
+    # 수정시각만 바뀌면 내용 해시가 같으므로 그대로
+    os.utime(tmp_path / 'raw' / 'a.csv', (1, 1))
+    assert pipeline.run_pipeline() == set()
+    assert runs(tmp_path) == []
+
+    # 원본 내용이 바뀌면 뒤 단계까지 다시 실행
+    (tmp_path / 'raw' / 'b.csv').write_text('4 5\n', encoding='utf-8')
+    assert pipeline.run_pipeline() == {'ingest', 'summary', 'report'}
+    assert (tmp_path / 'summary.txt').read_text(encoding='utf-8') == 'summary.txt: 5\n'
+
+    # 출력 하나가 지워지면 그 단계만
+    runs(tmp_path)
+    os.remove(tmp_path / 'report.txt')
+    assert pipeline.run_pipeline() == {'report'}
+    capsys.readouterr()
+
+
+def test_full_reruns_ingest_only(pipeline, tmp_path):
+    pipeline.run_pipeline()
+    runs(tmp_path)
+    # 전체 재처리: ingest는 다시 실행하지만 결과가 같으면 뒤 단계는 건너뜀
+    assert pipeline.run_pipeline(full=True) == {'ingest'}
+    assert runs(tmp_path) == ['ingest']
+    assert pipeline.run_pipeline(force=True) == {'ingest', 'summary', 'report'}
+
+
+def test_run_ingest_forwards_full(load_script, monkeypatch):
+    module = load_script('run_pipeline.py')
+    calls = []
+
+    class Loader:
+        @staticmethod
+        def load_and_process(**kwargs):
+            calls.append(kwargs)
+
+    monkeypatch.setattr(module, '_module', lambda name: Loader)
+    module.run_ingest({'full': True, 'all_nodes': False})
+    assert calls == [{'full': True, 'all_nodes': False}]
+    assert module.define_stages({'full': True, 'all_nodes': False, 'by_hour': False, 'bootstrap': 0})[0]['force']
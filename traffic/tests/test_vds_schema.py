@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+vds_schema.py / 01_data_loader.py: read_csv가 바로 스키마 자료형으로 읽는지, 잘못된 값이 섞인 행만 버리는지
+"""
+
+import pandas as pd
+import pytest
+
+from vds_schema import CSV_DTYPES, NA_VALUES, THOUSANDS, finish_chunk
+
+ROWS = [
+    '기준일,기준시간,요일명,노드명,교통량,평균속도',
+    '20240101,0,월요일,안현JC,"1,234",80.5',
+    '20240101,1,월요일,안현JC,-,80.5',
+    '20240101,2,월요일,도리JC,,70',
+    '20240101,3,월요일,도리JC,500,72.1',
+    '2024-01-0,4,월요일,도리JC,500,72.1',
+    '20240101,-,월요일,도리JC,500,72.1',
+]
+
+
+def test_typed_read_drops_only_missing_rows(tmp_path):
+    path = tmp_path / 'vds.csv'
+    path.write_text('\n'.join(ROWS) + '\n', encoding='euc-kr')
+    chunk = pd.read_csv(path, encoding='euc-kr', dtype=CSV_DTYPES, na_values=NA_VALUES, thousands=THOUSANDS)
+    assert str(chunk['교통량'].dtype) == 'float32'
+    assert isinstance(chunk['기준일'].dtype, pd.CategoricalDtype)
+    out = finish_chunk(chunk)
+
+    assert out['교통량'].tolist() == [1234.0, 500.0]
+    assert out['기준시간'].tolist() == [0, 3]
+    assert str(out['교통량'].dtype) == 'float32'
+    assert str(out['기준시간'].dtype) == 'int8'
+    assert (out['기준일'] == pd.Timestamp('2024-01-01')).all()
+
+
+@pytest.mark.parametrize('bad', [None, '20240101,x,월요일,도리JC,500,72.1', '20240101,5,월요일,도리JC,n.a,72.1'])
+def test_loader_keeps_file_with_bad_cells(load_script, tmp_path, bad):
+    # 예상 못 한 값이 있으면 그 파일만 문자열로 다시 읽음 (결과는 같아야 함)
+    loader = load_script('01_data_loader.py')
+    path = tmp_path / 'vds.csv'
+    path.write_text('\n'.join(ROWS + ([bad] if bad else [])) + '\n', encoding='euc-kr')
+    df = loader.read_vds_file(str(path))
+    assert len(df) == 2
+    assert df['교통량'].tolist() == [1234.0, 500.0]
+    assert df['밀도'].notna().all()
+    assert df.dtypes.astype(str).to_dict() == {
+        '기준일': 'datetime64[ns]', '기준시간': 'int8', '요일명': 'category', '노드명': 'category',
+        '교통량': 'float32', '평균속도': 'float32', '밀도': 'float32'}